@@ -0,0 +1,58 @@
+"""
+Fixtures of the benchmark suite. Benchmarks replay a fixture archive: the one named by REACTOME2PY_FIXTURES when set
+(record it from the live services with REACTOME2PY_RECORD=1), else a synthetic archive of realistic size built
+once per session.
+"""
+from reactome2py import analysis
+from reactome2py.client import ReactomeClient, set_default_client
+from reactome2py.fixtures import RecordingTransport
+from reactome2py.ratelimit import RateLimiter
+from workload import IDS, replay_client, synthetic, workload
+import os
+import pytest
+
+
+@pytest.fixture(scope='session')
+def archive(tmp_path_factory):
+    path = os.environ.get('REACTOME2PY_FIXTURES')
+    if path and not os.environ.get('REACTOME2PY_RECORD'):
+        return path
+
+    if not path:
+        path = str(tmp_path_factory.mktemp('fixtures') / 'benchmark.zip')
+        transport = RecordingTransport(path, transport=synthetic(str(tmp_path_factory.mktemp('local'))))
+    else:
+        transport = RecordingTransport(path)
+
+    client = ReactomeClient(transport=transport, rate_limiter=RateLimiter({}))
+    previous = set_default_client(client)
+    try:
+        workload()
+    finally:
+        set_default_client(previous)
+        client.close()
+    return path
+
+
+@pytest.fixture
+def client(archive):
+    """
+    Default client replaying the archive without latency, so that benchmarks time the client and the parsing
+    """
+
+    client = replay_client(archive)
+    previous = set_default_client(client)
+    yield client
+    set_default_client(previous)
+    client.close()
+
+
+@pytest.fixture(scope='session')
+def token(archive):
+    client = replay_client(archive)
+    previous = set_default_client(client)
+    try:
+        return analysis.identifiers(ids=','.join(IDS))['summary']['token']
+    finally:
+        set_default_client(previous)
+        client.close()
@@ -0,0 +1,54 @@
+"""
+Per-call latency of the heavy endpoints, replayed without network latency: the timings cover the client pipeline
+and the parsing of the responses.
+"""
+from reactome2py import analysis, content, fiviz
+from reactome2py.expression import expression_payload
+from workload import IDS, SCHEMA_PAGES
+import numpy
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_identifiers(benchmark, client):
+    ids = ','.join(IDS)
+    result = benchmark(analysis.identifiers, ids=ids)
+    assert result['pathways']
+
+
+def test_expression_payload(benchmark):
+    values = numpy.random.RandomState(0).lognormal(size=(len(IDS), 20))
+    assert benchmark(expression_payload, values, index=IDS).startswith('#id')
+
+
+def test_result2json(benchmark, client, token):
+    assert benchmark(analysis.result2json, token)['pathways']
+
+
+def test_result_pathways(benchmark, client, token):
+    assert benchmark(lambda: sum(1 for _ in analysis.result_pathways(token)))
+
+
+def test_pathway2df(benchmark, client, token):
+    assert len(benchmark(analysis.pathway2df, token))
+
+
+def test_found_entities(benchmark, client, token):
+    assert len(benchmark(analysis.found_entities, token))
+
+
+def test_gene_mappings(benchmark, client):
+    assert benchmark(fiviz.gene_mappings)
+
+
+def test_sbgn_stids(benchmark, client):
+    assert benchmark(fiviz.sbgn_stids)
+
+
+def test_schema_pagination(benchmark, client):
+    def pages():
+        return [entry for page in range(1, SCHEMA_PAGES + 1)
+                for entry in content.schema(name='Pathway', by='min', page=page, offset=25)]
+
+    assert len(benchmark(pages)) == SCHEMA_PAGES * 25
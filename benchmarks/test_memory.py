@@ -0,0 +1,36 @@
+"""
+Peak memory allocated by the heavy endpoints, traced with tracemalloc and reported as extra_info['peak_bytes']
+"""
+from reactome2py import analysis, fiviz
+from workload import IDS
+import tracemalloc
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+
+def _peak(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('name', ['identifiers', 'result2json', 'result_pathways', 'pathway2df', 'found_entities', 'gene_mappings',
+                                  'sbgn_stids'])
+def test_peak_memory(benchmark, client, token, name):
+    calls = {
+        'identifiers': (analysis.identifiers, (), {'ids': ','.join(IDS)}),
+        'result2json': (analysis.result2json, (token,), {}),
+        'result_pathways': (lambda token: sum(1 for _ in analysis.result_pathways(token)), (token,), {}),
+        'pathway2df': (analysis.pathway2df, (token,), {}),
+        'found_entities': (analysis.found_entities, (token,), {}),
+        'gene_mappings': (fiviz.gene_mappings, (), {}),
+        'sbgn_stids': (fiviz.sbgn_stids, (), {}),
+    }
+    func, args, kwargs = calls[name]
+    peak = benchmark.pedantic(_peak, args=(func,) + args, kwargs=kwargs, rounds=1, iterations=1)
+    benchmark.extra_info['peak_bytes'] = peak
+    assert peak > 0
@@ -0,0 +1,49 @@
+"""
+End-to-end throughput at several concurrency levels. Replayed responses wait REACTOME2PY_BENCH_LATENCY seconds
+(default 0.02) to stand in for the network, so the timings show how well concurrent calls overlap.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from reactome2py import analysis, content
+from reactome2py.client import set_default_client
+from workload import SCHEMA_PAGES, replay_client
+import os
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+LATENCY = float(os.environ.get('REACTOME2PY_BENCH_LATENCY', '0.02'))
+
+CALLS = 80
+
+
+@pytest.fixture
+def slow_client(archive):
+    client = replay_client(archive, latency=LATENCY, pool_maxsize=64)
+    previous = set_default_client(client)
+    yield client
+    set_default_client(previous)
+    client.close()
+
+
+def _run(workers, func, args):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, args))
+
+
+@pytest.mark.parametrize('workers', [1, 4, 16, 64])
+def test_schema_pages(benchmark, slow_client, workers):
+    pages = [1 + i % SCHEMA_PAGES for i in range(CALLS)]
+    benchmark.extra_info['calls'] = CALLS
+    benchmark.extra_info['latency'] = LATENCY
+    results = benchmark.pedantic(_run, args=(workers, lambda page: content.schema(name='Pathway', by='min',
+                                                                                  page=page, offset=25), pages),
+                                 rounds=3)
+    assert len(results) == CALLS
+
+
+@pytest.mark.parametrize('workers', [1, 4, 16])
+def test_result2json(benchmark, slow_client, token, workers):
+    benchmark.extra_info['calls'] = 16
+    benchmark.extra_info['latency'] = LATENCY
+    results = benchmark.pedantic(_run, args=(workers, analysis.result2json, [token] * 16), rounds=3)
+    assert len(results) == 16
@@ -0,0 +1,144 @@
+"""
+Synthetic Reactome responses and the calls made by the benchmarks
+"""
+from reactome2py import analysis, content, fiviz
+from reactome2py.client import ReactomeClient
+from reactome2py.fixtures import ReplayTransport
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.transport import LocalTransport
+import gzip
+import io
+import json
+import random
+import tarfile
+import zipfile
+
+IDS = ['GENE%d' % i for i in range(10000)]
+
+SCHEMA_PAGES = 40
+
+PATHWAYS = 2500
+
+TOKEN = 'BENCHMARK'
+
+PATHWAY_COLUMNS = ['Pathway identifier', 'Pathway name', '#Entities found', '#Entities total', '#Interactors found',
+                   '#Interactors total', 'Entities ratio', 'Entities pValue', 'Entities FDR', '#Reactions found',
+                   '#Reactions total', 'Reactions ratio', 'Species identifier', 'Species name',
+                   'Submitted entities found', 'Mapped entities', 'Found reaction identifiers']
+
+
+def _pathway(rng, i):
+    total = rng.randint(5, 500)
+    found = rng.randint(1, total)
+    return {
+        'stId': 'R-HSA-%d' % (100000 + i), 'dbId': 100000 + i, 'name': 'Pathway %d' % i, 'llp': bool(i % 2),
+        'species': {'dbId': 48887, 'taxId': '9606', 'name': 'Homo sapiens'},
+        'entities': {'resource': 'TOTAL', 'total': total, 'found': found, 'ratio': found / 12000.0,
+                     'pValue': rng.random(), 'fdr': rng.random(), 'exp': []},
+        'reactions': {'resource': 'TOTAL', 'total': total * 2, 'found': found * 2, 'ratio': found / 14000.0},
+    }
+
+
+def _result(rng):
+    return {
+        'summary': {'token': TOKEN, 'projection': False, 'interactors': False, 'type': 'OVERREPRESENTATION',
+                    'sampleName': '', 'text': True, 'includeDisease': True},
+        'pathwaysFound': PATHWAYS, 'identifiersNotFound': 500,
+        'resourceSummary': [{'resource': 'TOTAL', 'pathways': PATHWAYS}],
+        'pathways': [_pathway(rng, i) for i in range(PATHWAYS)],
+    }
+
+
+def _pathway_csv(rng):
+    lines = [','.join(PATHWAY_COLUMNS)]
+    for i in range(PATHWAYS):
+        p = _pathway(rng, i)
+        submitted = ';'.join(rng.sample(IDS, 10))
+        lines.append(','.join(str(v) for v in [
+            p['stId'], p['name'], p['entities']['found'], p['entities']['total'], 0, 0, p['entities']['ratio'],
+            p['entities']['pValue'], p['entities']['fdr'], p['reactions']['found'], p['reactions']['total'],
+            p['reactions']['ratio'], 9606, 'Homo sapiens', submitted, submitted, 'R-HSA-1;R-HSA-2']))
+    return '\n'.join(lines) + '\n'
+
+
+def _found_csv(rng):
+    lines = ['Submitted identifier,Found identifier,Resource,Pathways']
+    for gene in IDS[:9500]:
+        pathways = ';'.join('R-HSA-%d' % (100000 + rng.randrange(PATHWAYS)) for _ in range(5))
+        lines.append('%s,P%s,UNIPROT,%s' % (gene, gene[4:], pathways))
+    return '\n'.join(lines) + '\n'
+
+
+def _gmt_zip(rng):
+    gmt = '\n'.join('Pathway %d\tR-HSA-%d\t%s' % (i, 100000 + i, '\t'.join(rng.sample(IDS, rng.randint(5, 150))))
+                    for i in range(PATHWAYS)) + '\n'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr('ReactomePathways.gmt', gmt)
+    return buffer.getvalue()
+
+
+def _sbgn_tar():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for i in range(PATHWAYS):
+            info = tarfile.TarInfo('./R-HSA-%d.sbgn' % (100000 + i))
+            tar.addfile(info, io.BytesIO(b''))
+    return buffer.getvalue()
+
+
+def _schema_page(page):
+    return [{'dbId': page * 25 + i, 'stId': 'R-HSA-%d' % (page * 25 + i), 'displayName': 'Pathway %d' % i,
+             'schemaClass': 'Pathway'} for i in range(25)]
+
+
+def synthetic(root):
+    """
+    LocalTransport serving synthetic responses of realistic size for every call of workload()
+    """
+
+    rng = random.Random(0)
+    local = LocalTransport(root)
+    result = json.dumps(_result(rng))
+    local.store('POST', 'https://reactome.org/AnalysisService/identifiers/', result)
+    local.store('GET', 'https://reactome.org/AnalysisService/download/%s/result.json' % TOKEN, result)
+    local.store('GET', 'https://reactome.org/AnalysisService/download/%s/result.json.gzip' % TOKEN,
+                gzip.compress(result.encode('utf-8')))
+    local.store('GET', 'https://reactome.org/AnalysisService/download/%s/pathways/TOTAL/result.csv' % TOKEN,
+                _pathway_csv(rng))
+    local.store('GET', 'https://reactome.org/AnalysisService/download/%s/entities/found/TOTAL/result.csv' % TOKEN,
+                _found_csv(rng))
+    local.store('GET', 'https://reactome.org/download/current/ReactomePathways.gmt.zip', _gmt_zip(rng))
+    local.store('GET', 'https://reactome.org/download/current/homo_sapiens.sbgn.tar.gz', _sbgn_tar())
+    local.store('GET', 'https://reactome.org/download/current/ehld/svgsummary.txt',
+                '\n'.join('R-HSA-%d' % (100000 + i) for i in range(0, PATHWAYS, 10)))
+    for page in range(1, SCHEMA_PAGES + 1):
+        local.store('GET', 'https://reactome.org/ContentService/data/schema/Pathway/min', json.dumps(_schema_page(page)),
+                    params=(('species', '9606'), ('page', str(page)), ('offset', '25')), exact=True)
+    return local
+
+
+def workload():
+    """
+    Every call made by the benchmarks, in an order that records a complete archive
+    """
+
+    token = analysis.identifiers(ids=','.join(IDS))['summary']['token']
+    analysis.result2json(token)
+    list(analysis.result_pathways(token))
+    analysis.pathway2df(token)
+    analysis.found_entities(token)
+    fiviz.gene_mappings()
+    fiviz.sbgn_stids()
+    for page in range(1, SCHEMA_PAGES + 1):
+        content.schema(name='Pathway', by='min', page=page, offset=25)
+    return token
+
+
+def replay_client(archive, latency=None, pool_maxsize=10):
+    """
+    Client replaying a fixture archive, unthrottled
+    """
+
+    return ReactomeClient(transport=ReplayTransport(archive, latency=latency), rate_limiter=RateLimiter({}),
+                          pool_maxsize=pool_maxsize)
@@ -0,0 +1,3 @@
+"""
+asyncio API for the Reactome web services - requires aiohttp (pip install reactome2py[aio])
+"""
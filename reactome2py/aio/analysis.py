@@ -0,0 +1,101 @@
+"""
+Awaitable Pathway Analysis Service
+Non-blocking versions of every function in reactome2py.analysis with the same signatures and return values,
+ex. result = await analysis.identifiers(ids='EGF,EGFR') - except result_pathways(), an asynchronous generator streaming
+the pathways while the result downloads, ex. async for pathway in analysis.result_pathways(token) \n
+Requests are sent over reactome2py.aio.client.get_client(), which bounds the number of calls in flight
+"""
+from reactome2py import analysis as _analysis
+from reactome2py.aio.client import awaitable, get_client
+from reactome2py.jsonbackend import aiter_array
+import zlib
+import requests
+
+
+identifier = awaitable(_analysis.identifier)
+identifiers = awaitable(_analysis.identifiers)
+identifiers_form = awaitable(_analysis.identifiers_form)
+identifiers_expression = awaitable(_analysis.identifiers_expression)
+identifiers_url = awaitable(_analysis.identifiers_url)
+result2json = awaitable(_analysis.result2json)
+pathway2df = awaitable(_analysis.pathway2df)
+found_entities = awaitable(_analysis.found_entities)
+unfound_entities = awaitable(_analysis.unfound_entities)
+db_name = awaitable(_analysis.db_name)
+db_version = awaitable(_analysis.db_version)
+report = awaitable(_analysis.report)
+compare_species = awaitable(_analysis.compare_species)
+identifiers_mapping = awaitable(_analysis.identifiers_mapping)
+identifiers_mapping_form = awaitable(_analysis.identifiers_mapping_form)
+identifiers_mapping_url = awaitable(_analysis.identifiers_mapping_url)
+token = awaitable(_analysis.token)
+token_pathways_result = awaitable(_analysis.token_pathways_result)
+token_filter_species = awaitable(_analysis.token_filter_species)
+token_pathways_summary = awaitable(_analysis.token_pathways_summary)
+token_pathway_summary = awaitable(_analysis.token_pathway_summary)
+token_unfound_identifiers = awaitable(_analysis.token_unfound_identifiers)
+token_pathway_page = awaitable(_analysis.token_pathway_page)
+token_pathways_binned = awaitable(_analysis.token_pathways_binned)
+token_pathways_reactions = awaitable(_analysis.token_pathways_reactions)
+token_pathway_reactions = awaitable(_analysis.token_pathway_reactions)
+token_resources = awaitable(_analysis.token_resources)
+import_json = awaitable(_analysis.import_json)
+import_form = awaitable(_analysis.import_form)
+import_url = awaitable(_analysis.import_url)
+
+
+def result_pathways(token, fields=None, header=False, gzip=True, chunk_size=2 ** 16):
+    """
+    Streams the pathway hits of an analysis result one at a time while the result is received, so that memory use
+    stays flat however many pathways are hit, ex. async for pathway in result_pathways(token)
+
+    :param token: The token associated with the data result
+    :param fields: Optional list of pathway fields to keep ex. ['stId', 'name', 'entities'] - all fields by default
+    :param header: Boolean value if true - first yields a dictionary of the result members preceding the pathways
+    :param gzip: Boolean value if true - downloads the gzipped result and decompresses it while reading
+    :param chunk_size: Size of the chunks read from the response
+    :return: Asynchronous generator of pathway dictionaries
+    """
+
+    return _result_pathways(get_client(), token, fields, header, gzip, chunk_size)
+
+
+async def _result_pathways(client, token, fields, header, gzip, chunk_size):
+    """
+    result_pathways() over the given AsyncReactomeClient
+    """
+
+    request = requests.Request('GET', _analysis._result_url(token, gzip), headers={'accept': 'application/json'})
+    chunks = client.stream(request.prepare(), chunk_size)
+    body = _gunzip(chunks, chunk_size) if gzip else chunks
+    items = aiter_array(body, 'pathways')
+    try:
+        first = True
+        async for item in items:
+            if first:
+                first = False
+                if header:
+                    yield item
+                continue
+            yield _analysis._keep(item, fields)
+    finally:
+        await items.aclose()
+        if body is not chunks:
+            await body.aclose()
+        await chunks.aclose()
+
+
+async def _gunzip(chunks, chunk_size):
+    """
+    Decompresses gzipped chunks while they are received
+    """
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        for data in _analysis._inflate(decompressor, chunk, chunk_size):
+            yield data
+    yield decompressor.flush()
+
+
+# streaming functions, bound to a client by AsyncReactomeClient.analysis
+_STREAMING = {'result_pathways': _result_pathways}
@@ -0,0 +1,617 @@
+"""
+Non-blocking client for the Reactome web services built on aiohttp.
+Keeps many calls in flight on one event loop, bounded by a semaphore, without a thread pool. \n
+The awaitable service functions reuse the blocking functions' request building and response parsing: a call first
+runs the blocking function to capture the request it would send, awaits that exchange over aiohttp, then runs the
+function again over the received response (repeating for functions that issue several requests).
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from importlib import import_module
+from requests.exceptions import ConnectionError, Timeout
+from requests.structures import CaseInsensitiveDict
+from reactome2py import instrument, tracing
+from reactome2py.cache import VERSION_URL, copy_response, request_key
+from reactome2py.client import ReactomeClient, _was_sent, using
+from reactome2py.exceptions import ReactomeConnectionError, raise_for_status
+from reactome2py.ratelimit import shared_limiter
+from reactome2py.retry import Retry
+from reactome2py.singleflight import AsyncSingleFlight
+from reactome2py.transport import rebase
+from reactome2py.upload import replayable
+import asyncio
+import datetime
+import functools
+import inspect
+import threading
+import time
+import warnings
+import aiohttp
+import requests
+
+
+class _Pending(Exception):
+    """
+    Raised by the capturing client when the blocking function issues a request that has not been exchanged yet
+    """
+
+    def __init__(self, request, idempotent=None):
+        super(_Pending, self).__init__(request.url)
+        self.request = request
+        self.idempotent = idempotent
+
+
+class _Replay(ReactomeClient):
+    """
+    Blocking client stand-in that answers with responses already received over aiohttp
+    """
+
+    def __init__(self, exchanges):
+        super(_Replay, self).__init__()
+        self._exchanges = iter(exchanges)
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        kwargs.pop('timeout', None)
+        kwargs.pop('stream', None)
+        instrument.begin_request()
+        try:
+            response, record = next(self._exchanges)
+        except StopIteration:
+            instrument.serialized()
+            raise _Pending(requests.Request(method, url, **kwargs).prepare(), idempotent)
+        if record is not None:
+            instrument.attach(record)
+        return response
+
+
+class AsyncReactomeClient(object):
+    """
+    Non-blocking client for the Reactome web services.
+
+    The awaitable module functions are also available bound to a client instance,
+    ex. await client.analysis.token(token).
+
+    :param max_concurrency: Maximum number of requests in flight at once over this client
+    :param limit_per_host: Maximum number of keep-alive connections kept open per host
+    :param timeout: Total timeout in seconds of one request - None waits forever
+    :param headers: Extra headers sent with every request
+    :param rate_limiter: RateLimiter holding the per-host request budgets - defaults to the process-wide
+        shared_limiter() also used by the blocking clients
+    :param retry: Retry policy applied to every request - defaults to Retry(), Retry(total=0) disables retrying
+    :param cache: Optional DiskCache serving repeated Content Service, download and FI GET requests of the current
+        release from disk
+    :param memo: Optional MemoryCache serving repeated GET requests from memory, checked before the disk cache
+    :param coalesce: If true, concurrent identical GET requests from several tasks are sent only once and all
+        callers share the outcome
+    :param transport: Optional in-process Transport, ex. LocalTransport, answering instead of aiohttp
+    :param base_urls: Dictionary of service name ('analysis', 'content', 'download', 'fi') to the base url its
+        requests are sent to instead of the public server
+    :param hooks: Callbacks receiving an instrument.Event for every request served, see add_hook()
+    """
+
+    def __init__(self, max_concurrency=20, limit_per_host=10, timeout=None, headers=None, rate_limiter=None,
+                 retry=None, cache=None, memo=None, coalesce=True, transport=None, base_urls=None, hooks=None):
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.rate_limiter = rate_limiter if rate_limiter is not None else shared_limiter()
+        self.retry = retry if retry is not None else Retry()
+        self.cache = cache
+        self.memo = memo
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.transport = transport
+        self.base_urls = dict(base_urls or {})
+        self.hooks = list(hooks or [])
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        self._closer = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __getattr__(self, name):
+        if name in ('analysis', 'content'):
+            return _BoundService(self, name)
+        raise AttributeError(name)
+
+    async def _bind(self):
+        """
+        The aiohttp session and concurrency semaphore of the running event loop, created on first use. The session
+        is closed as the loop shuts down its asynchronous generators, ex. when asyncio.run() returns - one left open
+        by another event loop is closed first
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._loop is not loop or self._session.closed:
+            if self._session is not None and not self._session.closed:
+                await _close_stale(self._session, self._loop)
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                                  trace_configs=[_timings()])
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self._closer = _closing(self._session)
+            await self._closer.asend(None)
+        return self._session, self._semaphore
+
+    async def send(self, request, idempotent=None):
+        """
+        Sends a prepared request and reads the whole response body, retrying transient failures
+
+        :param request: requests.PreparedRequest
+        :param idempotent: Whether the request may be repeated freely - defaults to true for GET and false for POST
+        :return: requests.Response holding the received body
+        :raises ReactomeConnectionError: The server could not be reached once retries were exhausted
+        :raises ReactomeHTTPError: The server answered with an error status code once retries were exhausted
+        """
+
+        response, record = await self._observe(request, idempotent)
+        if record is not None:
+            instrument.attach(record)
+        return response
+
+    async def _observe(self, request, idempotent=None, stream=False):
+        """
+        Sends a prepared request, collecting its measurements when hooks are registered
+
+        :param stream: If true, the response body is left unread and the caches are bypassed, see stream()
+        :return: (response, instrument.Record or None)
+        """
+
+        fetch = functools.partial(self._send, stream=True) if stream else self._memoize
+        if not self.hooks and not tracing.enabled():
+            return await fetch(request, idempotent), None
+
+        record = instrument.Record(self.hooks, request.method, request.url, request.body)
+        record.span, activation = tracing.start_http(record.method, record.url)
+        token = instrument.track(record)
+        try:
+            response = await fetch(request, idempotent)
+        except Exception as e:
+            record.fail(e)
+            raise
+        finally:
+            instrument.untrack(token)
+            tracing.deactivate(activation)
+        record.finish(response)
+        return response, record
+
+    async def _memoize(self, request, idempotent=None):
+        """
+        Serves a prepared request from the memory cache or fetches it
+        """
+
+        if self.memo is None or not self.memo.accepts(request.method, request.url):
+            return await self._coalesce(request, idempotent)
+
+        key = self.memo.key(request.method, request.url, headers=request.headers)
+        response = self.memo.get(key)
+        if response is None:
+            instrument.note(cache='miss')
+            response = await self._coalesce(request, idempotent)
+            self.memo.set(key, response)
+        else:
+            instrument.note(cache='hit')
+        return response
+
+    async def _coalesce(self, request, idempotent=None):
+        """
+        Joins an identical GET request already in flight in another task, or fetches it
+        """
+
+        if self.single_flight is None or request.method != 'GET':
+            return await self._fetch(request, idempotent)
+
+        key = request_key(request.method, request.url, headers=request.headers)
+        response, shared = await self.single_flight.do(key, lambda: self._fetch(request, idempotent))
+        if shared:
+            instrument.note(coalesced=True)
+            return copy_response(response)
+        return response
+
+    async def _fetch(self, request, idempotent=None):
+        """
+        Serves a prepared request from the disk cache or the network
+        """
+
+        if self.cache is None or not self.cache.accepts(request.method, request.url):
+            return await self._send(request, idempotent)
+
+        if self.cache.version_due():
+            version = requests.Request('GET', VERSION_URL, headers={'accept': 'text/plain'}).prepare()
+            self.cache.set_version((await self._send(version)).text.strip())
+
+        key = self.cache.key(request.method, request.url, headers=request.headers)
+        response = self.cache.get(key)
+        if response is None:
+            instrument.note(cache='miss')
+            response = await self._send(request, idempotent)
+            self.cache.set(key, response)
+        else:
+            instrument.note(cache='hit')
+        return response
+
+    async def _send(self, request, idempotent=None, stream=False):
+        """
+        Sends a prepared request to the configured base url of its service, retrying transient failures
+        """
+
+        url = rebase(request.url, self.base_urls)
+        if url != request.url:
+            request = request.copy()
+            request.url = url
+        record = instrument.current()
+        attempt = 0
+        mark = time.perf_counter()
+
+        while True:
+            response = error = None
+            try:
+                response = await (self._exchange(request, stream=True) if stream else self._exchange(request))
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, Timeout) as e:
+                error = e
+            if record is not None:
+                mark = record.exchange(mark, response, attempt)
+            if response is not None and response.status_code < 400:
+                return response
+
+            status = response.status_code if response is not None else None
+            if isinstance(error, aiohttp.ClientError):
+                sent = not isinstance(error, aiohttp.ClientConnectorError)
+            else:
+                sent = _was_sent(error)
+            if attempt >= self.retry.total or not replayable(request.body) or \
+                    not self.retry.is_retryable(request.method, idempotent, status=status, sent=sent):
+                break
+            delay = self.retry.delay(attempt, response)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            raise ReactomeConnectionError(str(error) or type(error).__name__, url=request.url,
+                                          attempts=attempt + 1) from error
+        raise_for_status(response, attempts=attempt + 1)
+
+    async def _exchange(self, request, stream=False):
+        """
+        One attempt at sending a prepared request
+
+        :param stream: If true, the body of a successful response is left unread: the response's raw attribute holds
+            the aiohttp response, which keeps its slot of the concurrency semaphore until it is released
+        """
+
+        if self.transport is not None:
+            await self.rate_limiter.acquire_async(request.url)
+            instrument.sending()
+            return await self.transport.send_async(request.method, request.url, headers=dict(request.headers),
+                                                   data=request.body)
+
+        session, semaphore = await self._bind()
+        headers = dict(request.headers)
+        headers.pop('Content-Length', None)
+        headers.pop('Transfer-Encoding', None)
+
+        timings = {}
+        await semaphore.acquire()
+        try:
+            await self.rate_limiter.acquire_async(request.url)
+            instrument.sending()
+            resp = await session.request(request.method, request.url, headers=headers, data=request.body,
+                                         trace_request_ctx=timings)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        if stream and resp.status < 400:
+            resp.release = _releasing(resp.release, semaphore)
+            content = None
+        else:
+            try:
+                content = await resp.read()
+            finally:
+                resp.release()
+                semaphore.release()
+        instrument.note(dns=timings.get('dns'), connect=timings.get('connect'))
+
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = str(resp.url)
+        response.request = request
+        if content is None:
+            response.raw = resp
+        else:
+            response._content = content
+            response._content_consumed = True
+        if 'headers' in timings:
+            response.elapsed = datetime.timedelta(seconds=timings['headers'])
+        return response
+
+    async def stream(self, request, chunk_size=2 ** 16):
+        """
+        Sends a prepared request and yields its response body in chunks as they arrive, ex. for downloads too large
+        to hold in memory. Transient failures are retried until the response headers are received; the caches and
+        coalescing are bypassed.
+
+        :param request: requests.PreparedRequest
+        :param chunk_size: Maximum size of the chunks yielded
+        :return: Asynchronous generator of bytes
+        :raises ReactomeConnectionError: The server could not be reached once retries were exhausted
+        :raises ReactomeHTTPError: The server answered with an error status code once retries were exhausted
+        """
+
+        response, record = await self._observe(request, stream=True)
+        received = 0
+        try:
+            if response.raw is None:
+                for start in range(0, len(response.content), chunk_size):
+                    yield response.content[start:start + chunk_size]
+                received = len(response.content)
+            else:
+                async for chunk in response.raw.content.iter_chunked(chunk_size):
+                    received += len(chunk)
+                    yield chunk
+        finally:
+            if response.raw is not None:
+                response.raw.release()
+            if record is not None:
+                record.bytes_received = received
+                record.emit()
+
+    async def call(self, func, *args, **kwargs):
+        """
+        Awaits a blocking service function with its requests sent over this client
+
+        :param func: A function of analysis, content or fiviz
+        :return: The function's result
+        """
+
+        exchanges = []
+        arguments = functools.partial(_arguments, func, args, kwargs)
+        with tracing.span(getattr(func, 'endpoint', func.__name__), arguments):
+            while True:
+                try:
+                    with using(_Replay(exchanges)), tracing.replaying():
+                        return func(*args, **kwargs)
+                except _Pending as pending:
+                    exchanges.append(await self._observe(pending.request, pending.idempotent))
+
+    def add_hook(self, hook):
+        """
+        Registers a callback receiving an instrument.Event for every request served by the client
+
+        :param hook: Callable taking the event, ex. instrument.LatencyHistogram()
+        :return: hook
+        """
+
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def cache_info(self):
+        """
+        Usage counters of the client's memory cache
+
+        :return: CacheInfo(hits, misses, evictions, expirations, entries, bytes, max_bytes) or None without memo
+        """
+
+        if self.memo is not None:
+            return self.memo.cache_info()
+
+    async def close(self):
+        """
+        Closes every pooled connection held by the client
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def _closing(session):
+    """
+    Asynchronous generator suspended until its event loop shuts down its asynchronous generators, then closing the
+    session while the loop still runs its connections
+    """
+
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
+async def _close_stale(session, loop):
+    """
+    Closes a session created on another event loop that ended without shutting down its asynchronous generators: on
+    that loop if it still runs in another thread, else on the running loop, which releases the session and its
+    connector - the sockets of a closed loop are left to the garbage collector
+    """
+
+    if loop.is_running() and not loop.is_closed():
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        return
+
+    try:
+        await session.close()
+    except RuntimeError as e:
+        warnings.warn('Could not close the session of a closed event loop: %s' % e, ResourceWarning)
+
+
+def _releasing(release, semaphore):
+    """
+    Release method of a streamed aiohttp response that also frees its slot of the concurrency semaphore, once
+    """
+
+    released = []
+
+    def wrapper():
+        if not released:
+            released.append(True)
+            semaphore.release()
+        return release()
+
+    return wrapper
+
+
+def _arguments(func, args, kwargs):
+    """
+    Arguments of a call by parameter name, defaults included
+    """
+
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return {}
+    bound.apply_defaults()
+    return bound.arguments
+
+
+def _timings():
+    """
+    aiohttp trace configuration collecting the DNS, connect and time to first byte durations of a request into
+    its trace_request_ctx dictionary
+    """
+
+    def mark(name):
+        async def handler(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx[name] = time.perf_counter()
+        return handler
+
+    def measure(name, start):
+        async def handler(session, context, params):
+            timings = context.trace_request_ctx
+            if timings is not None and start in timings:
+                timings[name] = time.perf_counter() - timings[start]
+        return handler
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(mark('start'))
+    config.on_dns_resolvehost_start.append(mark('dns_start'))
+    config.on_dns_resolvehost_end.append(measure('dns', 'dns_start'))
+    config.on_connection_create_start.append(mark('connect_start'))
+    config.on_connection_create_end.append(measure('connect', 'connect_start'))
+    config.on_request_end.append(measure('headers', 'start'))
+    return config
+
+
+class _BoundService(object):
+    """
+    An awaitable service module whose functions run over a given client
+    """
+
+    def __init__(self, client, name):
+        self._client = client
+        self._module = import_module('reactome2py.%s' % name)
+        self._streaming = getattr(import_module('reactome2py.aio.%s' % name), '_STREAMING', {})
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if name.startswith('_') or not callable(func):
+            return func
+
+        if name in self._streaming:
+            stream = self._streaming[name]
+
+            @functools.wraps(func)
+            def streaming(*args, **kwargs):
+                return stream(self._client, *_arguments(func, args, kwargs).values())
+
+            return streaming
+
+        @functools.wraps(func)
+        async def bound(*args, **kwargs):
+            return await self._client.call(func, *args, **kwargs)
+
+        return bound
+
+    def __dir__(self):
+        return [name for name in dir(self._module) if not name.startswith('_')]
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """
+    The process-wide asynchronous client shared by the awaitable module functions, created on first use
+
+    :return: AsyncReactomeClient
+    """
+
+    global _default_client
+
+    with _default_lock:
+        if _default_client is None:
+            _default_client = AsyncReactomeClient()
+
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replaces the process-wide asynchronous client, ex. to change the concurrency bound of every awaitable call
+
+    :param client: AsyncReactomeClient instance - None resets to a fresh default on next use
+    :return: The previous client
+    """
+
+    global _default_client
+
+    with _default_lock:
+        previous, _default_client = _default_client, client
+
+    return previous
+
+
+def awaitable(func):
+    """
+    Awaitable version of a blocking service function, sending its requests over get_client()
+
+    :param func: A function of analysis, content or fiviz
+    :return: Coroutine function with the same signature and docstring
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await get_client().call(func, *args, **kwargs)
+
+    return wrapper
+
+
+async def gather(func, ids, *args, **kwargs):
+    """
+    Calls an awaitable service function once per identifier concurrently, ex. await gather(content.query_id, st_ids).
+    Repeated identifiers are only requested once; the number of calls in flight is bounded by the client.
+
+    :param func: Awaitable service function taking the identifier as its first argument
+    :param ids: List of identifiers
+    :param args: Further positional arguments passed to every call
+    :param return_exceptions: If true failed calls return their exception in place instead of raising the first one
+    :param kwargs: Further keyword arguments passed to every call
+    :return: List of results in the order of ids
+    """
+
+    return_exceptions = kwargs.pop('return_exceptions', False)
+    ids = list(ids)
+    unique = list(dict.fromkeys(ids))
+    name = '%s.gather' % getattr(func, 'endpoint', func.__name__)
+    with tracing.span(name, lambda: {'ids': len(ids), 'unique': len(unique)}):
+        results = await asyncio.gather(*[func(id, *args, **kwargs) for id in unique],
+                                       return_exceptions=return_exceptions)
+    by_id = dict(zip(unique, results))
+    return [by_id[id] for id in ids]
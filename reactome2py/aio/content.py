@@ -0,0 +1,63 @@
+"""
+Awaitable Content Service
+Non-blocking versions of every function in reactome2py.content with the same signatures and return values,
+ex. ancestors = await content.event_ancestors('R-HSA-5673001') \n
+Bulk lookups resolve many identifiers concurrently and return the results in input order,
+ex. entries = await content.gather(content.query_id, ['R-HSA-60140', 'R-HSA-5673001'])
+"""
+from reactome2py import content as _content
+from reactome2py.aio.client import awaitable, gather
+
+
+discover = awaitable(_content.discover)
+disease = awaitable(_content.disease)
+entities_complex = awaitable(_content.entities_complex)
+entities_complexes = awaitable(_content.entities_complexes)
+entity_structures = awaitable(_content.entity_structures)
+entity_other_form = awaitable(_content.entity_other_form)
+event_ancestors = awaitable(_content.event_ancestors)
+event_species = awaitable(_content.event_species)
+export_diagram = awaitable(_content.export_diagram)
+export_document = awaitable(_content.export_document)
+export_event = awaitable(_content.export_event)
+export_fireworks = awaitable(_content.export_fireworks)
+export_reaction = awaitable(_content.export_reaction)
+interactors_psicquic_acc = awaitable(_content.interactors_psicquic_acc)
+interactors_psicquic_accs = awaitable(_content.interactors_psicquic_accs)
+interactors_psicquic_resources = awaitable(_content.interactors_psicquic_resources)
+interactors_static_acc = awaitable(_content.interactors_static_acc)
+interactors_acc_pathways = awaitable(_content.interactors_acc_pathways)
+interactors_static_accs = awaitable(_content.interactors_static_accs)
+token_interactors = awaitable(_content.token_interactors)
+interactors_psicquic_url = awaitable(_content.interactors_psicquic_url)
+interactors_upload_content = awaitable(_content.interactors_upload_content)
+interactors_form = awaitable(_content.interactors_form)
+interactors_url = awaitable(_content.interactors_url)
+mapping = awaitable(_content.mapping)
+orthology_events = awaitable(_content.orthology_events)
+orthology = awaitable(_content.orthology)
+participants = awaitable(_content.participants)
+participants_physical_entities = awaitable(_content.participants_physical_entities)
+participants_reference_entities = awaitable(_content.participants_reference_entities)
+pathway_contained_event = awaitable(_content.pathway_contained_event)
+pathway_contained_event_atttibute = awaitable(_content.pathway_contained_event_atttibute)
+pathways_low_diagram = awaitable(_content.pathways_low_diagram)
+pathways_low_entity = awaitable(_content.pathways_low_entity)
+pathways_top_level = awaitable(_content.pathways_top_level)
+person_name = awaitable(_content.person_name)
+person_id = awaitable(_content.person_id)
+query_id = awaitable(_content.query_id)
+query_ids = awaitable(_content.query_ids)
+references = awaitable(_content.references)
+species = awaitable(_content.species)
+schema = awaitable(_content.schema)
+search_diagram = awaitable(_content.search_diagram)
+search_diagram_instance = awaitable(_content.search_diagram_instance)
+search_diagram_pathway_flag = awaitable(_content.search_diagram_pathway_flag)
+search_facet = awaitable(_content.search_facet)
+search_facet_query = awaitable(_content.search_facet_query)
+search_fireworks = awaitable(_content.search_fireworks)
+search_fireworks_flag = awaitable(_content.search_fireworks_flag)
+search_query = awaitable(_content.search_query)
+search_spellcheck = awaitable(_content.search_spellcheck)
+search_suggest = awaitable(_content.search_suggest)
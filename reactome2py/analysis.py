@@ -6,15 +6,31 @@ Data model key classes for id query are available @ https://reactome.org/documen
 """
 from __future__ import print_function
 from __future__ import unicode_literals
-from requests.exceptions import ConnectionError
-import csv
-import requests
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from contextvars import copy_context
+from reactome2py import tracing
+from reactome2py.client import get_client, using
+from reactome2py.expression import expression_chunks
+from reactome2py.frames import categorize
+from reactome2py.instrument import endpoint
+from reactome2py.jsonbackend import iter_array, loads
+from reactome2py.upload import upload
+import hashlib
+import io
+import json
+import os
+import zlib
 import pandas
 
 
 NumberTypes = (int, float, complex)
 
+_DECOMPRESS_CHUNK = 2 ** 16
 
+
+@endpoint
 def identifier(id='EGFR', interactors=False, page_size='1', page='1', species='Homo Sapiens', sort_by='ENTITIES_FDR',
                order='ASC', resource='TOTAL', p_value='1', include_disease=True, min_entities=None, max_entities=None,
                projection=False):
@@ -91,17 +107,12 @@ def identifier(id='EGFR', interactors=False, page_size='1', page='1', species='H
     else:
         url_gene = "".join([url, id])
 
-    try:
-        response = requests.get(url=url_gene, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url_gene, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def identifiers(ids='EGF,EGFR', interactors=False, page_size='1', page='1', species='Homo Sapiens',
                 sort_by='ENTITIES_FDR', order='ASC', resource='TOTAL', p_value='1', include_disease=True,
                 min_entities=None, max_entities=None, projection=False):
@@ -176,24 +187,20 @@ def identifiers(ids='EGF,EGFR', interactors=False, page_size='1', page='1', spec
 
     data = ids
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def identifiers_form(path, interactors=False, page_size='1', page='1', species='Homo Sapiens', sort_by='ENTITIES_FDR',
                      order='ASC', resource='TOTAL', p_value='1', include_disease=True, min_entities=None, max_entities=None,
-                     projection=False):
+                     projection=False, gzip=False):
     """
     Given a file path with a list of identifiers conducts reactome pathway enrichment analysis
 
     :param path: absolute path to the the txt file with identifier symbols to be analysed - refer to https://reactome.org/dev/analysis for format.
+        An open file object or an iterable of lines are accepted as well - the content is streamed to the server in chunks
     :param interactors: boolean value if set to false, your query will consider only manually curated Reactome
         pathways with known biological significance. if true, your query will consider Reactome pathways that
         have been expanded by including all available protein-protein interactors from the IntAct database.
@@ -209,6 +216,7 @@ def identifiers_form(path, interactors=False, page_size='1', page='1', species='
     :param projection: if true, projects the identifiers to human and only shows the result in this species
     :param max_entities: maximum number of contained entities per pathway (takes into account the resource)
     :param min_entities: minimum number of contained entities per pathway (takes into account the resource)
+    :param gzip: if true, the content is gzip-compressed while it is sent
     :return:
     """
 
@@ -260,19 +268,189 @@ def identifiers_form(path, interactors=False, page_size='1', page='1', species='
     else:
         url = 'https://reactome.org/AnalysisService/identifiers/form/'
 
-    data = open(path, 'rb').read()
+    data = upload(path, compress=gzip)
+    if data.compress:
+        headers['Content-Encoding'] = 'gzip'
+
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
+
+    return loads(response.content)
+
+
+@endpoint
+def identifiers_expression(data, index=None, columns=None, precision=6, stream=False, gzip=False, **kwargs):
+    """
+    Given an expression table conducts reactome pathway analysis of the identifiers and their expression values
+
+    :param data: pandas data frame with the identifiers as index and one column per sample, pandas series of one
+        sample, or 2-D NumPy array ex. identifiers_expression(matrix, index=genes, columns=samples)
+    :param index: Identifiers of the rows - required for NumPy arrays
+    :param columns: Sample names - default to the data frame's columns or sample1, sample2, ...
+    :param precision: Number of significant digits sent per value
+    :param stream: If true, the payload is streamed in chunks to the form endpoint as it is formatted, else it is
+        built in memory and posted to the identifiers endpoint
+    :param gzip: If true and stream is set, the payload is gzip-compressed while it is sent
+    :param kwargs: Further parameters of identifiers() ex. page_size, species, projection
+    :return: Json dictionary object
+    """
+
+    chunks = expression_chunks(data, index, columns, precision)
+    if stream:
+        return identifiers_form(chunks, gzip=gzip, **kwargs)
+    return identifiers(ids=''.join(chunks), **kwargs)
+
+
+class Submission(namedtuple('Submission', ['key', 'position', 'token', 'summary', 'error'])):
+    """
+    Outcome of one identifier list of batch_identifiers(): the key and position of the list in the input, the token
+    and summary of its analysis, or the exception that failed it
+    """
+
+
+def batch_identifiers(lists, workers=8, checkpoint=None, **params):
+    """
+    Given many identifier lists conducts reactome pathway enrichment analysis of each, several at a time,
+    ex. for result in batch_identifiers({'sample1': 'EGF,EGFR', 'sample2': ['TP53', 'BAX']}, checkpoint='run.jsonl')
+
+    :param lists: dictionary of key to identifiers, or iterable of identifiers keyed by position - identifiers are a
+        comma separated string or a list of strings
+    :param workers: Maximum number of analyses submitted at once
+    :param checkpoint: Path of a JSON lines file the finished lists are appended to - lists already in it with the
+        same identifiers and parameters are not submitted again, so an interrupted run resumes where it stopped.
+        Keys must then be JSON serializable ex. str, int or tuples of them
+    :param params: Further parameters of identifiers() ex. species, projection, interactors
+    :return: Iterator of Submission in order of completion - lists finished by an earlier run come back from the
+        checkpoint as they are reached. Failed lists carry their error and are not checkpointed, so that they are
+        submitted again on resume
+    :raises TypeError: A key of lists can not be saved to the checkpoint
+    """
+
+    if checkpoint and isinstance(lists, dict):
+        for key in lists:
+            _checkpoint_key(key)
+    items = lists.items() if isinstance(lists, dict) else enumerate(lists)
+    return _batch(items, workers, checkpoint, params)
 
+
+def _batch(items, workers, checkpoint, params):
+    """
+    Submissions of batch_identifiers(), in a span covering the whole batch - not the current one, as the caller runs
+    between the submissions yielded
+    """
+
+    done = _load_checkpoint(checkpoint)
+    client = get_client()
+    log = open(checkpoint, 'a') if checkpoint else None
+    if log is not None and log.tell() and not _ends_line(checkpoint):
+        log.write('\n')
+    batch, parent = tracing.start('analysis.batch_identifiers',
+                                  lambda: dict(params, workers=workers, resumable=len(done)))
+
+    def submit(ids):
+        with using(client), tracing.activated(parent):
+            return identifiers(ids=ids, **params)
+
+    pending = {}
     try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+        with ThreadPoolExecutor(workers) as pool:
+            try:
+                for position, (key, ids) in enumerate(items):
+                    ids = ids if isinstance(ids, str) else '\n'.join(ids)
+                    digest = _digest(ids, params)
+                    saved = done.get(_checkpoint_key(key)) if log is not None else None
+                    if saved is not None and saved[1] == digest:
+                        yield saved[0]._replace(key=key, position=position)
+                        continue
+
+                    # bound the submissions in flight so long iterators are consumed as the lists finish
+                    while len(pending) >= workers:
+                        for submission in _finished(pending, log):
+                            yield submission
+                    pending[pool.submit(copy_context().run, submit, ids)] = (key, position, digest)
+
+                while pending:
+                    for submission in _finished(pending, log):
+                        yield submission
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        tracing.end(batch)
+        if log is not None:
+            log.close()
+
+
+def _finished(pending, log):
+    """
+    Submissions of the futures completed next, appended to the checkpoint log when they succeeded
+    """
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    completed, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+    for future in completed:
+        key, position, digest = pending.pop(future)
+        try:
+            result = future.result()
+        except Exception as error:
+            yield Submission(key, position, None, None, error)
+            continue
+
+        summary = result.get('summary', {})
+        submission = Submission(key, position, summary.get('token'), summary, None)
+        if log is not None:
+            log.write(json.dumps({'key': key, 'digest': digest, 'position': position, 'token': submission.token,
+                                  'summary': summary}) + '\n')
+            log.flush()
+        yield submission
+
+
+def _checkpoint_key(key):
+    """
+    JSON encoding of a key identifying its list in the checkpoint - tuples and lists encode alike
+    """
 
+    try:
+        return json.dumps(key, sort_keys=True)
+    except (TypeError, ValueError):
+        raise TypeError('Can not checkpoint the list of key %r: keys must be JSON serializable' % (key,))
+
+
+def _digest(ids, params):
+    """
+    Digest of the identifiers and parameters of a submission, telling a checkpointed result apart from a stale one
+    """
 
+    payload = json.dumps({'ids': ids, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _ends_line(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _load_checkpoint(path):
+    """
+    Submissions saved by earlier runs with the digest of their identifiers and parameters, by JSON-encoded key - a
+    line cut short by an interruption is ignored, and a key saved twice keeps its last record
+    """
+
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            key = record['key']
+            done[_checkpoint_key(key)] = (Submission(key, record['position'], record['token'], record['summary'], None),
+                                          record.get('digest'))
+    return done
+
+
+@endpoint
 def identifiers_url(external_url, interactors=False, page_size='1', page='1', species='Homo Sapiens', sort_by='ENTITIES_FDR',
                     order='ASC', resource='TOTAL', p_value='1', include_disease=True, min_entities=None, max_entities=None,
                     projection=False):
@@ -348,27 +526,24 @@ def identifiers_url(external_url, interactors=False, page_size='1', page='1', sp
 
     data = external_url
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def result2json(token, path='', file='result.json', save=False, gzip=False, chunk_size=128):
     """
-    View of analysis result in json format
+    View of analysis result in json format. The result is downloaded gzip-compressed unless it is returned from the
+    uncompressed endpoint (save=False, gzip=False), which still negotiates compression at the HTTP level.
 
     :param token: The token associated with the data result - analysis Web-Service is token based, so for every analysis
         request a TOKEN is associated to the result
     :param path: Absolute path to save the file containing analysis results to
     :param file: File name to save the analysis results to
     :param save: Boolean value if true - saves result as json file. default is set to false.
-    :param gzip: Boolean value if true - saves result as gzipped json file. default is set to false.
+    :param gzip: Boolean value if true - downloads the gzipped result: saved as is when save is true, else decompressed
+        while it is read and returned as a json object. default is set to false.
     :param chunk_size: Python generator iter_content() chunk size - default set to 128
     :return: File or json object containing data on pathway, entities, statistics, etc. found in analysis overlap
     """
@@ -382,22 +557,170 @@ def result2json(token, path='', file='result.json', save=False, gzip=False, chun
     else:
         url = 'https://reactome.org/AnalysisService/download/%s/result.json' % token
 
+    if not save and not gzip:
+        return loads(get_client().get(url=url, headers=headers).content)
+
+    response = get_client().get(url=url, headers=headers, stream=True)
+
+    if not save:
+        return loads(b''.join(_gunzip(response, max(chunk_size, _DECOMPRESS_CHUNK))))
+
+    chunks = response.iter_content(chunk_size=chunk_size) if gzip else _gunzip(response, chunk_size)
+    with open("".join([path, file]), 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+@endpoint
+def result_pathways(token, fields=None, header=False, gzip=True, chunk_size=2 ** 16):
+    """
+    Streams the pathway hits of an analysis result one at a time while the result is downloaded, so that memory use
+    stays flat however many pathways are hit - the streaming counterpart of result2json(token)['pathways'].
+
+    :param token: The token associated with the data result - analysis Web-Service is token based, so for every analysis
+        request a TOKEN is associated to the result
+    :param fields: Optional list of pathway fields to keep ex. ['stId', 'name', 'entities'] - all fields by default
+    :param header: Boolean value if true - first yields a dictionary of the result members preceding the pathways
+        (summary, expression, identifiersNotFound, pathwaysFound)
+    :param gzip: Boolean value if true - downloads the gzipped result and decompresses it while reading
+    :param chunk_size: Size of the chunks read from the response
+    :return: Generator of pathway dictionaries
+    """
+
+    headers = {
+        'accept': 'application/json',
+    }
+
+    response = get_client().get(url=_result_url(token, gzip), headers=headers, stream=True)
+    chunks = _gunzip(response, chunk_size) if gzip else response.iter_content(chunk_size=chunk_size)
+    return _project(response, iter_array(chunks, 'pathways'), fields, header)
+
+
+def _result_url(token, gzip):
+    """
+    Download url of the json result of an analysis, gzipped or not
+    """
+
+    if gzip:
+        return 'https://reactome.org/AnalysisService/download/%s/result.json.gzip' % token
+    return 'https://reactome.org/AnalysisService/download/%s/result.json' % token
+
+
+def _project(response, items, fields, header):
+    """
+    Skips or passes the header of iter_array() and keeps the requested fields of its elements, closing the response
+    once done
+    """
+
+    with closing(response), closing(items):
+        first = next(items, None)
+        if header and first is not None:
+            yield first
+        for item in items:
+            yield _keep(item, fields)
+
+
+def _keep(item, fields):
+    """
+    The requested fields of a pathway - all of them when fields is None
+    """
+
+    return item if fields is None else dict((field, item[field]) for field in fields if field in item)
+
+
+class _BodyReader(io.RawIOBase):
+    """
+    Readable binary file over the chunks of a response body, ex. for pandas.read_csv
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _body(response, chunk_size):
+    """
+    Buffered binary file reading a response body as it arrives
+
+    :param response: requests.Response
+    :param chunk_size: iter_content() chunk size - raised to at least 64 KiB
+    :return: io.BufferedReader
+    """
+
+    chunk_size = max(chunk_size, _DECOMPRESS_CHUNK)
+    return io.BufferedReader(_BodyReader(response.iter_content(chunk_size=chunk_size)), chunk_size)
+
+
+def _entities(response, chunk_size, rows=None):
+    """
+    Parses a csv download of identifiers - quoted fields ex. "H3F3A,H3F3B" kept whole, identifiers kept as strings
+
+    :param response: Streamed requests.Response
+    :param chunk_size: iter_content() chunk size
+    :param rows: Number of rows per data frame of the returned iterator, or None for one data frame
+    :return: pandas data frame or iterator of data frames
+    """
+
+    options = dict(dtype=str, keep_default_na=False, na_values=[''])
     try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
-
-    if response.status_code == 200:
-        if save or gzip:
-            with open("".join([path, file]), 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    f.write(chunk)
-        else:
-            return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+        if rows is None:
+            with closing(response):
+                return categorize(pandas.read_csv(_body(response, chunk_size), **options))
+        return _chunks(response, pandas.read_csv(_body(response, chunk_size), chunksize=rows, **options))
+    except pandas.errors.EmptyDataError:
+        response.close()
+        return pandas.DataFrame() if rows is None else iter(())
+
+
+def _chunks(response, reader):
+    with closing(response), closing(reader):
+        for df in reader:
+            yield df
 
 
+def _gunzip(response, chunk_size):
+    """
+    Decompresses a gzip response body chunk by chunk while it is read
+
+    :param response: requests.Response of a gzipped download
+    :param chunk_size: Size of the compressed chunks read, and at most of the decompressed chunks yielded
+    :return: Generator of decompressed bytes
+    """
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        for data in _inflate(decompressor, chunk, chunk_size):
+            yield data
+    yield decompressor.flush()
+
+
+def _inflate(decompressor, chunk, chunk_size):
+    """
+    Decompressed chunks of at most chunk_size bytes of one compressed chunk
+    """
+
+    while chunk:
+        data = decompressor.decompress(chunk, chunk_size)
+        if data:
+            yield data
+        chunk = decompressor.unconsumed_tail
+
+
+@endpoint
 def pathway2df(token, path='', resource='TOTAL', file='result.csv', save=False, chunk_size=128):
     """
     Create a Data frame of the analysis result for all the pathway hits - save to csv file (comma separated)
@@ -409,37 +732,29 @@ def pathway2df(token, path='', resource='TOTAL', file='result.csv', save=False,
     :param file: File name to save the analysis results to
     :param save: Boolean value if true - saves data frame as csv file. default is set to false.
     :param chunk_size: Python generator iter_content() chunk size - default set to 128
-    :return: Saves the result as csv file or returns a pandas data frame
+    :return: Saves the result as csv file or returns a pandas data frame with numeric columns (counts, ratios,
+        p-values, FDR) and categorical columns for repeated values (species)
     """
 
     headers = {
         'accept': 'text/csv',
     }
 
-    try:
-        response = requests.get(
-            'https://reactome.org/AnalysisService/download/%s/pathways/%s/%s' % (token, resource, file),
-            headers=headers)
-    except ConnectionError as e:
-        print(e)
-
-    if response.status_code == 200:
-        if save:
-            with open("".join([path, file]), 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    f.write(chunk)
-        else:
-            lines = csv.reader(response.text.splitlines(), delimiter=',')
-            row_list = list(lines)
-            df = pandas.DataFrame(row_list)
-            df.columns = df.iloc[0]
-            df = df.iloc[1:]
-            return df
+    response = get_client().get(
+        'https://reactome.org/AnalysisService/download/%s/pathways/%s/%s' % (token, resource, file),
+        headers=headers, stream=True)
+
+    if save:
+        with open("".join([path, file]), 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
     else:
-        print('Status code returned a value of %s' % response.status_code)
+        with closing(response):
+            return categorize(pandas.read_csv(_body(response, chunk_size)))
 
 
-def found_entities(token, path='', resource='TOTAL', file='result.csv', save=False, chunk_size=128):
+@endpoint
+def found_entities(token, path='', resource='TOTAL', file='result.csv', save=False, chunk_size=128, rows=None):
     """
     list of found entities in reactome database
 
@@ -450,36 +765,30 @@ def found_entities(token, path='', resource='TOTAL', file='result.csv', save=Fal
     :param file: File name default is set to result.csv
     :param save: If true saves the result data frame as csv file, else it returns the data frame
     :param chunk_size: Python generator iter_content() chunk size - default set to 128
-    :return: Pandas data frame with genes or entities found in pathway enrichment analysis overlap
+    :param rows: If set, returns an iterator of data frames of that many rows each, parsed as the download arrives -
+        for very large mapping tables
+    :return: Pandas data frame with genes or entities found in pathway enrichment analysis overlap, string columns and
+        categorical columns for repeated values (resource)
     """
 
     headers = {
         'accept': 'text/csv',
     }
 
-    try:
-        response = requests.get(
-            'https://reactome.org/AnalysisService/download/%s/entities/found/%s/%s' % (token, resource, file),
-            headers=headers)
-    except ConnectionError as e:
-        print(e)
-
-    if response.status_code == 200:
-        if save:
-            with open("".join([path, file]), 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    f.write(chunk)
-        else:
-            gene_list = response.text.split('\n')
-            df_list = [row.split(",") for row in gene_list[:-1]]
-            df = pandas.DataFrame(df_list)
-            df = df.iloc[1:]
-            return df
+    response = get_client().get(
+        'https://reactome.org/AnalysisService/download/%s/entities/found/%s/%s' % (token, resource, file),
+        headers=headers, stream=True)
+
+    if save:
+        with open("".join([path, file]), 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
     else:
-        print('Status code returned a value of %s' % response.status_code)
+        return _entities(response, chunk_size, rows)
 
 
-def unfound_entities(token, path='', file='result.csv', save=False, chunk_size=128):
+@endpoint
+def unfound_entities(token, path='', file='result.csv', save=False, chunk_size=128, rows=None):
     """
     list of unfound entities in reactome database
 
@@ -489,6 +798,7 @@ def unfound_entities(token, path='', file='result.csv', save=False, chunk_size=1
     :param path: Absolute path to save the csv file to
     :param save:  If true saves the result data frame as csv file, else it returns the data frame
     :param chunk_size: Python generator iter_content() chunk size - default set to 128
+    :param rows: If set, returns an iterator of data frames of that many rows each, parsed as the download arrives
     :return: Pandas data frame with genes or entities not found in pathway enrichment analysis overlap
     """
 
@@ -496,28 +806,19 @@ def unfound_entities(token, path='', file='result.csv', save=False, chunk_size=1
         'accept': 'text/csv',
     }
 
-    try:
-        response = requests.get(
-            'https://reactome.org/AnalysisService/download/%s/entities/notfound/%s' % (token, file),
-            headers=headers)
-    except ConnectionError as e:
-        print(e)
-
-    if response.status_code == 200:
-        if save:
-            with open("".join([path, file]), 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    f.write(chunk)
-        else:
-            gene_list = response.text.split('\n')
-            df_list = [row.split(",") for row in gene_list[:-1]]
-            df = pandas.DataFrame(df_list)
-            df = df.iloc[1:]
-            return df
+    response = get_client().get(
+        'https://reactome.org/AnalysisService/download/%s/entities/notfound/%s' % (token, file),
+        headers=headers, stream=True)
+
+    if save:
+        with open("".join([path, file]), 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
     else:
-        print('Status code returned a value of %s' % response.status_code)
+        return _entities(response, chunk_size, rows)
 
 
+@endpoint
 def db_name():
     """
     The name of current database
@@ -529,17 +830,12 @@ def db_name():
         'accept': 'text/plain',
     }
 
-    try:
-        response = requests.get('https://reactome.org/AnalysisService/database/name', headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get('https://reactome.org/AnalysisService/database/name', headers=headers)
 
-    if response.status_code == 200:
-        return response.text
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return response.text
 
 
+@endpoint
 def db_version():
     """
     The version number of current database
@@ -551,17 +847,12 @@ def db_version():
         'accept': 'text/plain',
     }
 
-    try:
-        response = requests.get('https://reactome.org/AnalysisService/database/version', headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get('https://reactome.org/AnalysisService/database/version', headers=headers)
 
-    if response.status_code == 200:
-        return response.text
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return response.text
 
 
+@endpoint
 def report(token, path, file='report.pdf', number='25', resource='TOTAL', diagram_profile='Modern', analysis_profile='Standard',
                 fireworks_profile='Barium Lithium', species='Homo sapiens', chunk_size=128):
     """
@@ -596,20 +887,15 @@ def report(token, path, file='report.pdf', number='25', resource='TOTAL', diagra
         ('fireworksProfile', fireworks_profile),
     )
 
-    try:
-        response = requests.get('https://reactome.org/AnalysisService/report/%s/%s/%s' % (token, species, file),
-                                headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get('https://reactome.org/AnalysisService/report/%s/%s/%s' % (token, species, file),
+                            headers=headers, params=params)
 
-    if response.status_code == 200:
-        with open("".join([path, file]), 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open("".join([path, file]), 'wb') as f:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            f.write(chunk)
 
 
+@endpoint
 def compare_species(species='48892', page_size='1', page='1', sort_by='ENTITIES_FDR', order='ASC',
                     resource='TOTAL', p_value='1'):
     """
@@ -653,17 +939,12 @@ def compare_species(species='48892', page_size='1', page='1', sort_by='ENTITIES_
 
     url = 'https://reactome.org/AnalysisService/species/homoSapiens/%s' % species
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def identifiers_mapping(ids='EGF,EGFR', interactors=False, projection=False):
     """
     Maps the identifiers passed as a comma seperated list in str format over the different species and if projection is
@@ -698,28 +979,25 @@ def identifiers_mapping(ids='EGF,EGFR', interactors=False, projection=False):
 
     data = ids
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
-def identifiers_mapping_form(path, interactors=False, projection=False):
+@endpoint
+def identifiers_mapping_form(path, interactors=False, projection=False, gzip=False):
     """
     Maps the identifiers passed via txt file over the different species and if projection is set to true, projects the
     result to Homo Sapiens
 
     :param path: Absolute path to the the txt file with identifier symbols to be analysed -
-        refer to https://reactome.org/dev/analysis for format.
+        refer to https://reactome.org/dev/analysis for format. An open file object or an iterable of lines are accepted
+        as well - the content is streamed to the server in chunks
     :param interactors: boolean value if set to false, your query will consider only manually curated Reactome pathways
         with known biological significance. if true, your query will consider Reactome pathways that have been expanded by
         including all available protein-protein interactors from the IntAct database.
     :param projection: If true, projects the identifiers to human and only shows the result in this species
+    :param gzip: If true, the content is gzip-compressed while it is sent
     :return:
     """
 
@@ -741,19 +1019,16 @@ def identifiers_mapping_form(path, interactors=False, projection=False):
         ('interactors', interactors),
     )
 
-    data = open(path, 'rb').read()
+    data = upload(path, compress=gzip)
+    if data.compress:
+        headers['Content-Encoding'] = 'gzip'
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def identifiers_mapping_url(external_url, interactors=False, projection=False):
     """
     Maps the identifiers passed via url over the different species and if projection is set to true, projects the
@@ -787,17 +1062,12 @@ def identifiers_mapping_url(external_url, interactors=False, projection=False):
 
     data = external_url
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token(token, species='Homo sapiens', page_size='1', page='1', sort_by='ENTITIES_FDR', order='ASC', resource='TOTAL',
           p_value='1', include_disease=True, min_entities=None, max_entities=None):
     """
@@ -860,17 +1130,12 @@ def token(token, species='Homo sapiens', page_size='1', page='1', sort_by='ENTIT
 
     url = 'https://reactome.org/AnalysisService/token/%s' % token
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathways_result(token, pathways, species='Homo sapiens', resource='TOTAL', p_value='1', include_disease=True,
                           min_entities=None, max_entities=None):
     """
@@ -920,17 +1185,12 @@ def token_pathways_result(token, pathways, species='Homo sapiens', resource='TOT
 
     data = pathways
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_filter_species(token, species='Homo sapiens', sort_by='ENTITIES_FDR', order='ASC', resource='TOTAL'):
     """
     Queries analysis token and returns and filters the result by species
@@ -957,17 +1217,12 @@ def token_filter_species(token, species='Homo sapiens', sort_by='ENTITIES_FDR',
 
     url = 'https://reactome.org/AnalysisService/token/%s/filter/species/%s' % (token, species)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathways_summary(token, pathways, resource='TOTAL'):
     """
     Queries analysis token and returns a summary of the contained identifiers and interactors for all pathways
@@ -991,17 +1246,12 @@ def token_pathways_summary(token, pathways, resource='TOTAL'):
     data = pathways
     url = 'https://reactome.org/AnalysisService/token/%s/found/all' % token
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathway_summary(token, pathway, resource='TOTAL', page='1', page_size='1', by='all'):
     """
     Queries analysis token and returns a summary of
@@ -1056,17 +1306,12 @@ def token_pathway_summary(token, pathway, resource='TOTAL', page='1', page_size=
 
         url = 'https://reactome.org/AnalysisService/token/%s/found/interactors/%s' % (token, pathway)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_unfound_identifiers(token, page_size='1', page='1'):
     """
     Returns a list of the identifiers not found for a given token
@@ -1094,17 +1339,12 @@ def token_unfound_identifiers(token, page_size='1', page='1'):
     )
     url = 'https://reactome.org/AnalysisService/token/%s/notFound' % token
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathway_page(token, pathway, page_size='1', sort_by='ENTITIES_FDR', order='ASC', resource='TOTAL', p_value='1',
                        include_disease=True, min_entities=None, max_entities=None):
     """
@@ -1159,17 +1399,12 @@ def token_pathway_page(token, pathway, page_size='1', sort_by='ENTITIES_FDR', or
 
     url = 'https://reactome.org/AnalysisService/token/%s/page/%s' % (token, pathway)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathways_binned(token, resource='TOTAL', bin_size='100', p_value='1', include_disease=True):
     """
     Returns a list of binned hit pathway sizes associated with the token
@@ -1207,17 +1442,12 @@ def token_pathways_binned(token, resource='TOTAL', bin_size='100', p_value='1',
 
     url = 'https://reactome.org/AnalysisService/token/%s/pathways/binned' % token
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathways_reactions(token, pathways, resource='TOTAL', p_value='1', include_disease=True, min_entities=None,
                              max_entities=None):
     """
@@ -1265,17 +1495,12 @@ def token_pathways_reactions(token, pathways, resource='TOTAL', p_value='1', inc
 
     url = 'https://reactome.org/AnalysisService/token/%s/reactions/pathways' % token
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_pathway_reactions(token, pathway, resource='TOTAL', p_value='1', include_disease=True, min_entities=None,
                              max_entities=None):
     """
@@ -1320,17 +1545,12 @@ def token_pathway_reactions(token, pathway, resource='TOTAL', p_value='1', inclu
 
     url = 'https://reactome.org/AnalysisService/token/%s/reactions/%s' % (token, pathway)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_resources(token):
     """
     the resources summary associated with the token
@@ -1346,17 +1566,12 @@ def token_resources(token):
 
     url = 'https://reactome.org/AnalysisService/token/%s/resources' % token
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def import_json(input_json):
     """
     Imports the posted json into the service
@@ -1375,17 +1590,12 @@ def import_json(input_json):
 
     url = 'https://reactome.org/AnalysisService/import/'
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def import_form(input_file):
     """
     Imports the posted json file into the service
@@ -1403,17 +1613,12 @@ def import_form(input_file):
 
     url = 'https://reactome.org/AnalysisService/import/form'
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def import_url(input_url):
     """
     Imports the json file provided by the posted url into the service
@@ -1431,13 +1636,7 @@ def import_url(input_url):
 
     url = 'https://reactome.org/AnalysisService/import/url'
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
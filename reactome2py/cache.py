@@ -0,0 +1,313 @@
+"""
+Response caches of the Reactome clients.
+DiskCache persists Content Service, download and Functional Interaction (FI) GET responses across runs. Reactome
+data only changes between releases, so entries are keyed by the request (method, url with its parameters and
+accepted media type) together with the release version reported by the Analysis Service (the value of
+analysis.db_version()). Entries of older releases are dropped as soon as a new release is seen. \n
+MemoryCache keeps recently used responses in process, bounded by a byte budget and a time to live, for the
+lookups that interactive sessions repeat over and over.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict, namedtuple
+import json
+import os
+import sqlite3
+import threading
+import time
+import requests
+
+
+CACHEABLE_PREFIXES = (
+    'https://reactome.org/ContentService/',
+    'https://reactome.org/download/current/',
+    'http://cpws.reactome.org/',
+)
+
+VERSION_URL = 'https://reactome.org/AnalysisService/database/version'
+
+MEMO_PREFIXES = CACHEABLE_PREFIXES + (
+    'https://reactome.org/AnalysisService/token/',
+)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'reactome2py', 'responses.sqlite')
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'expirations', 'entries', 'bytes', 'max_bytes'])
+
+
+def request_key(method, url, params=None, headers=None):
+    """
+    Cache key of a request
+
+    :param method: HTTP method
+    :param url: Request url
+    :param params: Query parameters as passed to requests
+    :param headers: Request headers as passed to requests - only the accepted media type is part of the key
+    :return: str
+    """
+
+    prepared = requests.Request(method.upper(), url, params=params, headers=headers).prepare()
+    return ' '.join([prepared.method, prepared.url, prepared.headers.get('accept', '')])
+
+
+def _response(status, headers, url, content):
+    """
+    A fresh requests.Response holding a cached body
+    """
+
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = url
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def copy_response(response):
+    """
+    An independent copy of a fully read response, ex. for callers sharing one request's outcome
+
+    :param response: requests.Response
+    :return: requests.Response
+    """
+
+    copy = _response(response.status_code, response.headers, response.url, response.content)
+    copy.reason = response.reason
+    copy.request = response.request
+    return copy
+
+
+def _stored_headers(response):
+    """
+    Response headers worth keeping with a decoded body
+    """
+
+    return dict((name, value) for name, value in response.headers.items()
+                if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding'))
+
+
+class DiskCache(object):
+    """
+    SQLite-backed response cache shared by all threads of a client, ex. ReactomeClient(cache=DiskCache())
+
+    :param path: Path of the SQLite database file - created with its directory if missing
+    :param version_ttl: Seconds between two checks of the current release version
+    :param prefixes: Url prefixes of the GET endpoints whose responses are cached
+    """
+
+    def __init__(self, path=DEFAULT_PATH, version_ttl=3600, prefixes=CACHEABLE_PREFIXES):
+        self.path = path
+        self.version_ttl = version_ttl
+        self.prefixes = tuple(prefixes)
+        self.version = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, version TEXT, '
+                             'status INTEGER, headers TEXT, url TEXT, content BLOB)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is not None:
+            self.version = row[0]
+
+    def accepts(self, method, url):
+        """
+        Whether responses of the request are cached
+
+        :param method: HTTP method
+        :param url: Request url
+        :return: bool
+        """
+
+        return method.upper() == 'GET' and url.startswith(self.prefixes)
+
+    key = staticmethod(request_key)
+
+    def version_due(self):
+        """
+        Whether the release version should be checked again
+
+        :return: bool
+        """
+
+        return self._checked is None or time.monotonic() - self._checked > self.version_ttl
+
+    def set_version(self, version):
+        """
+        Records the current release version, dropping the entries of any other release
+
+        :param version: Release version ex. '73'
+        """
+
+        with self._lock:
+            self._checked = time.monotonic()
+            if version == self.version:
+                return
+            with self._db:
+                self._db.execute('DELETE FROM responses WHERE version != ?', (version,))
+                self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+            self.version = version
+
+    def get(self, key):
+        """
+        Cached response of the current release
+
+        :param key: Cache key
+        :return: requests.Response or None on a miss
+        """
+
+        with self._lock:
+            row = self._db.execute('SELECT status, headers, url, content FROM responses WHERE key = ? AND version = ?',
+                                   (key, self.version)).fetchone()
+
+        if row is None:
+            return None
+
+        status, headers, url, content = row
+        return _response(status, json.loads(headers), url, bytes(content))
+
+    def set(self, key, response):
+        """
+        Stores a successful response under the current release
+
+        :param key: Cache key
+        :param response: requests.Response
+        """
+
+        headers = json.dumps(_stored_headers(response))
+
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO responses (key, version, status, headers, url, content) '
+                             'VALUES (?, ?, ?, ?, ?, ?)',
+                             (key, self.version, response.status_code, headers, response.url,
+                              sqlite3.Binary(response.content)))
+
+    def clear(self):
+        """
+        Drops every cached response
+        """
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class MemoryCache(object):
+    """
+    Thread-safe in-process LRU cache of GET responses bounded by a byte budget and a time to live,
+    ex. ReactomeClient(memo=MemoryCache(max_bytes=256 * 2 ** 20, ttl=600)). \n
+    Response bodies are kept as received and decoded again on every hit, so callers may freely modify the
+    objects they get back without corrupting the cache.
+
+    :param max_bytes: Total size of the cached bodies and keys above which least recently used entries are evicted
+    :param ttl: Seconds an entry stays valid - None keeps entries until evicted
+    :param prefixes: Url prefixes of the GET endpoints whose responses are cached - defaults to the Content Service,
+        download and FI endpoints, and the Analysis Service token endpoints (a token's result never changes)
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20, ttl=300, prefixes=MEMO_PREFIXES):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.prefixes = tuple(prefixes)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+        self._lock = threading.Lock()
+
+    key = staticmethod(request_key)
+
+    def accepts(self, method, url):
+        """
+        Whether responses of the request are cached
+
+        :param method: HTTP method
+        :param url: Request url
+        :return: bool
+        """
+
+        return method.upper() == 'GET' and url.startswith(self.prefixes)
+
+    def get(self, key):
+        """
+        Cached response, marking the entry as most recently used
+
+        :param key: Cache key
+        :return: requests.Response or None on a miss
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                self._drop(key)
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        expires, size, status, headers, url, content = entry
+        return _response(status, headers, url, content)
+
+    def set(self, key, response):
+        """
+        Stores a successful response, evicting least recently used entries beyond the byte budget
+
+        :param key: Cache key
+        :param response: requests.Response
+        """
+
+        content = response.content
+        size = len(content) + len(key)
+        if size > self.max_bytes:
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        entry = (expires, size, response.status_code, _stored_headers(response), response.url, content)
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[1]
+
+    def cache_info(self):
+        """
+        Usage counters of the cache
+
+        :return: CacheInfo(hits, misses, evictions, expirations, entries, bytes, max_bytes)
+        """
+
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._expirations, len(self._entries),
+                             self._bytes, self.max_bytes)
+
+    def clear(self):
+        """
+        Drops every cached response, keeping the counters
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,331 @@
+"""
+Shared HTTP client for the Reactome Analysis, Content and Functional Interaction (FI) services.
+By default owns one pooled keep-alive session per host (reactome.org, cpws.reactome.org) so that consecutive calls
+reuse their TCP/TLS connections instead of paying a new handshake each time. \n
+Every function in analysis, content and fiviz sends its request through the client returned by get_client()
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from contextlib import contextmanager
+from importlib import import_module
+from requests.exceptions import ChunkedEncodingError, ConnectionError, ConnectTimeout, Timeout
+from urllib3.exceptions import NewConnectionError
+from reactome2py import instrument, tracing
+from reactome2py.cache import VERSION_URL, copy_response, request_key
+from reactome2py.exceptions import ReactomeConnectionError, raise_for_status
+from reactome2py.ratelimit import shared_limiter
+from reactome2py.retry import Retry
+from reactome2py.singleflight import SingleFlight
+from reactome2py.transport import HTTPTransport, rebase
+from reactome2py.upload import replayable
+import functools
+import threading
+import time
+
+
+SERVICE_MODULES = ('analysis', 'content', 'fiviz')
+
+
+class ReactomeClient(object):
+    """
+    Pooled HTTP client for the Reactome web services.
+
+    The module functions are also available bound to a client instance, ex. client.content.query_id('R-HSA-60140')
+    runs content.query_id over this client.
+
+    :param pool_maxsize: Maximum number of keep-alive connections kept open per host by the default HTTPTransport
+    :param timeout: Default (connect, read) timeout in seconds passed to every request - None waits forever
+    :param headers: Extra headers sent with every request by the default HTTPTransport
+    :param rate_limiter: RateLimiter holding the per-host request budgets - defaults to the process-wide
+        shared_limiter() so that every client and thread draws from the same budget
+    :param retry: Retry policy applied to every request - defaults to Retry(), Retry(total=0) disables retrying
+    :param cache: Optional DiskCache serving repeated Content Service, download and FI GET requests of the current
+        release from disk
+    :param memo: Optional MemoryCache serving repeated GET requests from memory, checked before the disk cache
+    :param coalesce: If true, concurrent identical GET requests from several threads are sent only once and all
+        callers share the outcome
+    :param transport: Transport sending the requests - defaults to an HTTPTransport, LocalTransport serves stored
+        responses from disk
+    :param base_urls: Dictionary of service name ('analysis', 'content', 'download', 'fi') to the base url its
+        requests are sent to instead of the public server
+    :param hooks: Callbacks receiving an instrument.Event for every request served, see add_hook()
+    """
+
+    def __init__(self, pool_maxsize=10, timeout=None, headers=None, rate_limiter=None, retry=None, cache=None,
+                 memo=None, coalesce=True, transport=None, base_urls=None, hooks=None):
+        self.timeout = timeout
+        self.transport = transport if transport is not None else HTTPTransport(pool_maxsize, headers)
+        self.base_urls = dict(base_urls or {})
+        self.rate_limiter = rate_limiter if rate_limiter is not None else shared_limiter()
+        self.retry = retry if retry is not None else Retry()
+        self.cache = cache
+        self.memo = memo
+        self.single_flight = SingleFlight() if coalesce else None
+        self.hooks = list(hooks or [])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        if name in SERVICE_MODULES:
+            return _BoundService(self, name)
+        raise AttributeError(name)
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """
+        Sends a request over the client's transport, retrying transient failures
+
+        :param method: HTTP method ex. 'GET' or 'POST'
+        :param url: Request url
+        :param idempotent: Whether the request may be repeated freely - defaults to true for GET and false for POST,
+            read-only POST endpoints pass True
+        :param kwargs: Keyword arguments accepted by requests.Session.request (headers, params, data, stream, ...)
+        :return: requests.Response with a successful status code
+        :raises ReactomeConnectionError: The server could not be reached once retries were exhausted
+        :raises ReactomeHTTPError: The server answered with an error status code once retries were exhausted
+        """
+
+        kwargs.setdefault('timeout', self.timeout)
+
+        if not self.hooks and not tracing.enabled():
+            return self._memoize(method, url, idempotent, **kwargs)
+
+        record = instrument.Record(self.hooks, method, url, kwargs.get('data'))
+        return instrument.observe(record, self._memoize, method, url, idempotent, **kwargs)
+
+    def _memoize(self, method, url, idempotent=None, **kwargs):
+        """
+        Serves a request from the memory cache or fetches it
+        """
+
+        if self.memo is None or not self.memo.accepts(method, url):
+            return self._coalesce(method, url, idempotent, **kwargs)
+
+        key = self.memo.key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        response = self.memo.get(key)
+        if response is None:
+            instrument.note(cache='miss')
+            response = self._coalesce(method, url, idempotent, **kwargs)
+            self.memo.set(key, response)
+        else:
+            instrument.note(cache='hit')
+        return response
+
+    def _coalesce(self, method, url, idempotent=None, **kwargs):
+        """
+        Joins an identical GET request already in flight in another thread, or fetches it
+        """
+
+        if self.single_flight is None or method.upper() != 'GET' or kwargs.get('stream'):
+            return self._fetch(method, url, idempotent, **kwargs)
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        response, shared = self.single_flight.do(key, lambda: self._fetch(method, url, idempotent, **kwargs))
+        if shared:
+            instrument.note(coalesced=True)
+            return copy_response(response)
+        return response
+
+    def _fetch(self, method, url, idempotent=None, **kwargs):
+        """
+        Serves a request from the disk cache or the network
+        """
+
+        if self.cache is None or not self.cache.accepts(method, url):
+            return self._send(method, url, idempotent, **kwargs)
+
+        if self.cache.version_due():
+            self.cache.set_version(self._send('GET', VERSION_URL, headers={'accept': 'text/plain'},
+                                              timeout=kwargs['timeout']).text.strip())
+
+        key = self.cache.key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        response = self.cache.get(key)
+        if response is None:
+            instrument.note(cache='miss')
+            response = self._send(method, url, idempotent, **kwargs)
+            self.cache.set(key, response)
+        else:
+            instrument.note(cache='hit')
+        return response
+
+    def _send(self, method, url, idempotent=None, **kwargs):
+        """
+        Sends a request over the transport to the configured base url of its service, retrying transient failures
+        """
+
+        url = rebase(url, self.base_urls)
+        record = instrument.current()
+        attempt = 0
+        mark = time.perf_counter()
+
+        while True:
+            self.rate_limiter.acquire(url)
+            if record is not None:
+                record.sending()
+            response = error = None
+            try:
+                response = self.transport.send(method, url, **kwargs)
+            except (ConnectionError, Timeout, ChunkedEncodingError) as e:
+                error = e
+            if record is not None:
+                mark = record.exchange(mark, response, attempt)
+            if response is not None and response.status_code < 400:
+                return response
+
+            status = response.status_code if response is not None else None
+            if attempt >= self.retry.total or not replayable(kwargs.get('data')) or \
+                    not self.retry.is_retryable(method, idempotent, status=status, sent=_was_sent(error)):
+                break
+            delay = self.retry.delay(attempt, response)
+            if delay is None:
+                break
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+        if error is not None:
+            raise ReactomeConnectionError(str(error), url=url, attempts=attempt + 1) from error
+        raise_for_status(response, attempts=attempt + 1)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def add_hook(self, hook):
+        """
+        Registers a callback receiving an instrument.Event for every request served by the client
+
+        :param hook: Callable taking the event, ex. instrument.LatencyHistogram()
+        :return: hook
+        """
+
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def cache_info(self):
+        """
+        Usage counters of the client's memory cache
+
+        :return: CacheInfo(hits, misses, evictions, expirations, entries, bytes, max_bytes) or None without memo
+        """
+
+        if self.memo is not None:
+            return self.memo.cache_info()
+
+    def close(self):
+        """
+        Closes every pooled connection held by the client's transport
+        """
+
+        self.transport.close()
+
+
+def _was_sent(error):
+    """
+    Whether a failed attempt may have reached the server - false when the connection was never established
+    """
+
+    if error is None or isinstance(error, ConnectTimeout):
+        return error is None
+    reason = error.args[0] if error.args else None
+    return not isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+
+
+class _BoundService(object):
+    """
+    A service module (analysis, content or fiviz) whose functions run over a given client
+    """
+
+    def __init__(self, client, name):
+        self._client = client
+        self._module = import_module('reactome2py.%s' % name)
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if name.startswith('_') or not callable(func):
+            return func
+
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            with using(self._client):
+                return func(*args, **kwargs)
+
+        return bound
+
+    def __dir__(self):
+        return [name for name in dir(self._module) if not name.startswith('_')]
+
+
+_default_client = None
+_default_lock = threading.Lock()
+_local = threading.local()
+
+
+def default_client():
+    """
+    The process-wide client shared by the module-level functions, created on first use
+
+    :return: ReactomeClient
+    """
+
+    global _default_client
+
+    with _default_lock:
+        if _default_client is None:
+            _default_client = ReactomeClient()
+
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replaces the process-wide client, ex. to change pool sizes or timeouts for every module-level call
+
+    :param client: ReactomeClient instance - None resets to a fresh default on next use
+    :return: The previous default client
+    """
+
+    global _default_client
+
+    with _default_lock:
+        previous, _default_client = _default_client, client
+
+    return previous
+
+
+def get_client():
+    """
+    The client module-level functions send their requests through in the calling thread
+
+    :return: The client activated with using() if any, else the process-wide default client
+    """
+
+    client = getattr(_local, 'client', None)
+    if client is None:
+        return default_client()
+    return client
+
+
+@contextmanager
+def using(client):
+    """
+    Routes module-level calls made in the current thread through client for the duration of the with block
+
+    :param client: ReactomeClient instance
+    """
+
+    previous = getattr(_local, 'client', None)
+    _local.client = client
+    try:
+        yield client
+    finally:
+        _local.client = previous
@@ -3,13 +3,16 @@ Content Service for Reactome knowledgebase.
 API calls are avaialble @ https://reactome.org/ContentService/#/   \n
 Data model key classes for id query are available @ https://reactome.org/documentation/data-model
 """
-from requests.exceptions import ConnectionError
-import requests
+from reactome2py.client import get_client
+from reactome2py.instrument import endpoint
+from reactome2py.jsonbackend import loads
+from reactome2py.upload import upload
 
 
 NumberTypes = (int, float, complex)
 
 
+@endpoint
 def discover(id='R-HSA-446203'):
     """
     For each event (reaction or pathway) this method generates a json representing the dataset object as defined
@@ -25,17 +28,12 @@ def discover(id='R-HSA-446203'):
 
     url = 'https://reactome.org/ContentService/data/discover/%s' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def disease(doid=False):
     """
     Query list of diseases
@@ -59,17 +57,12 @@ def disease(doid=False):
     else:
         url = 'https://reactome.org/ContentService/data/diseases'
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def entities_complex(id='R-HSA-5674003', exclude_structures=False):
     """
     Retrieves the list of subunits that constitute any given complex.
@@ -97,17 +90,12 @@ def entities_complex(id='R-HSA-5674003', exclude_structures=False):
 
     url = 'https://reactome.org/ContentService/data/complex/%s/subunits' % id
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def entities_complexes(id='P00533', resource='UniProt'):
     """
     Retrieves the list of complexes that contain a given (identifier, resource). The method deconstructs the complexes
@@ -124,17 +112,12 @@ def entities_complexes(id='P00533', resource='UniProt'):
 
     url = 'https://reactome.org/ContentService/data/complexes/%s/%s' % (resource, id)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def entity_structures(id='R-HSA-199420'):
     """
     Retrieves the list of structures (Complexes and Sets) that include the given entity as their component.
@@ -151,17 +134,12 @@ def entity_structures(id='R-HSA-199420'):
 
     url = 'https://reactome.org/ContentService/data/entity/%s/componentOf' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def entity_other_form(id='R-HSA-199420'):
     """
     Retrieves a list containing all other forms of the given PhysicalEntity.
@@ -178,17 +156,12 @@ def entity_other_form(id='R-HSA-199420'):
 
     url = 'https://reactome.org/ContentService/data/entity/%s/otherForms' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def event_ancestors(id='R-HSA-5673001'):
     """
     The Reactome definition of events includes pathways and reactions.
@@ -207,17 +180,12 @@ def event_ancestors(id='R-HSA-5673001'):
 
     url = 'https://reactome.org/ContentService/data/event/%s/ancestors' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def event_species(species='9606'):
     """
     Events (pathways and reactions) in Reactome are organised in a hierarchical structure for every species.
@@ -235,17 +203,12 @@ def event_species(species='9606'):
 
     url = 'https://reactome.org/ContentService/data/eventsHierarchy/%s' % species
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def export_diagram(id='R-HSA-177929', ext='png', quality='5', flag_interactors=False, title=True, margin='15',
                    ehld=True, diagram_profile='Modern', resource='Total', analysis_profile='Standard', token=None,
                    flag=None, sel=[], exp_column=None, file='report', path=''):
@@ -312,19 +275,14 @@ def export_diagram(id='R-HSA-177929', ext='png', quality='5', flag_interactors=F
 
     path = "".join([path, ".".join([file, ext])])
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        with open(path, 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open(path, 'wb') as f:
+        for chunk in response:
+            f.write(chunk)
 
 
+@endpoint
 def export_document(id='R-HSA-177929', level='1', diagram_profile='Modern', resource='Total',
                     analysis_profile='Standard', token=None, exp_column=None, file='report', path=''):
     """
@@ -369,19 +327,14 @@ def export_document(id='R-HSA-177929', level='1', diagram_profile='Modern', reso
 
     path = "".join([path, ".".join([file, 'pdf'])])
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        with open(path, 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open(path, 'wb') as f:
+        for chunk in response:
+            f.write(chunk)
 
 
+@endpoint
 def export_event(id='R-HSA-177929', format='sbgn', file='report', path=''):
     """
     Exports a given pathway or reaction to the format requested:
@@ -408,19 +361,14 @@ def export_event(id='R-HSA-177929', format='sbgn', file='report', path=''):
 
     path = "".join([path, ".".join([file, ext])])
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        with open(path, 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open(path, 'wb') as f:
+        for chunk in response:
+            f.write(chunk)
 
 
+@endpoint
 def export_fireworks(species='9606', ext='png', file='report', path='', quality='5', flag=None, flag_interactors=False,
                      sel=[], title=True, margin='15', resource='Total', diagram_profile='', coverage=False, token=None,
                      exp_column=None):
@@ -484,19 +432,14 @@ def export_fireworks(species='9606', ext='png', file='report', path='', quality=
 
     path = "".join([path, ".".join([file, ext])])
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        with open(path, 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open(path, 'wb') as f:
+        for chunk in response:
+            f.write(chunk)
 
 
+@endpoint
 def export_reaction(id='R-HSA-6787403', ext='png', file='report', path='', quality='5', flag=None, flag_interactors=False,
                      sel=[], title=True, margin='15', resource='Total', diagram_profile='', coverage=False, token=None,
                      exp_column=None):
@@ -558,19 +501,14 @@ def export_reaction(id='R-HSA-6787403', ext='png', file='report', path='', quali
 
     path = "".join([path, ".".join([file, ext])])
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        with open(path, 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    with open(path, 'wb') as f:
+        for chunk in response:
+            f.write(chunk)
 
 
+@endpoint
 def interactors_psicquic_acc(resource='MINT', acc='Q13501', by='details'):
     """
     1. if by details
@@ -594,17 +532,12 @@ def interactors_psicquic_acc(resource='MINT', acc='Q13501', by='details'):
     if by in 'summary':
         url = 'https://reactome.org/ContentService/interactors/psicquic/molecule/%s/%s/summary' % (resource, acc)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_psicquic_accs(proteins='EGFR', resource='MINT', by='details'):
     """
     1. if by details
@@ -630,17 +563,12 @@ def interactors_psicquic_accs(proteins='EGFR', resource='MINT', by='details'):
     if by in 'summary':
         url = 'https://reactome.org/ContentService/interactors/psicquic/molecules/%s/summary' % resource
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_psicquic_resources():
     """
     Retrieve a list of all Psicquic Registries services
@@ -654,17 +582,12 @@ def interactors_psicquic_resources():
 
     url = 'https://reactome.org/ContentService/interactors/psicquic/resources'
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_static_acc(acc='Q13501', page='-1', page_size='-1', by='details'):
     """
     1. if by details:
@@ -699,17 +622,12 @@ def interactors_static_acc(acc='Q13501', page='-1', page_size='-1', by='details'
     if by in 'summary':
         url = 'https://reactome.org/ContentService/interactors/static/molecule/%s/summary' % acc
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_acc_pathways(acc='Q9BXM7-1', species='Homo sapiens', only_diagrammed=False):
     """
     Retrieve a list of lower level pathways where the interacting molecules can be found
@@ -731,17 +649,12 @@ def interactors_acc_pathways(acc='Q9BXM7-1', species='Homo sapiens', only_diagra
 
     url = 'https://reactome.org/ContentService/interactors/static/molecule/%s/pathways' % acc
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_static_accs(accs='Q9BXM7-1', by='details', page='-1', page_size='-1'):
     """
     1. if by details:
@@ -780,17 +693,12 @@ def interactors_static_accs(accs='Q9BXM7-1', by='details', page='-1', page_size=
         url = 'https://reactome.org/ContentService/interactors/static/molecules/summary'
         params = None
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def token_interactors(token, proteins):
     """
     Retrieve custom interactions associated with a token
@@ -809,17 +717,12 @@ def token_interactors(token, proteins):
 
     url = 'https://reactome.org/ContentService/interactors/token/%s' % token
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_psicquic_url(name, psicquic_url):
     """
     Registry custom PSICQUIC resource
@@ -842,17 +745,12 @@ def interactors_psicquic_url(name, psicquic_url):
 
     url = 'https://reactome.org/ContentService/interactors/upload/psicquic/url'
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_upload_content(name, content):
     """
     Paste file content and get a summary associated with a token
@@ -875,23 +773,20 @@ def interactors_upload_content(name, content):
 
     url = 'https://reactome.org/ContentService/interactors/upload/tuple/content'
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
-def interactors_form(path, name):
+@endpoint
+def interactors_form(path, name, gzip=False):
     """
     Parse file and retrieve a summary associated with a token
 
-    :param path: Absolute path to file to be read with custom interactor
+    :param path: Absolute path to file to be read with custom interactor - an open file object or an iterable of lines
+        are accepted as well, the content is streamed to the server in chunks
     :param name: Name which identifies the sample
+    :param gzip: If true, the content is gzip-compressed while it is sent
     :return: 
     """
 
@@ -906,19 +801,16 @@ def interactors_form(path, name):
 
     url = 'https://reactome.org/ContentService/interactors/upload/tuple/form'
 
-    data = open(path, 'rb').read()
+    data = upload(path, compress=gzip)
+    if data.compress:
+        headers['Content-Encoding'] = 'gzip'
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def interactors_url(name, interactors_url):
     """
     Send file via URL and get a summary associated with a token
@@ -941,17 +833,12 @@ def interactors_url(name, interactors_url):
 
     data = interactors_url
 
-    try:
-        response = requests.post(url=url, headers=headers, params=params, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, params=params, data=data)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def mapping(id='PTEN', resource='UniProt', species='9606', by='pathways'):
     """
     1. by pathways:
@@ -984,17 +871,12 @@ def mapping(id='PTEN', resource='UniProt', species='9606', by='pathways'):
     if by in 'reactions':
         url = 'https://reactome.org/ContentService/data/mapping/%s/%s/reactions' % (resource, id)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def orthology_events(ids='R-HSA-6799198,R-HSA-168256,R-HSA-168249', species='49633'):
     """
     Reactome uses the set of manually curated human reactions to computationally infer reactions in
@@ -1016,17 +898,12 @@ def orthology_events(ids='R-HSA-6799198,R-HSA-168256,R-HSA-168249', species='496
 
     url = 'https://reactome.org/ContentService/data/orthologies/ids/species/%s' % species
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def orthology(id='R-HSA-6799198', species='49633'):
     """
     Reactome uses the set of manually curated human reactions to computationally infer reactions in
@@ -1046,17 +923,12 @@ def orthology(id='R-HSA-6799198', species='49633'):
 
     url = 'https://reactome.org/ContentService/data/orthology/%s/species/%s' % (id, species)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def participants(id='5205685'):
     """
     Participants contains a PhysicalEntity (dbId, displayName) and a collection of ReferenceEntities (dbId, name, identifier, url)
@@ -1071,17 +943,12 @@ def participants(id='5205685'):
 
     url = 'https://reactome.org/ContentService/data/participants/%s' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def participants_physical_entities(id='R-HSA-5205685'):
     """
     This method retrieves all the PhysicalEntities that take part in a given event. It is worth mentioning that
@@ -1098,17 +965,12 @@ def participants_physical_entities(id='R-HSA-5205685'):
 
     url = 'https://reactome.org/ContentService/data/participants/%s/participatingPhysicalEntities' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def participants_reference_entities(id='5205685'):
     """
     PhysicalEntity instances that represent, e.g., the same chemical in different compartments, or different
@@ -1131,17 +993,12 @@ def participants_reference_entities(id='5205685'):
 
     url = 'https://reactome.org/ContentService/data/participants/%s/referenceEntities' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_contained_event(id='R-HSA-5673001'):
     """
     Events are the building blocks used in Reactome to represent all biological processes,
@@ -1159,17 +1016,12 @@ def pathway_contained_event(id='R-HSA-5673001'):
 
     url = 'https://reactome.org/ContentService/data/pathway/%s/containedEvents' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_contained_event_atttibute(id='R-HSA-5673001', attribute='stId'):
     """
     Events are the building blocks used in Reactome to represent all biological processes, and they
@@ -1188,17 +1040,12 @@ def pathway_contained_event_atttibute(id='R-HSA-5673001', attribute='stId'):
 
     url = 'https://reactome.org/ContentService/data/pathway/%s/containedEvents/%s' % (id, attribute)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.text.strip('][').split(', ')
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return response.text.strip('][').split(', ')
 
 
+@endpoint
 def pathways_low_diagram(id='R-HSA-199420', species=None, all_forms=False):
     """
     This method traverses the event hierarchy and retrieves the list of all lower level pathways that have a
@@ -1225,17 +1072,12 @@ def pathways_low_diagram(id='R-HSA-199420', species=None, all_forms=False):
     else:
         url = 'https://reactome.org/ContentService/data/pathways/low/diagram/entity/%s' % id
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathways_low_entity(id='R-HSA-199420', species=None, all_forms=False):
     """
     This method traverses the event hierarchy and retrieves the list of all lower level pathways that contain
@@ -1262,17 +1104,12 @@ def pathways_low_entity(id='R-HSA-199420', species=None, all_forms=False):
     else:
         url = 'https://reactome.org/ContentService/data/pathways/low/entity/%s/allForms' % id
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathways_top_level(species='9606'):
     """
     This method retrieves the list of top level pathways for the given species
@@ -1287,17 +1124,12 @@ def pathways_top_level(species='9606'):
 
     url = 'https://reactome.org/ContentService/data/pathways/top/%s' % species
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def person_name(name='Steve Jupe', exact=False):
     """
     Retrieves a list of people in Reactome with either their first or last name partly matching the given name (string).
@@ -1318,17 +1150,12 @@ def person_name(name='Steve Jupe', exact=False):
     else:
         url = 'https://reactome.org/ContentService/data/people/name/%s' % name
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def person_id(id='0000-0001-5807-0069', by=None, attribute=None):
     """
     1. With only id parameter declared,
@@ -1364,17 +1191,12 @@ def person_id(id='0000-0001-5807-0069', by=None, attribute=None):
     if id and attribute:
         url = 'https://reactome.org/ContentService/data/person/%s/%s' % (id, attribute)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def query_id(id='R-HSA-60140', enhanced=False, attribute=None):
     """
     This method queries for an entry in Reactome knowledgebase based on the given identifier, i.e. stable id or
@@ -1403,17 +1225,12 @@ def query_id(id='R-HSA-60140', enhanced=False, attribute=None):
     if id and attribute:
         url = 'https://reactome.org/ContentService/data/query/%s/%s' % (id, attribute)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def query_ids(ids='R-HSA-60140', mapping=False):
     """
     This method queries for a set of entries in Reactome knowledgebase based on the given list of identifiers.
@@ -1439,17 +1256,12 @@ def query_ids(ids='R-HSA-60140', mapping=False):
     else:
         url = 'https://reactome.org/ContentService/data/query/ids'
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def references(id='15377'):
     """
     Retrieves a list containing all the reference entities for a given identifier.
@@ -1464,17 +1276,12 @@ def references(id='15377'):
 
     url = 'https://reactome.org/ContentService/references/mapping/%s' % id
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def species(by='all'):
     """
     Query species by:
@@ -1496,17 +1303,12 @@ def species(by='all'):
     if by in 'main':
         url = 'https://reactome.org/ContentService/data/species/main'
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def schema(name='Pathway', by='count', species='9606', page='-1', offset='20000'):
     """
     This method retrieves the list of entries in Reactome that belong to the specified schema class.
@@ -1572,17 +1374,12 @@ def schema(name='Pathway', by='count', species='9606', page='-1', offset='20000'
             ('offset', offset),
         )
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_diagram(diagram='R-HSA-8848021', query='MAD', types=[], start=None, rows=None):
     """
     Performs a Apache Solr query (diagram widget scoped) for a given QueryObject
@@ -1608,17 +1405,12 @@ def search_diagram(diagram='R-HSA-8848021', query='MAD', types=[], start=None, r
 
     url = 'https://reactome.org/ContentService/search/diagram/%s' % diagram
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_diagram_instance(diagram='R-HSA-68886', instance='R-HSA-141433', types=[]):
     """
     Performs a Apache Solr query (diagram widget scoped) for a given QueryObject
@@ -1639,17 +1431,12 @@ def search_diagram_instance(diagram='R-HSA-68886', instance='R-HSA-141433', type
 
     url = 'https://reactome.org/ContentService/search/diagram/%s/occurrences/%s' % (diagram, instance)
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_diagram_pathway_flag(diagram='R-HSA-446203', query='CTSA'):
     """
     This method traverses the content and checks not only for the main identifier but also for all the cross-references to find the flag targets
@@ -1669,17 +1456,12 @@ def search_diagram_pathway_flag(diagram='R-HSA-446203', query='CTSA'):
 
     url = 'https://reactome.org/ContentService/search/diagram/%s/flag' % diagram
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_facet():
     """
     This method retrieves faceting information on the whole Reactome search data.
@@ -1693,17 +1475,12 @@ def search_facet():
 
     url = 'https://reactome.org/ContentService/search/facet'
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_facet_query(query='TP53', species=[], types=[], compartments=[], keywords=[]):
     """
     This method retrieves faceting information on a specific query
@@ -1730,17 +1507,12 @@ def search_facet_query(query='TP53', species=[], types=[], compartments=[], keyw
 
     url = 'https://reactome.org/ContentService/search/facet_query'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_fireworks(query='BRAF', species='Homo sapiens', types=[], start=None, rows=None):
     """
     Performs a Apache Solr query (fireworks widget scoped) for a given QueryObject
@@ -1767,17 +1539,12 @@ def search_fireworks(query='BRAF', species='Homo sapiens', types=[], start=None,
 
     url = 'https://reactome.org/ContentService/search/fireworks'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_fireworks_flag(query='KNTC1', species='Homo sapiens'):
     """
     Performs a Apache Solr query (fireworks widget scoped) for a given QueryObject
@@ -1798,17 +1565,12 @@ def search_fireworks_flag(query='KNTC1', species='Homo sapiens'):
 
     url = 'https://reactome.org/ContentService/search/fireworks/flag'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_query(query='Biological oxidations', species=[], types=[], compartments=[], keywords=[], cluster=True,
                  start=None, rows=None):
     """
@@ -1842,17 +1604,12 @@ def search_query(query='Biological oxidations', species=[], types=[], compartmen
 
     url = 'https://reactome.org/ContentService/search/query'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_spellcheck(query='repoduction'):
     """
     This method retrieves a list of spell-check suggestions for a given search term.
@@ -1870,17 +1627,12 @@ def search_spellcheck(query='repoduction'):
 
     url = 'https://reactome.org/ContentService/search/spellcheck'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def search_suggest(query='platele'):
     """
     This method retrieves a list of suggestions for a given search term.
@@ -1899,12 +1651,6 @@ def search_suggest(query='platele'):
 
     url = 'https://reactome.org/ContentService/search/suggest'
 
-    try:
-        response = requests.get(url=url, headers=headers, params=params)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers, params=params)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
\ No newline at end of file
+    return loads(response.content)
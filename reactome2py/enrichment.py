@@ -0,0 +1,524 @@
+"""
+Local over-representation analysis on the Reactome pathway gene sets (ReactomePathways.gmt), computed offline
+without a round-trip to the Analysis Service, ex. for screens running many small enrichments. \n
+GeneSets indexes the gene sets of fiviz.gene_mappings() once into a sparse gene x pathway incidence matrix; each
+enrichment then sums the rows of the submitted genes and scores the hit pathways with the hypergeometric test and
+Benjamini-Hochberg FDR. Results have the shape of the analysis.identifiers() result. enrich_many() scores
+thousands of lists at once from a single sparse product of the lists' and pathways' incidence matrices, and
+empirical() estimates p-values from random gene lists for biased gene universes. \n
+Requires scipy: pip install reactome2py[enrichment]
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse, special
+from reactome2py import fiviz
+import functools
+import os
+import numpy
+import pandas
+
+
+class Enrichments(namedtuple('Enrichments', ['p_values', 'fdr', 'found', 'not_found'])):
+    """
+    Enrichment of many gene lists: data frames with one row per list and one column per pathway stId of the p-values,
+    FDR (1 for pathways without hit) and number of genes found, and a series of the number of identifiers not found
+    per list
+    """
+
+
+def hypergeometric(found, universe, sizes, drawn):
+    """
+    Probability of finding at least found genes of a pathway among drawn genes picked at random from the universe -
+    the hypergeometric survival function, computed in NumPy (much faster than scipy.stats.hypergeom on thousands of
+    pathways). Each probability sums the terms of the nearer tail, from found outwards, as running products of the
+    ratios of consecutive terms, until they are negligible - 10 standard deviations past the mean.
+
+    :param found: Number of submitted genes in each pathway - array
+    :param universe: Number of genes in the universe
+    :param sizes: Number of universe genes in each pathway - array broadcasting against found
+    :param drawn: Number of submitted genes in the universe - int or array broadcasting against found
+    :return: Array of p-values
+    """
+
+    found, sizes, drawn = numpy.broadcast_arrays(numpy.asarray(found, dtype=numpy.int64),
+                                                 numpy.asarray(sizes, dtype=numpy.int64),
+                                                 numpy.asarray(drawn, dtype=numpy.int64))
+    shape = found.shape
+    found = numpy.clip(found, numpy.maximum(0, sizes + drawn - universe), numpy.minimum(sizes, drawn) + 1).ravel()
+    sizes, drawn = sizes.ravel(), drawn.ravel()
+
+    # pathways share sizes and lists share lengths - each distinct (found, size, drawn) is scored once
+    keys, inverse = numpy.unique((found * (universe + 2) + sizes) * (universe + 2) + drawn, return_inverse=True)
+    inverse = inverse.ravel()
+    shared = len(keys) < len(found)
+    if shared:
+        index = numpy.zeros(len(keys), dtype=numpy.int64)
+        index[inverse] = numpy.arange(len(found))
+        found, sizes, drawn = found[index], sizes[index], drawn[index]
+
+    n, k = sizes.astype(float), drawn.astype(float)
+    low = numpy.maximum(0, n + k - universe)
+    high = numpy.minimum(n, k)
+
+    mean = n * k / universe
+    reach = 10 * numpy.sqrt(mean * (universe - n) * (universe - k) / (universe * max(universe - 1.0, 1.0))) + 30
+    upper = found > mean
+    first = numpy.where(upper, found, found - 1)
+    last = numpy.where(upper, numpy.minimum(high, numpy.maximum(first, mean) + reach),
+                       numpy.maximum(low, numpy.minimum(first, mean) - reach))
+    counts = numpy.floor(numpy.abs(last - first)).astype(numpy.int64) + 1
+    counts[(first < low) | (first > high)] = 0
+    first = numpy.clip(first, low, high)
+
+    log_factorial = _log_factorials(universe)
+    tails = numpy.zeros(len(found))
+    order = numpy.argsort(counts)
+    for block in _blocks(counts[order]):
+        index = order[block]
+        width = counts[index].max()
+        if not width:
+            continue
+        x, nb, kb, up = first[index, None], n[index, None], k[index, None], upper[index, None]
+        x = x + numpy.where(up, 1, -1) * numpy.arange(width - 1)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratios = numpy.where(up, (nb - x) * (kb - x) / ((x + 1) * (universe - nb - kb + x + 1)),
+                                 x * (universe - nb - kb + x) / ((nb - x + 1) * (kb - x + 1)))
+        terms = numpy.concatenate([numpy.ones((len(index), 1)), numpy.cumprod(ratios, axis=1)], axis=1)
+        terms[numpy.arange(width) >= counts[index, None]] = 0
+        x0, nb, kb = first[index].astype(numpy.int64), n[index].astype(numpy.int64), k[index].astype(numpy.int64)
+        log_first = (log_factorial[nb] - log_factorial[x0] - log_factorial[nb - x0] +
+                     log_factorial[universe - nb] - log_factorial[kb - x0] - log_factorial[universe - nb - kb + x0] -
+                     log_factorial[universe] + log_factorial[kb] + log_factorial[universe - kb])
+        tails[index] = numpy.exp(log_first) * numpy.nan_to_num(terms).sum(axis=1)
+
+    p_values = numpy.clip(numpy.where(upper, tails, 1 - tails), 0, 1)
+    if shared:
+        p_values = p_values[inverse]
+    return p_values.reshape(shape)
+
+
+def benjamini_hochberg(p_values, axis=-1):
+    """
+    Benjamini-Hochberg false discovery rates of p-values
+
+    :param p_values: Array of p-values - NaN values are left out of the correction and kept as NaN
+    :param axis: Axis holding each family of tests, ex. one row per gene list
+    :return: Array of FDR values of the same shape
+    """
+
+    p_values = numpy.moveaxis(numpy.asarray(p_values, dtype=float), axis, -1)
+    order = numpy.argsort(p_values, axis=-1)
+    ordered = numpy.take_along_axis(p_values, order, axis=-1)
+    tested = numpy.sum(~numpy.isnan(p_values), axis=-1, keepdims=True)
+    ranks = numpy.arange(1, p_values.shape[-1] + 1)
+
+    scaled = ordered * tested / ranks
+    scaled = numpy.minimum.accumulate(numpy.where(numpy.isnan(scaled), numpy.inf, scaled)[..., ::-1], axis=-1)[..., ::-1]
+    scaled = numpy.minimum(scaled, 1)
+    scaled[numpy.isnan(ordered)] = numpy.nan
+
+    fdr = numpy.empty_like(scaled)
+    numpy.put_along_axis(fdr, order, scaled, axis=-1)
+    return numpy.moveaxis(fdr, -1, axis)
+
+
+def parse_ids(ids):
+    """
+    Gene identifiers of a query
+
+    :param ids: Comma, space or newline separated string ex. 'EGF,EGFR', or iterable of identifiers
+    :return: list of str
+    """
+
+    if isinstance(ids, str):
+        ids = ids.replace(',', ' ').split()
+    return [str(identifier).strip() for identifier in ids if str(identifier).strip()]
+
+
+class GeneSets(object):
+    """
+    Pathway gene sets indexed for local enrichment, ex. GeneSets.from_reactome().enrich('EGF,EGFR').
+    Genes are matched case-insensitively.
+
+    :param relations: List of dictionaries with the name, stId and genes of every pathway, as returned by
+        fiviz.gene_mappings()
+    :param universe: Genes that could have been submitted - defaults to every gene of the gene sets; genes of the
+        pathways outside the universe are left out
+    :param species: Dictionary of the name and taxId of the species of the gene sets
+    """
+
+    def __init__(self, relations, universe=None, species=None):
+        self.st_ids = [relation['stId'] for relation in relations]
+        self.names = [relation['name'] for relation in relations]
+        self.species = species if species is not None else {'name': 'Homo sapiens', 'taxId': '9606'}
+
+        members = [set(_key(gene) for gene in relation['genes']) for relation in relations]
+        if universe is not None:
+            allowed = set(_key(gene) for gene in parse_ids(universe))
+            members = [genes & allowed for genes in members]
+        self.genes = sorted(set().union(*members))
+        self.gene_index = dict((gene, i) for i, gene in enumerate(self.genes))
+
+        rows = numpy.fromiter((self.gene_index[gene] for genes in members for gene in genes), dtype=numpy.int64)
+        columns = numpy.repeat(numpy.arange(len(members)), [len(genes) for genes in members])
+        self.incidence = sparse.csr_matrix((numpy.ones(len(rows), dtype=numpy.int32), (rows, columns)),
+                                           shape=(len(self.genes), len(members)))
+        self.sizes = numpy.diff(self.incidence.tocsc().indptr)
+
+    @classmethod
+    def from_reactome(cls, universe=None):
+        """
+        Gene sets of the current Reactome release, downloaded with fiviz.gene_mappings()
+
+        :param universe: Genes that could have been submitted - defaults to every gene of the gene sets
+        :return: GeneSets
+        """
+
+        return cls(fiviz.gene_mappings(), universe=universe)
+
+    def __len__(self):
+        return len(self.st_ids)
+
+    @property
+    def universe(self):
+        """
+        Number of genes in the universe
+        """
+
+        return len(self.genes)
+
+    def rows(self, ids):
+        """
+        Rows of the incidence matrix of the submitted genes
+
+        :param ids: Comma separated string or iterable of gene identifiers
+        :return: (array of row numbers of the distinct genes found, list of the identifiers not found)
+        """
+
+        rows = set()
+        not_found = []
+        for identifier in parse_ids(ids):
+            row = self.gene_index.get(_key(identifier))
+            if row is None:
+                not_found.append(identifier)
+            else:
+                rows.add(row)
+        return numpy.fromiter(rows, dtype=numpy.int64, count=len(rows)), not_found
+
+    def overlaps(self, rows):
+        """
+        Number of the submitted genes in each pathway
+
+        :param rows: Rows of the submitted genes, see rows()
+        :return: Array with one count per pathway
+        """
+
+        return numpy.bincount(self.incidence.indices[_gather(self.incidence.indptr, rows)], minlength=len(self))
+
+    def enrich(self, ids, p_value=1, min_entities=None, max_entities=None, sort_by='ENTITIES_FDR', order='ASC',
+               page_size=None, page=1, permutations=None, weights=None, processes=1, seed=None):
+        """
+        Over-representation analysis of a gene list, shaped like the analysis.identifiers() result.
+        The p-values are hypergeometric, or empirical when permutations is set, see empirical()
+
+        :param ids: Comma separated string or iterable of gene identifiers ex. 'EGF,EGFR'
+        :param p_value: Only pathways with a p-value equal or below the threshold are returned - the statistics are
+            not altered
+        :param min_entities: Minimum number of genes per pathway returned
+        :param max_entities: Maximum number of genes per pathway returned
+        :param sort_by: ENTITIES_FDR, ENTITIES_PVALUE, ENTITIES_RATIO, FOUND_ENTITIES, TOTAL_ENTITIES or NAME
+        :param order: ASC or DESC
+        :param page_size: Number of pathways per page - None returns every pathway hit
+        :param page: Page number, starting at 1
+        :param permutations: Maximum number of random gene lists drawn to estimate empirical p-values - None computes
+            hypergeometric p-values
+        :param weights: Dictionary or pandas series of gene to relative probability of being drawn in the permutations
+        :param processes: Number of processes running the permutations
+        :param seed: Seed of the permutations, for reproducible p-values
+        :return: Dictionary with the summary, pathwaysFound, identifiersNotFound and pathways of the analysis
+        """
+
+        rows, not_found = self.rows(ids)
+        found = self.overlaps(rows)
+        hits = numpy.flatnonzero(found)
+        if permutations:
+            p_values = self.empirical(rows, permutations, weights=weights, processes=processes, seed=seed)[0]
+        else:
+            p_values = hypergeometric(found[hits], self.universe, self.sizes[hits], len(rows))
+        fdr = benjamini_hochberg(p_values)
+
+        sizes = self.sizes[hits]
+        kept = p_values <= float(p_value)
+        if min_entities is not None:
+            kept &= sizes >= int(min_entities)
+        if max_entities is not None:
+            kept &= sizes <= int(max_entities)
+        kept = numpy.flatnonzero(kept)
+
+        keys = {
+            'ENTITIES_PVALUE': (p_values,),
+            'ENTITIES_FDR': (p_values, fdr),
+            'ENTITIES_RATIO': (sizes,),
+            'FOUND_ENTITIES': (found[hits],),
+            'TOTAL_ENTITIES': (sizes,),
+            'NAME': (numpy.array(self.names, dtype=object)[hits],),
+        }[sort_by.upper()]
+        ranked = kept[numpy.lexsort([key[kept] for key in keys])]
+        if order.upper() == 'DESC':
+            ranked = ranked[::-1]
+        if page_size is not None:
+            start = (int(page) - 1) * int(page_size)
+            ranked = ranked[start:start + int(page_size)]
+
+        pathways = [self._pathway(hits[j], found[hits[j]], p_values[j], fdr[j]) for j in ranked.tolist()]
+
+        return {
+            'summary': {'token': None, 'projection': False, 'interactors': False, 'type': 'OVERREPRESENTATION',
+                        'sampleName': '', 'text': True},
+            'expression': {'columnNames': []},
+            'identifiersNotFound': len(not_found),
+            'pathwaysFound': len(hits),
+            'pathways': pathways,
+            'resourceSummary': [{'resource': 'TOTAL', 'pathways': len(hits)}],
+            'speciesSummary': [dict(self.species, pathways=len(hits))],
+            'warnings': [],
+        }
+
+    def enrich_many(self, lists):
+        """
+        Over-representation analysis of many gene lists at once, ex. one per screen hit set or cell cluster: the
+        overlaps of every list with every pathway come from one sparse matrix product
+
+        :param lists: Dictionary of list name to gene identifiers, or list of gene identifier lists
+        :return: Enrichments of data frames with one row per list and one column per pathway
+        """
+
+        names = list(lists.keys()) if isinstance(lists, dict) else list(range(len(lists)))
+        queries = list(lists.values()) if isinstance(lists, dict) else list(lists)
+
+        rows, not_found = [], []
+        for ids in queries:
+            found_rows, missing = self.rows(ids)
+            rows.append(found_rows)
+            not_found.append(len(missing))
+        drawn = numpy.array([len(found_rows) for found_rows in rows], dtype=numpy.int64)
+        query = sparse.csr_matrix((numpy.ones(drawn.sum(), dtype=numpy.int32),
+                                   numpy.concatenate(rows + [numpy.empty(0, dtype=numpy.int64)]),
+                                   numpy.concatenate([[0], numpy.cumsum(drawn)])),
+                                  shape=(len(queries), len(self.genes)))
+
+        overlaps = query.dot(self.incidence).tocsr()
+        overlaps.eliminate_zeros()
+        lists_of_entries = numpy.repeat(numpy.arange(len(queries)), numpy.diff(overlaps.indptr))
+
+        p_values = numpy.full(overlaps.shape, numpy.nan)
+        p_values[lists_of_entries, overlaps.indices] = hypergeometric(overlaps.data, self.universe,
+                                                                      self.sizes[overlaps.indices],
+                                                                      drawn[lists_of_entries])
+        fdr = benjamini_hochberg(p_values, axis=1)
+
+        frame = functools.partial(pandas.DataFrame, index=names, columns=self.st_ids)
+        return Enrichments(frame(numpy.nan_to_num(p_values, nan=1.0)), frame(numpy.nan_to_num(fdr, nan=1.0)),
+                           frame(overlaps.toarray()), pandas.Series(not_found, index=names))
+
+    def empirical(self, rows, permutations=10000, weights=None, processes=1, seed=None, stop_after=20, block=1000):
+        """
+        Empirical p-values of the pathways hit by the submitted genes: the share of random gene lists of the same size
+        hitting each pathway at least as often, ex. for biased gene universes. Random lists are drawn in NumPy blocks,
+        optionally with per gene weights, and the permutations are spread over a process pool sharing the incidence
+        matrix. A pathway stops being permuted once stop_after random lists matched it (Besag-Clifford), so clearly
+        non-significant pathways cost few permutations.
+
+        :param rows: Rows of the submitted genes, see rows()
+        :param permutations: Maximum number of random gene lists
+        :param weights: Dictionary or pandas series of gene to relative probability of being drawn - genes left out
+            are never drawn; None draws every universe gene with the same probability
+        :param processes: Number of processes running the permutations - 1 runs them in the calling process, None
+            one per CPU
+        :param seed: Seed of the random lists, for reproducible p-values with the same number of processes
+        :param stop_after: Number of random lists matching a pathway after which it is no longer permuted
+        :param block: Number of permutations per task given to a process
+        :return: (array of p-values, array of the number of permutations run) of the pathways hit, in the order of
+            their columns
+        """
+
+        found = self.overlaps(rows)
+        hits = numpy.flatnonzero(found)
+        sampler = _Sampler(self.incidence.tocsc(), self._weights(weights))
+        if len(rows) > sampler.drawable:
+            raise ValueError('Can not draw %d genes from %d genes with a positive weight' % (len(rows), sampler.drawable))
+
+        exceeded = numpy.zeros(len(hits), dtype=numpy.int64)
+        done = numpy.zeros(len(hits), dtype=numpy.int64)
+        active = numpy.arange(len(hits))
+        seeds = numpy.random.SeedSequence(seed)
+        scheduled = 0
+
+        # one block per worker and round, so that the pool runs them side by side
+        workers = processes or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(workers, initializer=_share, initargs=(sampler,)) if workers != 1 else None
+        try:
+            while len(active) and scheduled < permutations:
+                counts = [min(block, permutations - scheduled - i * block) for i in range(workers)]
+                counts = [count for count in counts if count > 0]
+                tasks = [(task_seed, count, len(rows), hits[active], found[hits[active]])
+                         for task_seed, count in zip(seeds.spawn(len(counts)), counts)]
+                if pool is None:
+                    results = [sampler.exceedances(*task) for task in tasks]
+                else:
+                    results = pool.map(_exceedances, tasks)
+                for count, exceed in zip(counts, results):
+                    exceeded[active] += exceed
+                    done[active] += count
+                scheduled += sum(counts)
+                active = active[exceeded[active] < stop_after]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return (exceeded + 1.0) / (done + 1.0), done
+
+    def _weights(self, weights):
+        """
+        Array of the weights of the universe genes
+        """
+
+        if weights is None:
+            return None
+        array = numpy.zeros(len(self.genes))
+        for gene, weight in weights.items():
+            row = self.gene_index.get(_key(gene))
+            if row is not None:
+                array[row] = weight
+        return array
+
+    def _pathway(self, i, found, p_value, fdr):
+        return {
+            'stId': self.st_ids[i],
+            'name': self.names[i],
+            'species': dict(self.species),
+            'entities': {
+                'resource': 'TOTAL',
+                'total': int(self.sizes[i]),
+                'found': int(found),
+                'ratio': float(self.sizes[i]) / self.universe,
+                'pValue': float(p_value),
+                'fdr': float(fdr),
+                'exp': [],
+            },
+        }
+
+
+class _Sampler(object):
+    """
+    Draws random gene lists and counts how often they hit pathways at least as often as the submitted list
+    """
+
+    def __init__(self, incidence, weights=None):
+        self.incidence = incidence
+        self.weights = weights
+        self.drawable = incidence.shape[0] if weights is None else int(numpy.count_nonzero(weights > 0))
+
+    def exceedances(self, seed, count, size, columns, observed, cells=2 ** 22):
+        """
+        Number of random lists of size genes, out of count, hitting each pathway column at least observed times
+        """
+
+        rng = numpy.random.default_rng(seed)
+        genes = self.incidence.shape[0]
+        incidence = self.incidence[:, columns]
+        exceeded = numpy.zeros(len(columns), dtype=numpy.int64)
+        chunk = max(1, cells // max(len(columns), genes if self._keyed(size) else size, 1))
+
+        for start in range(0, count, chunk):
+            lists = min(chunk, count - start)
+            drawn = self.draw(rng, lists, size)
+            sample = sparse.csr_matrix((numpy.ones(lists * size), drawn.ravel(), numpy.arange(lists + 1) * size),
+                                       shape=(lists, genes))
+            exceeded += (sample.dot(incidence).toarray() >= observed).sum(axis=0)
+
+        return exceeded
+
+    def _keyed(self, size):
+        return self.weights is not None or size * size > 2 * self.incidence.shape[0]
+
+    def draw(self, rng, lists, size):
+        """
+        Rows of lists random lists of size distinct genes
+        """
+
+        genes = self.incidence.shape[0]
+        if not self._keyed(size):
+            # few genes out of many: draw with replacement and redraw the lists holding a gene twice
+            drawn = rng.integers(0, genes, (lists, size))
+            while True:
+                repeated = (numpy.diff(numpy.sort(drawn, axis=1), axis=1) == 0).any(axis=1)
+                if not repeated.any():
+                    return drawn
+                drawn[repeated] = rng.integers(0, genes, (int(repeated.sum()), size))
+
+        # the genes with the largest random keys, skewed by the weights (weighted sampling without replacement)
+        keys = rng.random((lists, genes))
+        if self.weights is not None:
+            with numpy.errstate(divide='ignore'):
+                keys = numpy.log(keys) / self.weights
+        if not size:
+            return numpy.empty((lists, 0), dtype=numpy.int64)
+        return numpy.argpartition(-keys, size - 1, axis=1)[:, :size]
+
+
+_shared = None
+
+
+def _share(sampler):
+    """
+    Keeps the sampler of a process of the permutation pool - forked processes share its arrays
+    """
+
+    global _shared
+    _shared = sampler
+
+
+def _exceedances(task):
+    return _shared.exceedances(*task)
+
+
+@functools.lru_cache(maxsize=8)
+def _log_factorials(n):
+    """
+    log(i!) for i from 0 to n
+    """
+
+    return special.gammaln(numpy.arange(n + 1) + 1.0)
+
+
+def _blocks(widths, cells=2 ** 20):
+    """
+    Slices of elements sorted by increasing width, each covering at most cells grid cells (or one element)
+    """
+
+    start = 0
+    while start < len(widths):
+        covered = numpy.arange(1, len(widths) - start + 1) * widths[start:]
+        stop = start + max(1, int(numpy.searchsorted(covered, cells, side='right')))
+        yield slice(start, stop)
+        start = stop
+
+
+def _key(gene):
+    return gene.strip().upper()
+
+
+def _gather(indptr, rows):
+    """
+    Positions in the indices of a CSR matrix of the entries of the given rows
+    """
+
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    if not len(rows):
+        return numpy.empty(0, dtype=numpy.int64)
+    offsets = numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths)
+    return offsets + numpy.arange(lengths.sum())
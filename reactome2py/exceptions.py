@@ -0,0 +1,62 @@
+"""
+Errors raised by the reactome2py service calls once the client's retries are exhausted
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+class ReactomeError(Exception):
+    """
+    Base class of the errors raised by reactome2py calls
+
+    :param message: Error message
+    :param url: Url of the failed request
+    :param attempts: Number of attempts made before giving up
+    """
+
+    def __init__(self, message, url=None, attempts=1):
+        super(ReactomeError, self).__init__(message)
+        self.url = url
+        self.attempts = attempts
+
+
+class ReactomeConnectionError(ReactomeError):
+    """
+    The server could not be reached or the connection failed before a complete response was received
+    """
+
+
+class ReactomeHTTPError(ReactomeError):
+    """
+    The server answered with an error status code
+
+    :param response: The error response - its status_code and text are available for inspection
+    """
+
+    def __init__(self, message, response, url=None, attempts=1):
+        super(ReactomeHTTPError, self).__init__(message, url=url, attempts=attempts)
+        self.response = response
+        self.status_code = response.status_code
+
+
+class ReactomeNotFoundError(ReactomeHTTPError):
+    """
+    The requested identifier, token or resource does not exist (status code 404)
+    """
+
+
+def raise_for_status(response, attempts=1):
+    """
+    Raises the typed error matching an error response
+
+    :param response: requests.Response
+    :param attempts: Number of attempts made before receiving this response
+    """
+
+    if response.status_code < 400:
+        return
+
+    message = 'Status code returned a value of %s for %s' % (response.status_code, response.url)
+    if response.status_code == 404:
+        raise ReactomeNotFoundError(message, response, url=response.url, attempts=attempts)
+    raise ReactomeHTTPError(message, response, url=response.url, attempts=attempts)
@@ -0,0 +1,68 @@
+"""
+Payloads of expression analyses built from pandas data frames and NumPy arrays.
+The Analysis Service takes expression data as tab separated text: a header line starting with '#' naming the
+identifier column and the samples, then one line per identifier with its values. \n
+Rows are formatted a block at a time with one string template per row, several times faster than DataFrame.to_csv,
+and can be streamed straight into the request body, see analysis.identifiers_expression().
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+import numpy
+import pandas
+
+
+def expression_chunks(data, index=None, columns=None, precision=6, block_rows=1024):
+    """
+    Lines of the expression payload of a table, a block of rows at a time
+
+    :param data: pandas data frame (rows indexed by identifier, one column per sample), pandas series (one sample) or
+        2-D NumPy array
+    :param index: Identifiers of the rows - required for NumPy arrays, defaults to the data frame's index
+    :param columns: Sample names - default to the data frame's columns, or 'sample1', 'sample2', ... for arrays
+    :param precision: Number of significant digits of the values
+    :param block_rows: Number of rows formatted per chunk
+    :return: Iterator of str chunks ending with a newline, the header line first
+    """
+
+    if isinstance(data, pandas.Series):
+        data = data.to_frame()
+
+    if isinstance(data, pandas.DataFrame):
+        name = data.index.name
+        index = data.index if index is None else index
+        columns = data.columns if columns is None else columns
+        values = data.to_numpy()
+    else:
+        name = None
+        values = numpy.asarray(data)
+        if index is None:
+            raise ValueError('index is required to name the rows of an array')
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if columns is None:
+            columns = ['sample%d' % (i + 1) for i in range(values.shape[1])]
+
+    if values.ndim != 2:
+        raise ValueError('Expression data must be 2-dimensional, got %d dimensions' % values.ndim)
+    if len(index) != values.shape[0] or len(columns) != values.shape[1]:
+        raise ValueError('Expected %d row identifiers and %d sample names, got %d and %d'
+                         % (values.shape[0], values.shape[1], len(index), len(columns)))
+
+    yield '#%s\n' % '\t'.join(['id' if name is None else str(name)] + [str(column) for column in columns])
+
+    row = '%s' + ('\t%%.%dg' % precision) * values.shape[1] + '\n'
+    index = [str(identifier) for identifier in index]
+    for start in range(0, values.shape[0], block_rows):
+        block = values[start:start + block_rows].astype(float, copy=False).tolist()
+        yield ''.join([row % ((identifier,) + tuple(line))
+                       for identifier, line in zip(index[start:start + block_rows], block)])
+
+
+def expression_payload(data, index=None, columns=None, precision=6):
+    """
+    Expression payload of a table in one string, ex. analysis.identifiers(ids=expression_payload(df))
+
+    :return: str
+    """
+
+    return ''.join(expression_chunks(data, index, columns, precision))
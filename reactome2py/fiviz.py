@@ -2,13 +2,15 @@
  Human functional protein interactions (FI) services api calls
  and utility functions for Reactome data-fetch, mappings, and overlay networks in human.
 """
-from requests.exceptions import ConnectionError
-import requests
+from reactome2py.client import get_client
+from reactome2py.instrument import endpoint
+from reactome2py.jsonbackend import loads
 import io
 import tarfile
 import zipfile
 
 
+@endpoint
 def ehld_stids():
     """
     Retrieves a list of high-level hierarchy pathway with Enhanced High Level Diagrams (EHLD) https://reactome.org/icon-info/ehld-specs-guideline
@@ -18,19 +20,14 @@ def ehld_stids():
 
     url = "https://reactome.org/download/current/ehld/svgsummary.txt"
 
-    try:
-        response = requests.get(url=url)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url)
 
-    if response.status_code == 200:
-        content_list = response.text.splitlines()
-        st_ids = [stId for stId in content_list if 'R-' in stId]
-        return st_ids
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    content_list = response.text.splitlines()
+    st_ids = [stId for stId in content_list if 'R-' in stId]
+    return st_ids
 
 
+@endpoint
 def sbgn_stids():
     """
     Retieves a list of lower-level (with hierarchy) pathways that have SBGNs https://reactome.org/about/news/110-sbgn-files-revamp
@@ -40,21 +37,15 @@ def sbgn_stids():
 
     url = "https://reactome.org/download/current/homo_sapiens.sbgn.tar.gz"
 
-    try:
-        response = requests.get(url=url)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url)
 
-    if response.status_code == 200:
-        tar_file = tarfile.open(fileobj=io.BytesIO(response.content))
-        file_names = tar_file.getnames()
-        ehlds = ehld_stids()
-        sbgns = [f.replace('.sbgn', '').replace('./', '') for f in file_names]
+    tar_file = tarfile.open(fileobj=io.BytesIO(response.content))
+    file_names = tar_file.getnames()
+    ehlds = ehld_stids()
+    sbgns = [f.replace('.sbgn', '').replace('./', '') for f in file_names]
 
-        sbgn_only = list(set(sbgns) - set(ehlds))
-        return sbgn_only
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    sbgn_only = list(set(sbgns) - set(ehlds))
+    return sbgn_only
 
 
 def _yield_zip(response):
@@ -82,6 +73,7 @@ def _read_ziplines(response):
     return [c.split('\t') for c in [c.decode('utf8') for c in list(_yield_zip(response))[0]]]
 
 
+@endpoint
 def gene_mappings():
     """
     Maps reactome pathway stId and name to it's associated gene list (HGNC)
@@ -91,25 +83,20 @@ def gene_mappings():
 
     url = "https://reactome.org/download/current/ReactomePathways.gmt.zip"
 
-    try:
-        response = requests.get(url=url)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url)
 
-    if response.status_code == 200:
-        gm = _read_ziplines(response)
-        relations = []
+    gm = _read_ziplines(response)
+    relations = []
 
-        for i, e in enumerate(gm):
-            gm[i] = [s.strip() for s in gm[i]]
-            d = dict(name=gm[i][0], stId=gm[i][1], genes=gm[i][2:len(gm[i])])
-            relations.append(d)
+    for i, e in enumerate(gm):
+        gm[i] = [s.strip() for s in gm[i]]
+        d = dict(name=gm[i][0], stId=gm[i][1], genes=gm[i][2:len(gm[i])])
+        relations.append(d)
 
-        return relations
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return relations
 
 
+@endpoint
 def pathway_fi(release="2019", stId="R-HSA-177929", pattern="R-HSA-"):
     """
     Fetch Pathway's Functional Interactions (FI) https://www.ncbi.nlm.nih.gov/pubmed/20482850
@@ -130,17 +117,12 @@ def pathway_fi(release="2019", stId="R-HSA-177929", pattern="R-HSA-"):
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/network/convertPathwayToFIs/%s" % (release, stId)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def genelist_fi(release="2019", ids="EGF,EGFR"):
     """
     Fetch Pathway's genelist Functional Interactions (FI) https://www.ncbi.nlm.nih.gov/pubmed/20482850
@@ -162,17 +144,12 @@ def genelist_fi(release="2019", ids="EGF,EGFR"):
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/network/queryEdge" % release
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_boolean_network(release="2019", stId="R-HSA-177929", pattern="R-HSA-"):
     """
     Fetch Pathway as a boolean network
@@ -193,17 +170,12 @@ def pathway_boolean_network(release="2019", stId="R-HSA-177929", pattern="R-HSA-
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/network/convertPathwayToBooleanNetwork/%s" % (release, stId)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_factor_graph(release="2019", stId="R-HSA-177929", pattern="R-HSA-"):
     """
     Fetch Pathway as a factor graph
@@ -224,17 +196,12 @@ def pathway_factor_graph(release="2019", stId="R-HSA-177929", pattern="R-HSA-"):
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/network/convertPathwayToFactorGraph/%s" % (release, stId)
 
-    try:
-        response = requests.post(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def drug_data_source(release="2019", source="drugcentral"):
     """
     Query a list of drug-target interactions from targetome or drugcentral
@@ -251,17 +218,12 @@ def drug_data_source(release="2019", source="drugcentral"):
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/drug/listDrugs/%s" % (release, source)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def genelist_drug_target(release="2019", ids="EGFR,ESR1,BRAF", source="drugcentral"):
     """
     Query drug-target interactions for a gene list from targetome or drugcentral
@@ -284,17 +246,12 @@ def genelist_drug_target(release="2019", ids="EGFR,ESR1,BRAF", source="drugcentr
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/drug/queryDrugTargetInteractions/%s" % (release, source)
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_pe_drug_target(release="2019", source="drugcentral", pdId="507988", peId="1220578", pattern="R-HSA-"):
     """
     Query drug-target interactions for a Physical Entity ex a complex within a pathway
@@ -321,17 +278,12 @@ def pathway_pe_drug_target(release="2019", source="drugcentral", pdId="507988",
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/drug/queryInteractionsForPEInDiagram/%s/%s" % (release, source, ids)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def pathway_drug_target(release="2019", source="drugcentral", pdId="507988", pattern="R-HSA-"):
     """
     Query drug-target interactions for a  PhysicalEntity
@@ -352,17 +304,12 @@ def pathway_drug_target(release="2019", source="drugcentral", pdId="507988", pat
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/drug/queryInteractionsForDiagram/%s/%s" % (release, source, pdId)
 
-    try:
-        response = requests.get(url=url, headers=headers)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print('Status code returned a value of %s' % response.status_code)
+    return loads(response.content)
 
 
+@endpoint
 def drug_targets(release="2019", drug="Gefitinib", source="drugcentral"):
     """
     Query known/available drug-target interactions for a drug
@@ -382,12 +329,6 @@ def drug_targets(release="2019", drug="Gefitinib", source="drugcentral"):
 
     url = "http://cpws.reactome.org/caBigR3WebApp%s/FIService/drug/queryInteractionsForDrugs/%s" % (release, source)
 
-    try:
-        response = requests.post(url=url, headers=headers, data=data)
-    except ConnectionError as e:
-        print(e)
+    response = get_client().post(url=url, headers=headers, data=data, idempotent=True)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print("Status code returned a value of %s" % response.status_code)
+    return loads(response.content)
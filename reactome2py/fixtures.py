@@ -0,0 +1,170 @@
+"""
+Record and replay of the exchanges made by the Reactome clients, for reproducible tests and benchmarks.
+RecordingTransport wraps another transport and stores every response it receives into a fixture archive;
+ReplayTransport later serves the same responses deterministically from that archive, optionally sleeping for the
+recorded (or a fixed) latency to mimic the network. \n
+The archive is a deflate-compressed zip file holding one body and one metadata member per distinct request,
+named after a digest of the request - the zip central directory doubles as the lookup index.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from reactome2py.cache import _response, _stored_headers
+from reactome2py.transport import HTTPTransport, Transport
+from reactome2py.upload import body_chunks
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+import requests
+
+
+class MissingFixtureError(LookupError):
+    """
+    The replayed archive holds no response for a request
+    """
+
+
+def fixture_key(method, url, params=None, data=None):
+    """
+    Digest identifying a request in a fixture archive: method, url with its query string and body
+
+    :return: str of 40 hexadecimal characters
+    """
+
+    prepared = requests.Request(method.upper(), url, params=params, data=data).prepare()
+    digest = hashlib.sha1()
+    digest.update(prepared.method.encode('ascii'))
+    digest.update(b' ')
+    digest.update(prepared.url.encode('utf-8'))
+    digest.update(b' ')
+    for chunk in body_chunks(prepared.body):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RecordingTransport(Transport):
+    """
+    Transport forwarding requests to another transport and recording every response into a fixture archive,
+    ex. ReactomeClient(transport=RecordingTransport('fixtures.zip')). The first response of a request is kept, except
+    for transient errors (429 and 5xx): they are left out, so that the response the client gets on retry is recorded.
+
+    :param path: Path of the fixture archive - appended to when it exists
+    :param transport: Transport actually sending the requests - defaults to an HTTPTransport
+    """
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport if transport is not None else HTTPTransport()
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(path, 'a', compression=zipfile.ZIP_DEFLATED)
+        self._recorded = set(name.split('.')[0] for name in self._zip.namelist())
+
+    def send(self, method, url, params=None, data=None, **kwargs):
+        start = time.perf_counter()
+        response = self.transport.send(method, url, params=params, data=data, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - start
+
+        key = fixture_key(method, url, params, data)
+        meta = {
+            'method': method.upper(),
+            'url': response.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': _stored_headers(response),
+            'elapsed': elapsed,
+        }
+
+        with self._lock:
+            if key not in self._recorded and self._zip is not None and not _transient(response.status_code):
+                self._zip.writestr('%s.json' % key, json.dumps(meta))
+                self._zip.writestr('%s.body' % key, content)
+                self._recorded.add(key)
+
+        return response
+
+    def close(self):
+        """
+        Completes the archive and closes the wrapped transport
+        """
+
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+        self.transport.close()
+
+
+def _transient(status):
+    """
+    Whether a response status is a passing failure the client retries, not worth replaying
+    """
+
+    return status == 429 or status >= 500
+
+
+class ReplayTransport(Transport):
+    """
+    Transport serving the responses of a fixture archive, ex. ReactomeClient(transport=ReplayTransport('fixtures.zip'))
+
+    :param path: Path of the fixture archive
+    :param latency: None to answer immediately, 'recorded' to wait as long as the recorded exchange took, or a
+        number of seconds to wait before every response
+    :param strict: If true, requests missing from the archive raise MissingFixtureError, else they answer 404
+    """
+
+    def __init__(self, path, latency=None, strict=True):
+        if not os.path.isfile(path):
+            raise MissingFixtureError('No fixture archive at %s' % path)
+
+        self.path = path
+        self.latency = latency
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(path, 'r')
+        self._keys = frozenset(name.split('.')[0] for name in self._zip.namelist())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _delay(self, meta):
+        if self.latency == 'recorded':
+            return meta.get('elapsed', 0)
+        return self.latency or 0
+
+    def _lookup(self, method, url, params=None, data=None):
+        key = fixture_key(method, url, params, data)
+
+        if key not in self._keys:
+            if self.strict:
+                raise MissingFixtureError('No recorded response for %s %s' % (method.upper(), url))
+            return _response(404, {}, url, b''), {}
+
+        with self._lock:
+            meta = json.loads(self._zip.read('%s.json' % key).decode('utf-8'))
+            content = self._zip.read('%s.body' % key)
+
+        response = _response(meta['status'], meta['headers'], meta['url'], content)
+        response.reason = meta.get('reason')
+        return response, meta
+
+    def send(self, method, url, params=None, data=None, **kwargs):
+        response, meta = self._lookup(method, url, params, data)
+        delay = self._delay(meta)
+        if delay:
+            time.sleep(delay)
+        return response
+
+    async def send_async(self, method, url, params=None, data=None, **kwargs):
+        response, meta = self._lookup(method, url, params, data)
+        delay = self._delay(meta)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    def close(self):
+        with self._lock:
+            self._zip.close()
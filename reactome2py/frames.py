@@ -0,0 +1,21 @@
+"""
+Helpers shared by the modules that build pandas data frames, ex. the analysis result tables and the local GSEA tables
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+import pandas
+
+
+def categorize(df, ratio=0.5):
+    """
+    Turns the text columns of a data frame that mostly hold repeated values into categorical columns
+
+    :param df: pandas data frame
+    :param ratio: Largest share of distinct values among the rows of a column made categorical
+    :return: df
+    """
+
+    for column in df.columns:
+        if pandas.api.types.is_string_dtype(df[column]) and df[column].nunique() <= ratio * len(df):
+            df[column] = df[column].astype('category')
+    return df
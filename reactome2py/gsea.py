@@ -0,0 +1,312 @@
+"""
+Local gene set enrichment analysis (GSEA) of ranked genes on the Reactome pathway gene sets, ex.
+prerank(GeneSets.from_reactome(), fold_changes) for a pandas series of gene to log fold change. \n
+The weighted Kolmogorov-Smirnov running sums of every pathway are evaluated at once: the running sum only peaks at
+a pathway's genes, so the enrichment scores come from cumulative sums over the (pathway, rank) pairs of the gene x
+pathway incidence matrix instead of a loop over each ranked list. Significance comes from gene permutations
+(prerank) or phenotype label permutations (phenotype), run in blocks over a process pool. \n
+Results are data frames with the columns of analysis.pathway2df() - 'Submitted entities found' lists the ranked genes
+of each pathway - plus the enrichment score (ES), normalized enrichment score (NES) and the 'Leading edge' genes.
+Requires scipy: pip install reactome2py[enrichment]
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from concurrent.futures import ProcessPoolExecutor
+from reactome2py.enrichment import _key
+from reactome2py.frames import categorize
+import numpy
+import pandas
+
+
+def prerank(gene_sets, ranking, permutations=1000, weight=1, min_size=15, max_size=500, processes=1, seed=None,
+            block=100):
+    """
+    Pre-ranked gene set enrichment analysis, with gene permutations
+
+    :param gene_sets: enrichment.GeneSets
+    :param ranking: pandas series or dictionary of gene to ranking metric ex. log fold change or signed p-value
+    :param permutations: Number of gene permutations
+    :param weight: Exponent of the metric weighting the running sum steps - 0 for the classic Kolmogorov-Smirnov
+    :param min_size: Minimum number of ranked genes of the pathways tested
+    :param max_size: Maximum number of ranked genes of the pathways tested
+    :param processes: Number of processes running the permutations - 1 runs them in the calling process
+    :param seed: Seed of the permutations
+    :param block: Number of permutations per task given to a process
+    :return: pandas data frame with one row per pathway tested, sorted by FDR
+    """
+
+    ranking = pandas.Series(ranking, dtype=float).dropna()
+    ranking = ranking[~ranking.index.map(_key).duplicated()].sort_values(ascending=False, kind='mergesort')
+    scorer = _Scorer(gene_sets, list(ranking.index), weight, min_size, max_size)
+    scores = ranking.to_numpy()
+    return _run(gene_sets, scorer, scorer.scores(numpy.arange(len(scores)), scores),
+                ('gene', scores), permutations, processes, seed, block)
+
+
+def phenotype(gene_sets, expression, classes, permutations=1000, weight=1, min_size=15, max_size=500, processes=1,
+              seed=None, block=100):
+    """
+    Gene set enrichment analysis of an expression table between two phenotypes, with phenotype label permutations.
+    Genes are ranked by signal to noise ratio.
+
+    :param gene_sets: enrichment.GeneSets
+    :param expression: pandas data frame of expression values with the genes as index and one column per sample
+    :param classes: Phenotype label of every sample - two distinct labels, the first one seen is the reference
+    :param permutations: Number of phenotype label permutations
+    :param weight: Exponent of the metric weighting the running sum steps
+    :param min_size: Minimum number of ranked genes of the pathways tested
+    :param max_size: Maximum number of ranked genes of the pathways tested
+    :param processes: Number of processes running the permutations - 1 runs them in the calling process
+    :param seed: Seed of the permutations
+    :param block: Number of permutations per task given to a process
+    :return: pandas data frame with one row per pathway tested, sorted by FDR
+    """
+
+    labels = pandas.unique(pandas.Series(list(classes)))
+    if len(labels) != 2:
+        raise ValueError('Expected two phenotype labels, got %d' % len(labels))
+    if len(classes) != expression.shape[1]:
+        raise ValueError('Expected %d phenotype labels, got %d' % (expression.shape[1], len(classes)))
+
+    expression = expression[~expression.index.map(_key).duplicated()]
+    values = expression.to_numpy(dtype=float)
+    reference = numpy.asarray([label == labels[0] for label in classes])
+    scorer = _Scorer(gene_sets, list(expression.index), weight, min_size, max_size)
+    return _run(gene_sets, scorer, scorer.scores(*_ranked(signal_to_noise(values, reference[:, None])[:, 0])),
+                ('phenotype', values, reference), permutations, processes, seed, block)
+
+
+def signal_to_noise(values, reference):
+    """
+    Signal to noise ratio of genes between two groups of samples, (mean a - mean b) / (sd a + sd b), with standard
+    deviations of at least 0.2 * |mean| (0.2 for a zero mean) as in GSEA
+
+    :param values: Array of expression values, one row per gene and one column per sample
+    :param reference: Boolean array with one row per sample and one column per labelling, true for group a
+    :return: Array with one row per gene and one column per labelling
+    """
+
+    a = reference.astype(float)
+    b = 1 - a
+    statistics = []
+    for group in (a, b):
+        count = group.sum(axis=0)
+        mean = values.dot(group) / count
+        variance = (values ** 2).dot(group) / count - mean ** 2
+        std = numpy.sqrt(numpy.maximum(variance * count / numpy.maximum(count - 1, 1), 0))
+        std = numpy.maximum(std, numpy.where(mean == 0, 0.2, 0.2 * numpy.abs(mean)))
+        statistics.append((mean, std))
+    (mean_a, std_a), (mean_b, std_b) = statistics
+    return (mean_a - mean_b) / (std_a + std_b)
+
+
+class _Scorer(object):
+    """
+    Enrichment scores of the pathways for rankings of a fixed list of genes
+    """
+
+    def __init__(self, gene_sets, genes, weight, min_size, max_size):
+        self.genes = genes
+        self.weight = weight
+        ranked = [(i, gene_sets.gene_index.get(_key(gene))) for i, gene in enumerate(genes)]
+        ranked = numpy.array([pair for pair in ranked if pair[1] is not None], dtype=numpy.int64).reshape(-1, 2)
+
+        members = gene_sets.incidence[ranked[:, 1]].tocsc()
+        sizes = numpy.diff(members.indptr)
+        self.columns = numpy.flatnonzero((sizes >= min_size) & (sizes <= max_size) & (sizes < len(genes)))
+        members = members[:, self.columns]
+        self.sizes = numpy.diff(members.indptr)
+        self.starts = members.indptr[:-1]
+        # ranked gene and pathway column of every (pathway, gene) pair, grouped by column
+        self.pair_genes = ranked[members.indices, 0]
+        self.pair_columns = numpy.repeat(numpy.arange(len(self.columns)), self.sizes)
+        # the i-th pair of a column at rank r has r - i misses up to it, a step of 1 / misses of the column each
+        self.miss_scale = numpy.repeat(1.0 / (len(genes) - self.sizes), self.sizes)
+        self.miss_offset = (numpy.arange(len(self.pair_columns)) - numpy.repeat(self.starts, self.sizes)) \
+            * self.miss_scale - self.pair_columns
+        # sorting column * genes + rank orders the pairs by rank within their column
+        dtype = numpy.int32 if len(self.columns) * len(genes) < 2 ** 31 else numpy.int64
+        self.keys = (self.pair_columns * len(genes)).astype(dtype)
+        self.pair_genes = self.pair_genes.astype(dtype)
+
+    def scores(self, position, ranked_scores, peaks=False):
+        """
+        Enrichment scores of the pathways
+
+        :param position: Rank of every gene
+        :param ranked_scores: Metric of the genes in rank order
+        :param peaks: If true, also returns the rank of the genes of each pair (sorted by column and rank) and the
+            index of the pair at the peak of each pathway
+        :return: Array of enrichment scores, one per tested pathway
+        """
+
+        if not len(self.keys):
+            return (numpy.zeros(0), self.keys, self.keys) if peaks else numpy.zeros(0)
+        ranks = numpy.sort(self.keys + position[self.pair_genes].astype(self.keys.dtype)) - self.keys
+        steps = numpy.ones(len(ranks)) if self.weight == 0 else numpy.abs(ranked_scores[ranks])
+        if self.weight not in (0, 1):
+            steps **= self.weight
+
+        norm = numpy.add.reduceat(steps, self.starts)
+        if not norm.all():
+            steps[(norm == 0)[self.pair_columns]] = 1
+            norm[norm == 0] = self.sizes[norm == 0]
+        steps /= numpy.repeat(norm, self.sizes)
+
+        # the normalized steps of each column add up to 1, so the running sum of the hits of column c at a pair is
+        # the overall cumulative sum minus c, folded into miss_offset
+        after = numpy.cumsum(steps)
+        after -= ranks * self.miss_scale
+        after += self.miss_offset
+        prior = after - steps
+
+        highest = numpy.maximum.reduceat(after, self.starts)
+        lowest = numpy.minimum.reduceat(prior, self.starts)
+        es = numpy.where(highest >= -lowest, highest, lowest)
+        if not peaks:
+            return es
+
+        at = numpy.where(es >= 0, highest, lowest)
+        candidates = numpy.where(es[self.pair_columns] >= 0, after, prior) == at[self.pair_columns]
+        first = numpy.full(len(self.columns), len(ranks))
+        numpy.minimum.at(first, self.pair_columns[candidates], numpy.flatnonzero(candidates))
+        return es, ranks, first
+
+    def null(self, permutation, seed, count):
+        """
+        Enrichment scores of count permuted rankings
+
+        :param permutation: ('gene', ranked scores) or ('phenotype', expression values, reference group flags)
+        :return: Array with one row per permutation and one column per tested pathway
+        """
+
+        rng = numpy.random.default_rng(seed)
+        null = numpy.empty((count, len(self.columns)))
+        if permutation[0] == 'gene':
+            scores = permutation[1]
+            for i in range(count):
+                null[i] = self.scores(rng.permutation(len(scores)), scores)
+            return null
+
+        values, reference = permutation[1], permutation[2]
+        labels = numpy.stack([rng.permutation(reference) for _ in range(count)], axis=1)
+        metrics = signal_to_noise(values, labels)
+        for i in range(count):
+            null[i] = self.scores(*_ranked(metrics[:, i]))
+        return null
+
+
+_shared = None
+
+
+def _share(scorer, permutation):
+    """
+    Keeps the scorer and permutation data of a process of the pool - forked processes share their arrays
+    """
+
+    global _shared
+    _shared = (scorer, permutation)
+
+
+def _null(task):
+    scorer, permutation = _shared
+    return scorer.null(permutation, *task)
+
+
+def _run(gene_sets, scorer, observed, permutation, permutations, processes, seed, block):
+    """
+    Permutes the rankings and builds the result table
+    """
+
+    counts = [min(block, permutations - start) for start in range(0, permutations, block)]
+    tasks = list(zip(numpy.random.SeedSequence(seed).spawn(len(counts)), counts))
+    if processes == 1:
+        nulls = [scorer.null(permutation, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_share, initargs=(scorer, permutation)) as pool:
+            nulls = list(pool.map(_null, tasks))
+    null = numpy.concatenate(nulls) if nulls else numpy.zeros((0, len(scorer.columns)))
+
+    positive, negative = null >= 0, null < 0
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        mean_positive = numpy.where(positive, null, 0).sum(axis=0) / positive.sum(axis=0)
+        mean_negative = -numpy.where(negative, null, 0).sum(axis=0) / negative.sum(axis=0)
+        scale = numpy.where(observed >= 0, mean_positive, mean_negative)
+        nes = observed / scale
+        null_nes = null / numpy.where(positive, mean_positive, mean_negative)
+
+        p_values = numpy.where(observed >= 0,
+                               ((null >= observed) & positive).sum(axis=0) + 1.0,
+                               ((null <= observed) & negative).sum(axis=0) + 1.0)
+        p_values /= numpy.where(observed >= 0, positive.sum(axis=0), negative.sum(axis=0)) + 1.0
+        fdr = _fdr(nes, null_nes[positive], null_nes[negative])
+
+    position, ranked_scores = _observed_ranking(scorer, permutation)
+    es, ranks, peaks = scorer.scores(position, ranked_scores, peaks=True)
+    # genes in rank order - the scorer keeps them in input order, which only prerank() sorts beforehand
+    genes = numpy.empty(len(position), dtype=object)
+    genes[position] = scorer.genes
+    found, leading = [], []
+    for i, start in enumerate(scorer.starts):
+        stop = start + scorer.sizes[i]
+        edge = ranks[start:peaks[i] + 1] if es[i] >= 0 else ranks[peaks[i]:stop][::-1]
+        found.append(';'.join(genes[ranks[start:stop]]))
+        leading.append(';'.join(genes[edge]))
+
+    columns = scorer.columns
+    df = pandas.DataFrame({
+        'Pathway identifier': [gene_sets.st_ids[i] for i in columns],
+        'Pathway name': [gene_sets.names[i] for i in columns],
+        '#Entities found': scorer.sizes,
+        '#Entities total': gene_sets.sizes[columns],
+        'Entities ratio': gene_sets.sizes[columns] / float(gene_sets.universe),
+        'Entities pValue': numpy.minimum(p_values, 1),
+        'Entities FDR': fdr,
+        'Species identifier': gene_sets.species['taxId'],
+        'Species name': gene_sets.species['name'],
+        'ES': observed,
+        'NES': nes,
+        'Submitted entities found': found,
+        'Leading edge': leading,
+    })
+    df = df.sort_values(['Entities FDR', 'Entities pValue', 'NES'], ascending=[True, True, False], kind='mergesort')
+    return categorize(df.reset_index(drop=True))
+
+
+def _observed_ranking(scorer, permutation):
+    """
+    Rank of every gene and metric in rank order of the unpermuted ranking
+    """
+
+    if permutation[0] == 'gene':
+        return numpy.arange(len(permutation[1])), permutation[1]
+    return _ranked(signal_to_noise(permutation[1], permutation[2][:, None])[:, 0])
+
+
+def _ranked(metric):
+    """
+    Rank of every gene by decreasing metric, and the metric in rank order
+    """
+
+    order = numpy.argsort(-metric, kind='mergesort')
+    position = numpy.empty(len(order), dtype=numpy.int64)
+    position[order] = numpy.arange(len(order))
+    return position, metric[order]
+
+
+def _fdr(nes, null_positive, null_negative):
+    """
+    GSEA false discovery rates of normalized enrichment scores: the share of permuted scores at least as extreme,
+    over the share of observed scores at least as extreme, on the same side of zero
+    """
+
+    fdr = numpy.ones(len(nes))
+    for side, null in ((nes >= 0, numpy.sort(null_positive)), (nes < 0, numpy.sort(-null_negative))):
+        values = numpy.abs(nes[side])
+        if not len(values) or not len(null):
+            continue
+        observed = numpy.sort(values)
+        null_share = (len(null) - numpy.searchsorted(null, values, side='left')) / float(len(null))
+        observed_share = (len(observed) - numpy.searchsorted(observed, values, side='left')) / float(len(observed))
+        fdr[side] = numpy.minimum(null_share / observed_share, 1)
+    return fdr
@@ -0,0 +1,471 @@
+"""
+Per-call instrumentation of the Reactome clients.
+Callbacks registered with client.add_hook() receive an Event for every request the client serves: which service
+function made it (endpoint name and url template), the outcome (status, error, bytes sent and received), where the
+time went (rate limiting and retry backoff, DNS, connect, time to first byte, transfer, decoding of the response by
+the service function) and how it was served (cache hit or miss, coalesced with another caller, retries). \n
+ex. client.add_hook(LatencyHistogram()) aggregates these into latency histograms per endpoint.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from bisect import bisect_left
+from collections import namedtuple
+from contextvars import ContextVar
+from reactome2py import tracing
+import functools
+import inspect
+import threading
+import time
+import warnings
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
+
+
+class Event(namedtuple('Event', ['endpoint', 'url_template', 'method', 'url', 'status', 'error', 'bytes_sent',
+                                 'bytes_received', 'wait', 'dns', 'connect', 'ttfb', 'transfer', 'elapsed', 'decode',
+                                 'cache', 'coalesced', 'retries'])):
+    """
+    One request served by a client. Times are in seconds, None when not observed by the transport or not applicable.
+
+    endpoint: Service function that made the request ex. 'analysis.token', None for direct client calls \n
+    url_template: Request url with the function's arguments as placeholders ex. '.../token/{token}' \n
+    status: HTTP status code of the final response, None if no response was obtained \n
+    error: Exception raised to the caller, None on success \n
+    wait: Time spent waiting on the rate limiter and between retries \n
+    dns, connect, ttfb, transfer: Host name resolution, connection, time to first byte and body transfer of the final
+    attempt \n
+    elapsed: Time spent in the client from the call to the returned response \n
+    decode: Time the service function spent turning the response into its result \n
+    cache: 'hit' or 'miss' for cacheable requests, None otherwise \n
+    coalesced: Whether the response was shared by an identical request of another caller \n
+    retries: Number of attempts beyond the first
+    """
+
+    __slots__ = ()
+
+    @property
+    def total(self):
+        """
+        Time spent in the client and decoding the response
+        """
+
+        return self.elapsed + (self.decode or 0)
+
+
+_calls = ContextVar('reactome2py_calls', default=())
+_record = ContextVar('reactome2py_record', default=None)
+
+
+def _size(data):
+    """
+    Size in bytes of a request body as passed to requests, None when it can not be known without consuming it
+    """
+
+    if data is None:
+        return 0
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+    if isinstance(data, (dict, list, tuple)):
+        return len(urlencode(data, doseq=True))
+    return None
+
+
+class Record(object):
+    """
+    Measurements of one request, filled in by the client while it serves it
+
+    :param hooks: Callbacks receiving the Event of the request
+    :param method: HTTP method
+    :param url: Request url
+    :param data: Request body
+    """
+
+    def __init__(self, hooks, method, url, data=None):
+        self.hooks = hooks
+        self.method = method.upper()
+        self.url = url.split('?')[0]
+        self.endpoint = self.url_template = None
+        self.status = self.error = self.bytes_received = None
+        self.bytes_sent = _size(data)
+        self.wait = 0.0
+        self.dns = self.connect = self.ttfb = self.transfer = self.decode = None
+        self.cache = None
+        self.coalesced = False
+        self.retries = 0
+        self.elapsed = 0.0
+        self.span = None
+        self._start = time.perf_counter()
+        self._sent = None
+        self._decode_start = None
+        self._parent = None
+        self._emitted = False
+
+    def sending(self):
+        """
+        The current attempt leaves the client, done waiting on the rate limiter
+        """
+
+        self._sent = time.perf_counter()
+
+    def exchange(self, mark, response, attempt):
+        """
+        Records one attempt at sending the request
+
+        :param mark: When the client started waiting to send the attempt
+        :param response: requests.Response or None when no response was obtained
+        :param attempt: Number of the attempt, 0 for the first one
+        :return: The current time, when the wait for the next attempt starts
+        """
+
+        end = time.perf_counter()
+        sent = self._sent if self._sent is not None and self._sent >= mark else mark
+        duration = end - sent
+        self.wait = sent - mark if attempt == 0 else self.wait + sent - mark
+        self.retries = attempt
+        self.ttfb, self.transfer = duration, 0.0
+        if response is None:
+            self.status = self.bytes_received = None
+            return end
+
+        self.status = response.status_code
+        elapsed = response.elapsed.total_seconds() if response.elapsed else 0
+        if 0 < elapsed <= duration:
+            self.ttfb, self.transfer = elapsed, duration - elapsed
+        if response._content_consumed and isinstance(response._content, bytes):
+            self.bytes_received = len(response._content)
+        else:
+            length = response.headers.get('Content-Length')
+            self.bytes_received = int(length) if length and length.isdigit() else None
+        return end
+
+    def note(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def finish(self, response):
+        """
+        The client returns the response
+        """
+
+        self.elapsed = time.perf_counter() - self._start
+        if self.status is None:
+            self.status = response.status_code
+        tracing.end_http(self.span, self)
+
+    def fail(self, error):
+        """
+        The client raises an error to the caller: emits the record
+        """
+
+        self.elapsed = time.perf_counter() - self._start
+        self.error = error
+        self.status = getattr(error, 'status_code', self.status)
+        tracing.end_http(self.span, self)
+        self.emit()
+
+    def emit(self):
+        """
+        Passes the Event of the request to every hook, once
+        """
+
+        if self._emitted:
+            return
+        self._emitted = True
+
+        if self._decode_start is not None:
+            self.decode = time.perf_counter() - self._decode_start
+            if self._parent is not None:
+                tracing.interval('parse', tracing.now() - int(self.decode * 1e9), self._parent)
+
+        event = Event(self.endpoint, self.url_template or self.url, self.method, self.url, self.status, self.error,
+                      self.bytes_sent, self.bytes_received, self.wait, self.dns, self.connect, self.ttfb,
+                      self.transfer, self.elapsed, self.decode, self.cache, self.coalesced, self.retries)
+        for hook in list(self.hooks):
+            try:
+                hook(event)
+            except Exception as e:
+                warnings.warn('Instrumentation hook %r failed: %r' % (hook, e), RuntimeWarning)
+
+
+def current():
+    """
+    Record of the request being served in the current thread or task
+
+    :return: Record or None when no hook is registered
+    """
+
+    return _record.get()
+
+
+def sending():
+    """
+    The request being served leaves the client, done waiting on the rate limiter
+    """
+
+    record = _record.get()
+    if record is not None:
+        record.sending()
+
+
+def note(**fields):
+    """
+    Sets fields of the record of the request being served, if any
+    """
+
+    record = _record.get()
+    if record is not None:
+        record.note(**fields)
+
+
+def track(record):
+    """
+    Makes record the record of the request being served in the current thread or task
+
+    :return: Token for untrack()
+    """
+
+    return _record.set(record)
+
+
+def untrack(token):
+    _record.reset(token)
+
+
+def observe(record, func, *args, **kwargs):
+    """
+    Serves a request with func while collecting its measurements into record, then hands the record over to the
+    service function that made the request, or emits it right away for direct client calls
+
+    :return: func's result - the response
+    """
+
+    begin_request()
+    serialized()
+    record.span, activation = tracing.start_http(record.method, record.url)
+    token = track(record)
+    try:
+        response = func(*args, **kwargs)
+    except Exception as e:
+        record.fail(e)
+        raise
+    finally:
+        untrack(token)
+        tracing.deactivate(activation)
+    record.finish(response)
+    attach(record)
+    return response
+
+
+class _Call(object):
+    """
+    One running call of a service function
+    """
+
+    __slots__ = ('name', 'signature', 'args', 'kwargs', 'pending', 'mark', '_values')
+
+    def __init__(self, name, signature, args, kwargs):
+        self.name = name
+        self.signature = signature
+        self.args = args
+        self.kwargs = kwargs
+        self.pending = None
+        self.mark = tracing.now() if tracing.enabled() else None
+        self._values = None
+
+    def arguments(self):
+        """
+        Arguments of the call by parameter name, defaults included
+
+        :return: dict
+        """
+
+        try:
+            bound = self.signature.bind(*self.args, **self.kwargs)
+        except TypeError:
+            return {}
+        bound.apply_defaults()
+        return bound.arguments
+
+    def template(self, url):
+        """
+        The request url with the path segments holding the call's arguments replaced by their parameter name
+        """
+
+        if self._values is None:
+            self._values = {}
+            for name, value in self.arguments().items():
+                if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value):
+                    self._values.setdefault(str(value), name)
+
+        parts = url.split('/')
+        return '/'.join(parts[:3] + ['{%s}' % self._values[part] if part in self._values else part
+                                     for part in parts[3:]])
+
+    def close(self):
+        """
+        Emits the request whose response the function was decoding
+        """
+
+        if self.pending is not None:
+            self.pending.emit()
+            self.pending = None
+
+
+def begin_request():
+    """
+    A new request or service function call starts: the running function is done decoding its previous response
+    """
+
+    calls = _calls.get()
+    if calls:
+        calls[-1].close()
+
+
+def serialized():
+    """
+    The running service function is done building its first request
+    """
+
+    calls = _calls.get()
+    if calls and calls[-1].mark is not None:
+        tracing.interval('serialize', calls[-1].mark)
+        calls[-1].mark = None
+
+
+def attach(record):
+    """
+    Hands a served request over to the running service function, which now decodes the response
+    """
+
+    calls = _calls.get()
+    if not calls:
+        record.emit()
+        return
+
+    call = calls[-1]
+    call.close()
+    call.mark = None
+    if not record._emitted:
+        record.endpoint = call.name
+        record.url_template = call.template(record.url)
+        record._decode_start = time.perf_counter()
+        record._parent = tracing.context()
+        call.pending = record
+
+
+def endpoint(func):
+    """
+    Decorator of the service functions, naming the requests they make ex. 'analysis.token', measuring the
+    time they spend decoding the responses and tracing their calls
+    """
+
+    name = '%s.%s' % (func.__module__.rsplit('.', 1)[-1], func.__name__)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        begin_request()
+        running = _Call(name, signature, args, kwargs)
+        token = _calls.set(_calls.get() + (running,))
+        try:
+            with tracing.span(name, running.arguments):
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    running.close()
+        finally:
+            _calls.reset(token)
+
+    call.endpoint = name
+    return call
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HistogramInfo = namedtuple('HistogramInfo', ['count', 'errors', 'sum', 'max', 'buckets'])
+
+
+class LatencyHistogram(object):
+    """
+    Hook aggregating events into one latency histogram per endpoint, ex. client.add_hook(LatencyHistogram()).
+    Direct client calls are aggregated by url.
+
+    :param buckets: Increasing upper bounds of the histogram buckets in seconds
+    :param metric: Event time measured ex. 'total' (client and decoding), 'elapsed', 'ttfb' or 'decode'
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, metric='total'):
+        self.buckets = tuple(buckets)
+        self.metric = metric
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        value = getattr(event, self.metric)
+        if value is None:
+            return
+        key = event.endpoint or event.url_template
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0, 0, 0.0, 0.0, [0] * (len(self.buckets) + 1)]
+            series[0] += 1
+            series[1] += event.error is not None
+            series[2] += value
+            series[3] = max(series[3], value)
+            series[4][bisect_left(self.buckets, value)] += 1
+
+    def snapshot(self):
+        """
+        Current histograms
+
+        :return: dict of endpoint to HistogramInfo(count, errors, sum, max, buckets) where buckets lists
+            (upper bound, cumulative count) pairs ending with (inf, count)
+        """
+
+        with self._lock:
+            series = dict((key, (count, errors, total, peak, list(counts)))
+                          for key, (count, errors, total, peak, counts) in self._series.items())
+
+        info = {}
+        for key, (count, errors, total, peak, counts) in series.items():
+            cumulative, buckets = 0, []
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                buckets.append((bound, cumulative))
+            info[key] = HistogramInfo(count, errors, total, peak, buckets)
+        return info
+
+    def quantile(self, endpoint, q):
+        """
+        Estimated latency quantile of an endpoint, interpolated within its histogram bucket
+
+        :param endpoint: Endpoint name ex. 'analysis.token'
+        :param q: Quantile between 0 and 1 ex. 0.99
+        :return: float or None without events
+        """
+
+        info = self.snapshot().get(endpoint)
+        if info is None or not info.count:
+            return None
+
+        rank = q * info.count
+        lower, below = 0.0, 0
+        for bound, cumulative in info.buckets:
+            if cumulative >= rank:
+                if bound == float('inf'):
+                    return info.max
+                inside = cumulative - below
+                return lower + (bound - lower) * ((rank - below) / inside if inside else 0)
+            lower, below = bound, cumulative
+        return info.max
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
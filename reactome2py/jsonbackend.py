@@ -0,0 +1,290 @@
+"""
+JSON decoding backend of the service functions.
+Responses are decoded straight from their bytes with the fastest library installed: orjson, else simdjson (the
+pysimdjson package), else the standard library json module. REACTOME2PY_JSON=json (or orjson, simdjson) forces a
+backend; set_backend() switches at runtime.
+
+iter_array() decodes the elements of a huge array member of a document one at a time while the document is read,
+aiter_array() while it is received by an asynchronous client.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from importlib import import_module
+import codecs
+import json
+import os
+import re
+
+
+BACKENDS = ('orjson', 'simdjson', 'json')
+
+_name = None
+_loads = json.loads
+_decoder = json.JSONDecoder()
+
+
+def _load(name):
+    """
+    The loads function of a backend
+
+    :raises ImportError: The backend is not installed
+    """
+
+    if name not in BACKENDS:
+        raise ValueError('Unknown JSON backend %r, expected one of %s' % (name, ', '.join(BACKENDS)))
+    return import_module(name).loads
+
+
+def set_backend(name=None):
+    """
+    Selects the JSON backend
+
+    :param name: 'orjson', 'simdjson' or 'json' - None picks the first one installed, in that order
+    :return: Name of the previous backend
+    :raises ImportError: The requested backend is not installed
+    """
+
+    global _name, _loads
+
+    previous = _name
+    if name is None:
+        for candidate in BACKENDS:
+            try:
+                _loads = _load(candidate)
+            except ImportError:
+                continue
+            _name = candidate
+            break
+    else:
+        _loads = _load(name)
+        _name = name
+    return previous
+
+
+def get_backend():
+    """
+    Name of the JSON backend in use
+
+    :return: 'orjson', 'simdjson' or 'json'
+    """
+
+    return _name
+
+
+def loads(data):
+    """
+    Decodes a JSON document. Documents a fast backend rejects are decoded again by the standard library, which
+    accepts a few more (ex. NaN, other encodings than UTF-8).
+
+    :param data: bytes - or str - holding the document
+    :return: Decoded object
+    """
+
+    try:
+        return _loads(data)
+    except ValueError:
+        if _loads is json.loads:
+            raise
+        return json.loads(data)
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _Starved(Exception):
+    """
+    Raised by _ArrayParser when the data fed so far ends inside the next value
+    """
+
+
+class _ArrayParser(object):
+    """
+    Push parser of a JSON object with a large array member: fed the document in chunks of bytes, it decodes the
+    header and the array elements complete so far. A step cut short by the end of the data is taken again from its
+    start once more data is fed.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.text = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.state = 'open'
+        self.header = {}
+        self.done = False
+
+    def feed(self, chunk):
+        """
+        Appends a chunk to the buffer, dropping the consumed text
+
+        :param chunk: bytes, or None at the end of the document
+        """
+
+        self.eof = chunk is None
+        if self.pos > 2 ** 16:
+            self.buf, self.pos = self.buf[self.pos:], 0
+        self.buf += self.text.decode(chunk or b'', final=self.eof)
+
+    def parsed(self):
+        """
+        The header, then the elements decoded from the data fed so far
+
+        :raises ValueError: The document is not valid JSON, or ends before the array does
+        """
+
+        while not self.done and self.state != 'element':
+            start = self.pos
+            try:
+                step = self.step()
+            except _Starved:
+                self.pos = start
+                return
+            if step is not None:
+                yield step
+
+        # the elements, decoded in a tight loop
+        decode, whitespace = _decoder.raw_decode, _WHITESPACE.match
+        while not self.done:
+            start = self.pos
+            try:
+                item, end = decode(self.buf, whitespace(self.buf, start).end())
+                pos = whitespace(self.buf, end).end()
+                separator = self.buf[pos:pos + 1]
+            except ValueError:
+                separator = ''
+            if separator == ',':
+                self.pos = pos + 1
+            elif separator == ']':
+                self.pos = pos + 1
+                self.done = True
+            elif not separator and not self.eof:
+                self.pos = start
+                return
+            else:
+                # invalid JSON, reported with its position by step()
+                try:
+                    item = self.step()
+                except _Starved:
+                    self.pos = start
+                    return
+            yield item
+
+    def step(self):
+        """
+        Decodes the next member or element
+
+        :return: The header once complete, an element, or None
+        """
+
+        if self.state == 'open':
+            self.expect('{')
+            if self.token() == '}':
+                self.done = True
+                return self.header
+            self.state = 'member'
+        elif self.state == 'member':
+            name = self.value()
+            self.expect(':')
+            if name == self.key and self.token() == '[':
+                self.pos += 1
+                self.state = 'first'
+                return self.header
+            self.header[name] = self.value()
+            if self.token() == '}':
+                self.done = True
+                return self.header
+            self.expect(',')
+        elif self.state == 'first':
+            if self.token() == ']':
+                self.done = True
+            self.state = 'element'
+        else:
+            item = self.value()
+            if self.token() == ']':
+                self.done = True
+            else:
+                self.expect(',')
+            return item
+
+    def token(self):
+        """
+        The next character that is not whitespace, left unconsumed
+        """
+
+        self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+        if self.pos < len(self.buf):
+            return self.buf[self.pos]
+        if self.eof:
+            raise ValueError('Truncated JSON document')
+        raise _Starved()
+
+    def expect(self, char):
+        if self.token() != char:
+            raise ValueError('Expected %r at position %d of JSON document' % (char, self.pos))
+        self.pos += 1
+
+    def value(self):
+        """
+        Decodes the next complete value - one ending the data fed so far may continue in the next chunk
+        """
+
+        self.token()
+        try:
+            item, end = _decoder.raw_decode(self.buf, self.pos)
+        except ValueError:
+            if self.eof:
+                raise
+            raise _Starved()
+        if end == len(self.buf) and not self.eof:
+            raise _Starved()
+        self.pos = end
+        return item
+
+
+def iter_array(chunks, key):
+    """
+    Incrementally decodes a JSON object whose member key holds a large array, keeping a single element in memory.
+    Elements are decoded one by one by the standard library's C scanner as soon as they are complete.
+
+    :param chunks: Iterable of bytes making up the document, ex. response.iter_content(2 ** 16)
+    :param key: Name of the top-level array member ex. 'pathways'
+    :return: Generator yielding first a dict of the top-level members preceding key, then every element of the array
+    :raises ValueError: The document is not valid JSON
+    """
+
+    parser = _ArrayParser(key)
+    for chunk in chunks:
+        parser.feed(chunk)
+        for item in parser.parsed():
+            yield item
+        if parser.done:
+            return
+    parser.feed(None)
+    for item in parser.parsed():
+        yield item
+
+
+async def aiter_array(chunks, key):
+    """
+    Asynchronous iter_array(), ex. over the chunks of an aiohttp response
+
+    :param chunks: Asynchronous iterable of bytes making up the document
+    :param key: Name of the top-level array member ex. 'pathways'
+    :return: Asynchronous generator yielding first the header dict, then every element of the array
+    :raises ValueError: The document is not valid JSON
+    """
+
+    parser = _ArrayParser(key)
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for item in parser.parsed():
+            yield item
+        if parser.done:
+            return
+    parser.feed(None)
+    for item in parser.parsed():
+        yield item
+
+
+set_backend(os.environ.get('REACTOME2PY_JSON') or None)
@@ -0,0 +1,154 @@
+"""
+Token-bucket rate limiting of the requests sent to the Reactome servers.
+Each host has its own budget (a sustained rate and a burst size). The process-wide limiter returned by
+shared_limiter() is used by default by every ReactomeClient and AsyncReactomeClient, so parallel threads and
+asyncio tasks draw from the same budget and stay under the public servers' limits together.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+import asyncio
+import threading
+import time
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+
+DEFAULT_BUDGETS = {
+    'reactome.org': (10, 10),
+    'cpws.reactome.org': (5, 5),
+}
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket. Callers reserve a token and wait until it is due, so waiting callers are served in
+    the order they arrived and never busy-wait.
+
+    :param rate: Sustained number of requests per second
+    :param burst: Number of requests that may be sent back to back after an idle period - defaults to rate
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive, got %s' % rate)
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token, going into debt when the bucket is empty
+
+        :return: Seconds to wait before sending the request
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """
+        Blocks the calling thread until a request may be sent
+        """
+
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """
+        Suspends the calling task until a request may be sent
+        """
+
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter(object):
+    """
+    Per-host token buckets. Hosts without a budget are not limited - RateLimiter({}) disables limiting.
+
+    :param budgets: Dictionary of host name to (requests per second, burst) - defaults to DEFAULT_BUDGETS
+    """
+
+    def __init__(self, budgets=None):
+        if budgets is None:
+            budgets = DEFAULT_BUDGETS
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        for host, (rate, burst) in budgets.items():
+            self.configure(host, rate, burst)
+
+    def configure(self, host, rate, burst=None):
+        """
+        Sets the budget of a host, ex. limiter.configure('cpws.reactome.org', 2)
+
+        :param host: Host name ex. 'reactome.org'
+        :param rate: Sustained number of requests per second - None removes the host's limit
+        :param burst: Number of requests that may be sent back to back - defaults to rate
+        """
+
+        with self._lock:
+            if rate is None:
+                self._buckets.pop(host, None)
+            else:
+                self._buckets[host] = TokenBucket(rate, burst)
+
+    def bucket(self, url):
+        """
+        The token bucket limiting requests to the host of url
+
+        :param url: Request url
+        :return: TokenBucket or None if the host is not limited
+        """
+
+        return self._buckets.get(urlsplit(url).hostname)
+
+    def acquire(self, url):
+        """
+        Blocks the calling thread until a request to url may be sent
+
+        :param url: Request url
+        """
+
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, url):
+        """
+        Suspends the calling task until a request to url may be sent
+
+        :param url: Request url
+        """
+
+        bucket = self.bucket(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+
+_shared_limiter = RateLimiter()
+
+
+def shared_limiter():
+    """
+    The process-wide rate limiter used by clients created without their own
+
+    :return: RateLimiter
+    """
+
+    return _shared_limiter
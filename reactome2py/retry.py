@@ -0,0 +1,98 @@
+"""
+Retry policy of the Reactome clients: jittered exponential backoff honoring the server's Retry-After header.
+GET requests and read-only POST requests are retried on connection failures and transient status codes.
+POST requests that create server-side state (ex. an analysis token) are only retried when the server cannot have
+processed them - the connection was never established, or the server refused them with 429 or 503.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+REFUSED_STATUSES = frozenset([429, 503])
+
+
+class Retry(object):
+    """
+    Retry policy shared by ReactomeClient and AsyncReactomeClient
+
+    :param total: Maximum number of retries after the first attempt - 0 disables retrying
+    :param backoff_factor: Base delay in seconds, the n-th retry waits a random time up to backoff_factor * 2 ** n
+    :param max_backoff: Upper bound of the backoff delay in seconds
+    :param statuses: Status codes worth retrying
+    :param respect_retry_after: If true, waits for the delay requested by the server's Retry-After header
+    :param max_retry_after: Longest Retry-After delay in seconds that is honored before giving up
+    """
+
+    def __init__(self, total=4, backoff_factor=0.5, max_backoff=30, statuses=RETRY_STATUSES,
+                 respect_retry_after=True, max_retry_after=120):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, method, idempotent=None, status=None, sent=True):
+        """
+        Whether a failed attempt may be repeated
+
+        :param method: HTTP method of the request
+        :param idempotent: Whether repeating the request is harmless - defaults to true for GET and false for POST
+        :param status: Status code of the response, None when the attempt failed without a response
+        :param sent: False when the connection failed before the request reached the server
+        :return: bool
+        """
+
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS')
+
+        if status is None:
+            return idempotent or not sent
+        if status not in self.statuses:
+            return False
+        return idempotent or status in REFUSED_STATUSES
+
+    def retry_after(self, response):
+        """
+        Delay requested by the Retry-After header of a response
+
+        :param response: requests.Response
+        :return: Seconds to wait or None when the header is absent or unparsable
+        """
+
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+    def delay(self, retry_number, response=None):
+        """
+        Time to wait before a retry
+
+        :param retry_number: 0 for the first retry, 1 for the second...
+        :param response: The response of the failed attempt, if any
+        :return: Seconds to wait or None when the server asks to wait longer than max_retry_after
+        """
+
+        if self.respect_retry_after:
+            requested = self.retry_after(response)
+            if requested is not None:
+                return requested if requested <= self.max_retry_after else None
+
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** retry_number))
@@ -0,0 +1,126 @@
+"""
+Request coalescing for the Reactome clients.
+When several threads or asyncio tasks ask for the same GET request at the same time, only the first one sends it;
+the others wait for its outcome and receive their own copy of the response (or the same error).
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+import asyncio
+import threading
+
+
+class _Call(object):
+    """
+    One in-flight request and the callers waiting on it
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Thread-safe coalescing of concurrent calls sharing a key
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Runs func unless a call with the same key is already in flight, in which case waits for its outcome
+
+        :param key: Request key
+        :param func: Callable without arguments sending the request
+        :return: (result, shared) where shared is true when the result came from another caller's call
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """
+        Number of distinct calls currently in flight
+
+        :return: int
+        """
+
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight(object):
+    """
+    Coalescing of concurrent coroutine calls sharing a key, within one event loop
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        """
+        Awaits func() unless a call with the same key is already in flight, in which case awaits its outcome - if
+        that call is cancelled, one of the waiting tasks sends the request again for the others
+
+        :param key: Request key
+        :param func: Coroutine function without arguments sending the request
+        :return: (result, shared) where shared is true when the result came from another task's call
+        """
+
+        future = self._calls.get(key)
+        while future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # the leader was cancelled, not this task: take over the call, or join the one that did
+                if not future.cancelled():
+                    raise
+            future = self._calls.get(key)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+    def in_flight(self):
+        """
+        Number of distinct calls currently in flight
+
+        :return: int
+        """
+
+        return len(self._calls)
@@ -0,0 +1,191 @@
+"""
+OpenTelemetry tracing of the Reactome calls.
+When opentelemetry is installed and the application has configured a tracer provider, every service function
+call gets a span named after the function ex. 'analysis.token', carrying its arguments as 'reactome.<name>'
+attributes, with child spans for building the request ('serialize'), each HTTP exchange ('HTTP GET') and turning
+the response into the result ('parse'). Bulk helpers ex. aio gather() open a parent span over their calls. \n
+Without opentelemetry, or before a tracer provider is set, tracing costs nothing.
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+
+_replaying = ContextVar('reactome2py_replaying', default=False)
+
+
+def enabled():
+    """
+    Whether spans are recorded: opentelemetry is installed and a tracer provider is configured
+
+    :return: bool
+    """
+
+    if trace is None:
+        return False
+    return not isinstance(trace.get_tracer_provider(), (trace.ProxyTracerProvider, trace.NoOpTracerProvider))
+
+
+def tracer():
+    return trace.get_tracer('reactome2py')
+
+
+def attributes(arguments):
+    """
+    Span attributes of the scalar arguments of a call
+
+    :param arguments: Dictionary of parameter name to value
+    :return: dict of 'reactome.<name>' to value, long strings such as identifier lists left out
+    """
+
+    return dict(('reactome.%s' % name, value) for name, value in arguments.items()
+                if isinstance(value, (str, bool, int, float)) and len(str(value)) <= 256)
+
+
+def now():
+    return time.time_ns()
+
+
+@contextmanager
+def span(name, arguments=None):
+    """
+    Current span around a service function or bulk helper call, nothing when tracing is off or inside the
+    re-runs of a function by the asynchronous client
+
+    :param name: Span name ex. 'analysis.token'
+    :param arguments: Callable returning the call's arguments by parameter name
+    :return: Context manager yielding the span or None
+    """
+
+    if not enabled() or _replaying.get():
+        yield None
+        return
+
+    with tracer().start_as_current_span(name, attributes=attributes(arguments()) if arguments else None) as current:
+        yield current
+
+
+def start(name, arguments=None):
+    """
+    Starts a span without making it current, for generators that hand control back to their caller between the
+    calls they cover - those calls run in its context through activated(), and the caller keeps its own
+
+    :param name: Span name ex. 'analysis.batch_identifiers'
+    :param arguments: Callable returning the call's arguments by parameter name
+    :return: (span, context holding it) or (None, None) when tracing is off
+    """
+
+    if not enabled() or _replaying.get():
+        return None, None
+
+    current = tracer().start_span(name, attributes=attributes(arguments()) if arguments else None)
+    return current, trace.set_span_in_context(current)
+
+
+@contextmanager
+def activated(parent):
+    """
+    Makes a context from start() current, nothing when it is None
+    """
+
+    if parent is None:
+        yield
+        return
+
+    token = otel_context.attach(parent)
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def end(current):
+    if current is not None:
+        current.end()
+
+
+@contextmanager
+def replaying():
+    """
+    Marks the re-runs of a function by the asynchronous client, which are covered by one span of the whole call
+    """
+
+    token = _replaying.set(True)
+    try:
+        yield
+    finally:
+        _replaying.reset(token)
+
+
+def start_http(method, url):
+    """
+    Starts the span of an HTTP exchange as a child of the current span
+
+    :return: (span, activation token) or (None, None) when tracing is off
+    """
+
+    if not enabled():
+        return None, None
+
+    current = tracer().start_span('HTTP %s' % method, kind=trace.SpanKind.CLIENT,
+                                  attributes={'http.method': method, 'http.url': url})
+    return current, otel_context.attach(trace.set_span_in_context(current))
+
+
+def deactivate(token):
+    if token is not None:
+        otel_context.detach(token)
+
+
+def end_http(current, record):
+    """
+    Ends the span of an HTTP exchange with the measurements of its instrument.Record
+    """
+
+    if current is None:
+        return
+
+    if record.status is not None:
+        current.set_attribute('http.status_code', record.status)
+    if record.bytes_received is not None:
+        current.set_attribute('http.response_content_length', record.bytes_received)
+    current.set_attribute('reactome.retries', record.retries)
+    current.set_attribute('reactome.coalesced', record.coalesced)
+    if record.cache:
+        current.set_attribute('reactome.cache', record.cache)
+    if record.error is not None:
+        current.record_exception(record.error)
+        current.set_status(trace.Status(trace.StatusCode.ERROR, str(record.error)))
+    current.end()
+
+
+def context():
+    """
+    The current trace context, to parent spans created later
+
+    :return: opentelemetry Context or None when tracing is off
+    """
+
+    return otel_context.get_current() if enabled() else None
+
+
+def interval(name, start_time, parent=None):
+    """
+    Records a span that started at start_time and ends now
+
+    :param name: Span name ex. 'parse'
+    :param start_time: Start in nanoseconds since the epoch, see now()
+    :param parent: Context of the parent span - the current one by default
+    """
+
+    if not enabled():
+        return
+    tracer().start_span(name, context=parent, start_time=start_time).end()
@@ -0,0 +1,226 @@
+"""
+Transports carry the requests of the Reactome clients.
+HTTPTransport talks to the real servers over pooled keep-alive sessions, one per host. LocalTransport serves
+responses stored on disk in-process, ex. to run pipelines and benchmarks on an air-gapped machine. \n
+Each service has a base url that clients can point elsewhere, ex. at a local mirror:
+ReactomeClient(base_urls={'content': 'http://localhost:8080/ContentService'})
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from reactome2py.upload import body_chunks
+import hashlib
+import mimetypes
+import os
+import threading
+import requests
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+
+SERVICES = OrderedDict([
+    ('analysis', 'https://reactome.org/AnalysisService'),
+    ('content', 'https://reactome.org/ContentService'),
+    ('download', 'https://reactome.org/download'),
+    ('fi', 'http://cpws.reactome.org'),
+])
+
+
+def split_service(url):
+    """
+    Splits a url of one of the Reactome services into the service name and the path below its default base url
+
+    :param url: Request url
+    :return: (service, path) or (None, url) for urls outside the services
+    """
+
+    for service, base in SERVICES.items():
+        if url == base or url.startswith(base + '/'):
+            return service, url[len(base):]
+    return None, url
+
+
+def rebase(url, base_urls):
+    """
+    Points a url of one of the Reactome services at the configured base url of that service
+
+    :param url: Request url built with the default base urls
+    :param base_urls: Dictionary of service name ('analysis', 'content', 'download', 'fi') to base url
+    :return: str
+    """
+
+    service, path = split_service(url)
+    base = base_urls.get(service) if service else None
+    if not base:
+        return url
+    return base.rstrip('/') + path
+
+
+class Transport(object):
+    """
+    Base class of the transports. send() takes the arguments of requests.Session.request and returns a
+    requests.Response, raising requests' ConnectionError or Timeout when no response could be obtained.
+    The asynchronous client awaits send_async(), which defaults to send().
+    """
+
+    def send(self, method, url, **kwargs):
+        raise NotImplementedError
+
+    async def send_async(self, method, url, **kwargs):
+        return self.send(method, url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class HTTPTransport(Transport):
+    """
+    Network transport keeping one pooled keep-alive requests.Session per host. Responses are requested compressed
+    (gzip and deflate, plus brotli when the brotli package is installed) and decompressed while they are read.
+
+    :param pool_maxsize: Maximum number of keep-alive connections kept open per host
+    :param headers: Extra headers sent with every request
+    """
+
+    def __init__(self, pool_maxsize=10, headers=None):
+        self.pool_maxsize = pool_maxsize
+        self.headers = dict(headers or {})
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, url):
+        """
+        The keep-alive session serving the host of url, created on first use
+
+        :param url: Request url
+        :return: requests.Session
+        """
+
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+
+        return session
+
+    def send(self, method, url, **kwargs):
+        return self.session(url).request(method, url, **kwargs)
+
+    def close(self):
+        """
+        Closes every pooled connection
+        """
+
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+
+class LocalTransport(Transport):
+    """
+    In-process transport serving responses stored under a directory, one file per resource:
+    <root>/<service>/<path below the service's base url>, ex. <root>/content/data/query/R-HSA-60140. \n
+    A response specific to the query parameters or body of a request is looked up first in the file named
+    <path>@<digest>, see variant(); store() writes files at the right place. Missing files answer 404.
+
+    :param root: Directory holding the stored responses
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def variant(method, url, params=None, data=None):
+        """
+        Digest distinguishing requests to the same path by method, query string and body
+
+        :return: str of 16 hexadecimal characters
+        """
+
+        prepared = requests.Request(method.upper(), url, params=params, data=data).prepare()
+        digest = hashlib.sha1()
+        digest.update(prepared.method.encode('ascii'))
+        digest.update((urlsplit(prepared.url).query or '').encode('utf-8'))
+        for chunk in body_chunks(prepared.body):
+            digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def path(self, method, url, params=None, data=None, exact=True):
+        """
+        File holding the stored response of a request
+
+        :param exact: If true, the file specific to the query parameters and body, else the file shared by every
+            request to the same path
+        :return: str or None for urls outside the Reactome services
+        """
+
+        service, path = split_service(url.split('?')[0])
+        if service is None:
+            return None
+        local = os.path.join(self.root, service, *[part for part in path.split('/') if part])
+        if exact:
+            local = '%s@%s' % (local, self.variant(method, url, params, data))
+        return local
+
+    def store(self, method, url, content, params=None, data=None, exact=False):
+        """
+        Writes a response body where send() will find it
+
+        :param content: Response body as bytes or str
+        :param exact: If true, only serves requests with the same query parameters and body
+        :return: Path of the written file
+        """
+
+        local = self.path(method, url, params, data, exact=exact)
+        directory = os.path.dirname(local)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8')
+        with open(local, 'wb') as f:
+            f.write(content)
+        return local
+
+    def send(self, method, url, params=None, data=None, **kwargs):
+        response = requests.Response()
+        response.url = requests.Request(method.upper(), url, params=params).prepare().url
+        response.status_code = 404
+        response._content = b''
+
+        for exact in (True, False):
+            local = self.path(method, url, params, data, exact=exact)
+            if local is not None and os.path.isfile(local):
+                with open(local, 'rb') as f:
+                    response._content = f.read()
+                response.status_code = 200
+                response.headers['Content-Type'] = _content_type(local, response._content)
+                response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+                break
+
+        response._content_consumed = True
+        return response
+
+
+def _content_type(path, content):
+    """
+    Media type of a stored response body
+    """
+
+    if content[:1] in (b'{', b'['):
+        return 'application/json'
+    guessed = mimetypes.guess_type(path.split('@')[0])[0]
+    return guessed or 'text/plain; charset=utf-8'
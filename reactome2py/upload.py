@@ -0,0 +1,154 @@
+"""
+Request bodies streamed to the server in chunks, so that large identifier lists and expression matrices are
+submitted with constant memory. \n
+An Upload reads its source - a file path, an open file object or an iterable of lines - as it is sent, optionally
+gzip-compressing it on the fly, ex. analysis.identifiers_form(Upload('matrix.tsv', compress=True)).
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+import hashlib
+import io
+import os
+import zlib
+
+
+class Upload(object):
+    """
+    Request body read from its source in chunks while it is sent
+
+    :param source: Path of a file, open file object (binary or text) or iterable of lines (str or bytes) - lines
+        without a trailing newline get one
+    :param chunk_size: Number of bytes read from files per chunk
+    :param compress: If true, the body is gzip-compressed while it is sent - send it with 'Content-Encoding: gzip'
+    """
+
+    def __init__(self, source, chunk_size=2 ** 16, compress=False):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self._start = None
+        self._sent = False
+
+        if hasattr(source, 'read') and _seekable(source):
+            self._start = source.tell()
+
+    @property
+    def replayable(self):
+        """
+        Whether the body can be sent again, ex. when retrying - false for non-seekable files and line iterators
+        """
+
+        return self._rereadable() or not self._sent
+
+    def _rereadable(self):
+        return self._is_path() or self._start is not None
+
+    def _is_path(self):
+        return isinstance(self.source, (str, os.PathLike))
+
+    def _raw(self):
+        """
+        Uncompressed chunks of the source
+        """
+
+        if self._is_path():
+            with open(self.source, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                    yield chunk
+        elif hasattr(self.source, 'read'):
+            if self._start is not None:
+                self.source.seek(self._start)
+            for chunk in iter(lambda: self.source.read(self.chunk_size), self.source.read(0)):
+                yield _encode(chunk)
+        else:
+            for line in self.source:
+                line = _encode(line)
+                yield line if line.endswith(b'\n') else line + b'\n'
+
+    def __iter__(self):
+        if self._sent and not self.replayable:
+            raise ValueError('The body of %r can only be sent once' % type(self.source).__name__)
+        self._sent = True
+
+        if not self.compress:
+            for chunk in self._raw():
+                yield chunk
+            return
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in self._raw():
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def __aiter__(self):
+        return self._chunks_async()
+
+    async def _chunks_async(self):
+        for chunk in self:
+            yield chunk
+
+    def peek(self):
+        """
+        Uncompressed chunks of the body read without sending it, ex. to digest it - nothing when reading would
+        consume the source
+        """
+
+        if not self._rereadable():
+            return
+        try:
+            for chunk in self._raw():
+                yield chunk
+        finally:
+            if self._start is not None:
+                self.source.seek(self._start)
+
+
+def upload(source, compress=False):
+    """
+    The Upload streaming source, ex. the path, file object or lines passed to analysis.identifiers_form
+
+    :param source: Path, open file object, iterable of lines or Upload - returned as is
+    :param compress: If true, the body is gzip-compressed while it is sent
+    :return: Upload
+    """
+
+    if isinstance(source, Upload):
+        return source
+    return Upload(source, compress=compress)
+
+
+def body_chunks(body):
+    """
+    Chunks of a prepared request body for request digests, ex. fixture_key() - an Upload digests like the same
+    bytes sent at once
+
+    :param body: requests.PreparedRequest.body - bytes, str, None or an Upload
+    :return: iterator of bytes
+    """
+
+    if isinstance(body, Upload):
+        return body.peek()
+    return iter([_encode(body)] if body else [])
+
+
+def replayable(body):
+    """
+    Whether a request body can be sent again once it was sent
+
+    :return: bool
+    """
+
+    return getattr(body, 'replayable', True)
+
+
+def _encode(data):
+    return data if isinstance(data, bytes) else data.encode('utf-8')
+
+
+def _seekable(f):
+    try:
+        return f.seekable()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return False
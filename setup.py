@@ -25,10 +25,17 @@ setup(
         'pandas>=0.24.2',
         'json5>=0.8.4',
     ],
+    extras_require={
+        'aio': ['aiohttp>=3.5'],
+        'benchmark': ['pytest-benchmark>=3.2'],
+        'tracing': ['opentelemetry-api>=1.0'],
+        'brotli': ['brotli'],
+        'orjson': ['orjson'],
+        'enrichment': ['numpy>=1.17', 'scipy>=1.0'],
+    },
     tests_require=['pytest'],
     classifiers=[
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'License :: OSI Approved :: Apache Software License',
@@ -40,5 +47,5 @@ setup(
         'Topic :: Scientific/Engineering :: Bio-Informatics'
     ],
     platforms=['any'],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
@@ -0,0 +1,27 @@
+"""
+Runs the test suite against a fixture archive instead of the live services when REACTOME2PY_FIXTURES names one,
+ex. REACTOME2PY_FIXTURES=fixtures.zip pytest. With REACTOME2PY_RECORD=1 the live responses are recorded into it.
+"""
+from reactome2py.client import ReactomeClient, set_default_client
+from reactome2py.fixtures import RecordingTransport, ReplayTransport
+from reactome2py.ratelimit import RateLimiter
+import os
+
+
+def pytest_configure(config):
+    path = os.environ.get('REACTOME2PY_FIXTURES')
+    if not path:
+        return
+
+    if os.environ.get('REACTOME2PY_RECORD'):
+        client = ReactomeClient(transport=RecordingTransport(path))
+    else:
+        client = ReactomeClient(transport=ReplayTransport(path), rate_limiter=RateLimiter({}))
+    config._reactome2py_client = client
+    set_default_client(client)
+
+
+def pytest_unconfigure(config):
+    client = getattr(config, '_reactome2py_client', None)
+    if client is not None:
+        client.close()
@@ -0,0 +1,47 @@
+from importlib import import_module
+from reactome2py.client import ReactomeClient
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.transport import LocalTransport
+import json
+import pytest
+
+
+@pytest.fixture
+def aio():
+    """
+    The asynchronous client module, skipping the test when aiohttp - of the optional aio extra - is not installed
+    """
+
+    pytest.importorskip('aiohttp')
+    return import_module('reactome2py.aio.client')
+
+
+@pytest.fixture
+def local_client(tmp_path):
+    """
+    Makes clients answering from a LocalTransport under tmp_path instead of the services, without rate limiting.
+    The clients made in one test share the transport, so responses stored for one are served to the others.
+
+    ex. client = local_client({'https://reactome.org/AnalysisService/token/T1': {'summary': {'token': 'T1'}}})
+        aclient = local_client(client_class=aio.AsyncReactomeClient, hooks=[events.append])
+    """
+
+    local = LocalTransport(str(tmp_path / 'local'))
+
+    def make(responses=None, client_class=ReactomeClient, **kwargs):
+        """
+        :param responses: Dict of url, or of (method, url), to response body - bytes, str, or anything else sent as JSON
+        :param client_class: ReactomeClient or AsyncReactomeClient
+        :param kwargs: Other arguments of the client
+        :return: client, with the transport at client.transport to store responses that need parameters
+        """
+
+        for key, content in (responses or {}).items():
+            method, url = key if isinstance(key, tuple) else ('GET', key)
+            if not isinstance(content, (bytes, str)):
+                content = json.dumps(content)
+            local.store(method, url, content)
+        kwargs.setdefault('rate_limiter', RateLimiter({}))
+        return client_class(transport=local, **kwargs)
+
+    return make
@@ -0,0 +1,192 @@
+import pytest
+
+pytest.importorskip('aiohttp')
+from reactome2py.aio import analysis, content
+from reactome2py.aio.client import AsyncReactomeClient, set_default_client
+from reactome2py.exceptions import ReactomeHTTPError
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.retry import Retry
+import asyncio
+import gc
+import gzip
+import http.server
+import json
+import requests
+import threading
+import warnings
+
+
+class FakeAsyncClient(AsyncReactomeClient):
+
+    def __init__(self, payloads, retry=None):
+        super(FakeAsyncClient, self).__init__(rate_limiter=RateLimiter({}), retry=retry)
+        self.payloads = payloads
+        self.sent = []
+
+    async def _exchange(self, request):
+        self.sent.append((request.method, request.url))
+        await asyncio.sleep(0)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Retry-After'] = '0'
+        response._content = self.payloads.get(request.url.split('?')[0])
+        if response._content is None:
+            response.status_code = 503
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        return response
+
+
+def test_awaitable_analysis():
+    url = 'https://reactome.org/AnalysisService/token/T1'
+    client = FakeAsyncClient({url: json.dumps({'summary': {'token': 'T1'}}).encode()})
+    previous = set_default_client(client)
+    try:
+        result = asyncio.run(analysis.token('T1', page_size=5))
+    finally:
+        set_default_client(previous)
+
+    assert result == {'summary': {'token': 'T1'}}
+    assert client.sent[0][0] == 'GET'
+    assert 'pageSize=5' in client.sent[0][1]
+
+
+def test_bound_analysis_gather():
+    url = 'https://reactome.org/AnalysisService/database/version'
+    client = FakeAsyncClient({url: b'73'})
+
+    async def run():
+        return await asyncio.gather(*[client.analysis.db_version() for _ in range(10)])
+
+    assert asyncio.run(run()) == ['73'] * 10
+    assert len(client.sent) == 1
+
+
+def test_content_gather_keeps_input_order():
+    base = 'https://reactome.org/ContentService/data/query/%s'
+    ids = ['R-HSA-3', 'R-HSA-1', 'R-HSA-2', 'R-HSA-1']
+    client = FakeAsyncClient(dict((base % id, json.dumps({'stId': id}).encode()) for id in ids))
+    previous = set_default_client(client)
+    try:
+        result = asyncio.run(content.gather(content.query_id, ids))
+    finally:
+        set_default_client(previous)
+
+    assert [entry['stId'] for entry in result] == ids
+    assert len(client.sent) == 3
+
+
+def test_retry_then_typed_error():
+    client = FakeAsyncClient({}, retry=Retry(total=2, backoff_factor=0.01))
+    with pytest.raises(ReactomeHTTPError) as error:
+        asyncio.run(client.analysis.token('T1'))
+    assert error.value.status_code == 503
+    assert len(client.sent) == 3
+
+
+class VersionHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'73')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.filterwarnings('error::pytest.PytestUnraisableExceptionWarning')
+def test_session_of_finished_loop_is_closed():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), VersionHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    client = AsyncReactomeClient(rate_limiter=RateLimiter({}),
+                                 base_urls={'analysis': 'http://127.0.0.1:%s' % httpd.server_address[1]})
+    try:
+        assert asyncio.run(client.analysis.db_version()) == '73'
+        first = client._session
+
+        async def again():
+            try:
+                return await client.analysis.db_version()
+            finally:
+                await client.close()
+
+        assert first.closed
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert asyncio.run(again()) == '73'
+        assert first is not client._session
+        # a socket left open by the first loop would warn as it is collected
+        gc.collect()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+class ResultHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Sends a gzipped analysis result in two parts, the second one only once the client read the first pathway
+    """
+
+    protocol_version = 'HTTP/1.1'
+    proceed = None
+
+    def do_GET(self):
+        result = {'summary': {'token': 'T1'}, 'pathways': [{'stId': 'R-HSA-%d' % i, 'name': 'p'} for i in range(2000)]}
+        body = gzip.compress(json.dumps(result).encode('utf-8'))
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for part in (body[:len(body) // 4], body[len(body) // 4:]):
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(part), part))
+            self.wfile.flush()
+            ResultHandler.proceed.wait(5)
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_result_pathways_streams():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ResultHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    ResultHandler.proceed = threading.Event()
+    client = AsyncReactomeClient(rate_limiter=RateLimiter({}),
+                                 base_urls={'analysis': 'http://127.0.0.1:%s/AnalysisService' % httpd.server_address[1]})
+
+    async def run():
+        try:
+            pathways = client.analysis.result_pathways('T1', fields=['stId'], header=True, chunk_size=1024)
+            assert await pathways.__anext__() == {'summary': {'token': 'T1'}}
+            assert await pathways.__anext__() == {'stId': 'R-HSA-0'}
+            received_early = not ResultHandler.proceed.is_set()
+            ResultHandler.proceed.set()
+            rest = [pathway['stId'] async for pathway in pathways]
+            return received_early, rest
+        finally:
+            await client.close()
+
+    try:
+        received_early, rest = asyncio.run(run())
+    finally:
+        ResultHandler.proceed.set()
+        httpd.shutdown()
+        httpd.server_close()
+    assert received_early
+    assert rest == ['R-HSA-%d' % i for i in range(1, 2000)]
+
+
+def test_result_pathways_default_client(local_client):
+    result = {'summary': {'token': 'T1'}, 'pathways': [{'stId': 'R-HSA-%d' % i} for i in range(10)]}
+    previous = set_default_client(local_client({'https://reactome.org/AnalysisService/download/T1/result.json': result},
+                                               client_class=AsyncReactomeClient))
+
+    async def run():
+        return [pathway async for pathway in analysis.result_pathways('T1', gzip=False, chunk_size=7)]
+
+    try:
+        assert asyncio.run(run()) == result['pathways']
+    finally:
+        set_default_client(previous)
@@ -0,0 +1,114 @@
+from reactome2py import analysis
+from reactome2py.client import ReactomeClient, using
+import json
+import pytest
+import threading
+import time
+
+
+class FakeResponse(object):
+    status_code = 200
+
+    def __init__(self, token):
+        self.content = json.dumps({'summary': {'token': token, 'type': 'OVERREPRESENTATION'}}).encode('utf-8')
+
+
+class AnalysisClient(ReactomeClient):
+    """
+    Answers each identifiers analysis with a token naming the first identifier, slower for identifiers named SLOW
+    """
+
+    def __init__(self, fail=()):
+        super(AnalysisClient, self).__init__()
+        self.fail = fail
+        self.posted = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        data = kwargs['data']
+        with self.lock:
+            self.posted.append(data)
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            time.sleep(0.2 if data.startswith('SLOW') else 0.02)
+            if data in self.fail:
+                raise RuntimeError(data)
+            return FakeResponse('T-' + data.split('\n')[0].split(',')[0])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_batch_streams_completions():
+    client = AnalysisClient()
+    lists = {'a': 'SLOW', 'b': ['EGF', 'EGFR'], 'c': 'TP53'}
+
+    with using(client):
+        results = list(analysis.batch_identifiers(lists, workers=3))
+
+    assert results[-1].key == 'a'
+    assert sorted((result.key, result.position, result.token) for result in results) == [
+        ('a', 0, 'T-SLOW'), ('b', 1, 'T-EGF'), ('c', 2, 'T-TP53')]
+    assert results[-1].summary == {'token': 'T-SLOW', 'type': 'OVERREPRESENTATION'}
+    assert 'EGF\nEGFR' in client.posted
+
+
+def test_batch_bounds_concurrency():
+    client = AnalysisClient()
+
+    with using(client):
+        results = list(analysis.batch_identifiers(('G%d' % i for i in range(12)), workers=2))
+
+    assert sorted(result.position for result in results) == list(range(12))
+    assert client.most_in_flight == 2
+
+
+def test_batch_resumes_from_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / 'run.jsonl')
+    lists = dict(('k%d' % i, 'G%d' % i) for i in range(6))
+    client = AnalysisClient(fail=('G4',))
+
+    with using(client):
+        batch = analysis.batch_identifiers(lists, workers=1, checkpoint=checkpoint)
+        first = [next(batch) for _ in range(3)]
+        batch.close()
+    assert [result.key for result in first] == ['k0', 'k1', 'k2']
+
+    with open(checkpoint, 'a') as f:
+        f.write('{"key": "k5", "tok')
+
+    client = AnalysisClient(fail=('G4',))
+    with using(client):
+        results = list(analysis.batch_identifiers(lists, workers=2, checkpoint=checkpoint))
+
+    assert sorted(client.posted) == ['G3', 'G4', 'G5']
+    assert [result.key for result in results[:3]] == ['k0', 'k1', 'k2']
+    assert dict((result.key, result.token) for result in results) == {
+        'k0': 'T-G0', 'k1': 'T-G1', 'k2': 'T-G2', 'k3': 'T-G3', 'k4': None, 'k5': 'T-G5'}
+    assert isinstance([result for result in results if result.key == 'k4'][0].error, RuntimeError)
+
+    client = AnalysisClient()
+    with using(client):
+        results = list(analysis.batch_identifiers(lists, checkpoint=checkpoint))
+    assert client.posted == ['G4']
+    assert all(result.error is None for result in results)
+
+
+def test_batch_checkpoint_matches_ids_and_params(tmp_path):
+    checkpoint = str(tmp_path / 'run.jsonl')
+    client = AnalysisClient()
+
+    with using(client):
+        list(analysis.batch_identifiers({('a', 1): 'G1', 'b': 'G2'}, checkpoint=checkpoint))
+        results = list(analysis.batch_identifiers({('a', 1): 'G1', 'b': 'G3'}, checkpoint=checkpoint))
+        list(analysis.batch_identifiers({('a', 1): 'G1', 'b': 'G3'}, checkpoint=checkpoint, species='9606'))
+
+    assert client.posted == ['G1', 'G2', 'G3', 'G1', 'G3']
+    assert dict((result.key, result.token) for result in results) == {('a', 1): 'T-G1', 'b': 'T-G3'}
+
+    with using(client), pytest.raises(TypeError):
+        analysis.batch_identifiers({frozenset(['a']): 'G4'}, checkpoint=checkpoint)
+    assert client.posted[-1] == 'G3'
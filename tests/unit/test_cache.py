@@ -0,0 +1,91 @@
+from reactome2py.cache import DiskCache, MemoryCache, VERSION_URL
+from reactome2py.client import ReactomeClient
+import json
+import requests
+
+
+class FakeClient(ReactomeClient):
+
+    def __init__(self, cache):
+        super(FakeClient, self).__init__(cache=cache)
+        self.version = '73'
+        self.sent = []
+
+    def _send(self, method, url, idempotent=None, **kwargs):
+        self.sent.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        body = self.version if url == VERSION_URL else json.dumps({'url': url, 'version': self.version})
+        response._content = body.encode()
+        return response
+
+
+def test_content_get_cached(tmp_path):
+    client = FakeClient(DiskCache(str(tmp_path / 'cache.sqlite')))
+    first = client.content.query_id('R-HSA-60140')
+    second = client.content.query_id('R-HSA-60140')
+    assert first == second
+    assert client.sent.count('https://reactome.org/ContentService/data/query/R-HSA-60140') == 1
+
+
+def test_analysis_not_cached(tmp_path):
+    client = FakeClient(DiskCache(str(tmp_path / 'cache.sqlite')))
+    client.analysis.token_resources('T1')
+    client.analysis.token_resources('T1')
+    assert client.sent == ['https://reactome.org/AnalysisService/token/T1/resources'] * 2
+
+
+def test_new_release_invalidates(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    client = FakeClient(DiskCache(path, version_ttl=0))
+    assert client.content.species()['version'] == '73'
+    client.version = '74'
+    assert client.content.species()['version'] == '74'
+
+    reopened = FakeClient(DiskCache(path))
+    reopened.version = '74'
+    assert reopened.content.species()['version'] == '74'
+    assert reopened.sent == [VERSION_URL]
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = 'https://reactome.org/ContentService/data/query/x'
+    response._content = body
+    return response
+
+
+def test_memory_cache_lru_budget():
+    cache = MemoryCache(max_bytes=300, ttl=None)
+    for name in 'abc':
+        cache.set(name, make_response(b'x' * 99))
+    assert cache.get('a') is not None
+    cache.set('d', make_response(b'x' * 99))
+
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.entries == 3
+    assert info.bytes <= 300
+    assert cache.get('b') is None
+    assert cache.get('a').content == b'x' * 99
+
+
+def test_memory_cache_ttl():
+    cache = MemoryCache(ttl=-1)
+    cache.set('a', make_response(b'{}'))
+    assert cache.get('a') is None
+    assert cache.cache_info().expirations == 1
+
+
+def test_client_memo(tmp_path):
+    client = FakeClient(DiskCache(str(tmp_path / 'cache.sqlite')))
+    client.memo = MemoryCache()
+    result = client.analysis.token_resources('T1')
+    result['mutated'] = True
+    assert client.analysis.token_resources('T1') == {'url': 'https://reactome.org/AnalysisService/token/T1/resources',
+                                                      'version': '73'}
+    assert client.cache_info().hits == 1
+    assert client.sent == ['https://reactome.org/AnalysisService/token/T1/resources']
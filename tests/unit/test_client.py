@@ -0,0 +1,52 @@
+from reactome2py import client as reactome_client
+from reactome2py.client import ReactomeClient, get_client, using
+import json
+
+
+class FakeResponse(object):
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.content = json.dumps(payload).encode('utf-8')
+
+    def json(self):
+        return self.payload
+
+
+class RecordingClient(ReactomeClient):
+
+    def __init__(self):
+        super(RecordingClient, self).__init__()
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return FakeResponse({'url': url})
+
+
+def test_session_per_host():
+    client = ReactomeClient()
+    transport = client.transport
+    assert transport.session('https://reactome.org/ContentService/a') is transport.session('https://reactome.org/AnalysisService/b')
+    assert transport.session('https://reactome.org/a') is not transport.session('http://cpws.reactome.org/a')
+    client.close()
+
+
+def test_default_client():
+    assert get_client() is reactome_client.default_client()
+
+
+def test_using():
+    client = RecordingClient()
+    with using(client):
+        assert get_client() is client
+    assert get_client() is not client
+
+
+def test_bound_service():
+    client = RecordingClient()
+    result = client.content.discover('R-HSA-446203')
+    assert result == {'url': 'https://reactome.org/ContentService/data/discover/R-HSA-446203'}
+    assert client.calls == [('GET', 'https://reactome.org/ContentService/data/discover/R-HSA-446203')]
+    assert get_client() is not client
@@ -0,0 +1,71 @@
+from reactome2py import analysis
+from reactome2py.client import ReactomeClient, using
+from reactome2py.ratelimit import RateLimiter
+import gzip
+import http.server
+import json
+import threading
+import pytest
+
+RESULT = {'summary': {'token': 'T1'}, 'pathways': [{'stId': 'R-HSA-%d' % i} for i in range(1000)]}
+
+CSV = 'Pathway identifier,Pathway name\nR-HSA-1,One\nR-HSA-2,Two\n'
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    encodings = []
+
+    def do_GET(self):
+        accepted = self.headers.get('Accept-Encoding', '')
+        self.encodings.append(accepted)
+        body = CSV.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        if 'gzip' in accepted:
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client(local_client):
+    return local_client({'https://reactome.org/AnalysisService/download/T1/result.json.gzip':
+                         gzip.compress(json.dumps(RESULT).encode('utf-8'))})
+
+
+def test_result2json_gzip(client, tmp_path):
+    with using(client):
+        assert analysis.result2json('T1', gzip=True) == RESULT
+        analysis.result2json('T1', path=str(tmp_path) + '/', file='result.json', save=True)
+        analysis.result2json('T1', path=str(tmp_path) + '/', file='result.json.gz', save=True, gzip=True)
+
+    with open(str(tmp_path / 'result.json')) as f:
+        assert json.load(f) == RESULT
+    with gzip.open(str(tmp_path / 'result.json.gz')) as f:
+        assert json.loads(f.read().decode('utf-8')) == RESULT
+
+
+def test_csv_negotiates_compression():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = 'http://127.0.0.1:%s/AnalysisService' % httpd.server_address[1]
+    try:
+        with ReactomeClient(rate_limiter=RateLimiter({}), base_urls={'analysis': base}) as client:
+            df = client.analysis.pathway2df('T1')
+    finally:
+        httpd.shutdown()
+    assert list(df['Pathway identifier']) == ['R-HSA-1', 'R-HSA-2']
+    assert 'gzip' in Handler.encodings[0]
+
+
+def test_result_pathways(client):
+    with using(client):
+        pathways = analysis.result_pathways('T1', fields=['stId'], header=True)
+        assert next(pathways) == {'summary': {'token': 'T1'}}
+        assert list(pathways) == RESULT['pathways']
+        assert next(analysis.result_pathways('T1')) == RESULT['pathways'][0]
@@ -0,0 +1,153 @@
+import numpy
+import pytest
+
+stats = pytest.importorskip('scipy.stats')
+from reactome2py import enrichment
+from reactome2py.client import using
+from reactome2py.enrichment import GeneSets, benjamini_hochberg, hypergeometric
+import io
+import zipfile
+
+RELATIONS = [
+    {'name': 'Signaling by EGFR', 'stId': 'R-HSA-177929', 'genes': ['EGF', 'EGFR', 'GRB2', 'SOS1', 'egfr']},
+    {'name': 'Apoptosis', 'stId': 'R-HSA-109581', 'genes': ['TP53', 'BAX', 'CASP3', 'CASP9']},
+    {'name': 'Cell Cycle', 'stId': 'R-HSA-1640170', 'genes': ['TP53', 'CDK1', 'CCNB1', 'GRB2', 'MYC', 'RB1']},
+] + [{'name': 'Filler %d' % i, 'stId': 'R-HSA-%d' % i, 'genes': ['F%d_%d' % (i, j) for j in range(20)]}
+     for i in range(10)]
+
+
+def test_enrich_matches_fisher():
+    gene_sets = GeneSets(RELATIONS)
+    result = gene_sets.enrich('egf,EGFR,GRB2,TP53,NOTAGENE')
+
+    assert result['identifiersNotFound'] == 1
+    assert result['pathwaysFound'] == 3
+    assert [pathway['stId'] for pathway in result['pathways']][0] == 'R-HSA-177929'
+
+    universe = gene_sets.universe
+    for pathway in result['pathways']:
+        entities = pathway['entities']
+        table = [[entities['found'], entities['total'] - entities['found']],
+                 [4 - entities['found'], universe - entities['total'] - 4 + entities['found']]]
+        assert entities['pValue'] == pytest.approx(stats.fisher_exact(table, alternative='greater')[1])
+    egfr = result['pathways'][0]['entities']
+    assert (egfr['total'], egfr['found'], egfr['ratio']) == (4, 3, 4.0 / universe)
+
+
+def test_enrich_filters():
+    gene_sets = GeneSets(RELATIONS, universe=['EGF', 'EGFR', 'TP53', 'BAX', 'CDK1', 'MYC'])
+    assert gene_sets.universe == 6
+
+    result = gene_sets.enrich(['EGF', 'TP53', 'GRB2'], min_entities=3, sort_by='NAME')
+    assert result['identifiersNotFound'] == 1
+    assert [pathway['name'] for pathway in result['pathways']] == ['Cell Cycle']
+    assert result['pathwaysFound'] == 3
+    assert gene_sets.enrich('EGF', page_size=1, page=2)['pathways'] == []
+
+
+def test_benjamini_hochberg():
+    p_values = numpy.array([[0.01, 0.04, 0.03, numpy.nan], [0.5, 0.01, 0.02, 0.9]])
+    fdr = benjamini_hochberg(p_values)
+
+    assert fdr[0, :3] == pytest.approx([0.03, 0.04, 0.04])
+    assert numpy.isnan(fdr[0, 3])
+    assert fdr[1] == pytest.approx([2.0 / 3, 0.04, 0.04, 0.9])
+
+
+def test_from_reactome(local_client):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as z:
+        z.writestr('ReactomePathways.gmt', ''.join('%s\t%s\t%s\n' % (relation['name'], relation['stId'],
+                                                                     '\t'.join(relation['genes']))
+                                                   for relation in RELATIONS))
+    client = local_client({'https://reactome.org/download/current/ReactomePathways.gmt.zip': archive.getvalue()})
+
+    with using(client):
+        gene_sets = GeneSets.from_reactome()
+    assert len(gene_sets) == len(RELATIONS)
+    assert gene_sets.enrich('EGF,EGFR')['pathways'][0]['name'] == 'Signaling by EGFR'
+
+
+def test_enrich_many_matches_enrich():
+    gene_sets = GeneSets(RELATIONS)
+    lists = {'egfr': 'EGF,EGFR,GRB2', 'apoptosis': ['TP53', 'BAX', 'CASP3', 'F1_1', 'NOTAGENE'], 'empty': []}
+    result = gene_sets.enrich_many(lists)
+
+    assert list(result.p_values.index) == ['egfr', 'apoptosis', 'empty']
+    assert list(result.p_values.columns) == gene_sets.st_ids
+    assert list(result.not_found) == [0, 1, 0]
+    assert (result.p_values.loc['empty'] == 1).all()
+
+    for name, ids in lists.items():
+        for pathway in gene_sets.enrich(ids)['pathways']:
+            entities = pathway['entities']
+            assert result.found.loc[name, pathway['stId']] == entities['found']
+            assert result.p_values.loc[name, pathway['stId']] == pytest.approx(entities['pValue'])
+            assert result.fdr.loc[name, pathway['stId']] == pytest.approx(entities['fdr'])
+    assert result.p_values.loc['egfr', 'R-HSA-109581'] == 1
+
+
+def test_hypergeometric_matches_scipy():
+    rng = numpy.random.RandomState(0)
+    sizes, drawn = rng.randint(0, 201, 5000), rng.randint(0, 201, 5000)
+    found = rng.randint(-1, 60, 5000)
+    assert hypergeometric(found, 200, sizes, drawn) == pytest.approx(stats.hypergeom.sf(found - 1, 200, sizes, drawn),
+                                                                    abs=1e-12)
+    assert list(GeneSets(RELATIONS).enrich_many([['EGF']]).p_values.index) == [0]
+
+
+def test_empirical():
+    gene_sets = GeneSets(RELATIONS)
+    rows, _ = gene_sets.rows('EGF,EGFR,GRB2')
+    hits = numpy.flatnonzero(gene_sets.overlaps(rows))
+    p_values, done = gene_sets.empirical(rows, permutations=4000, seed=0, block=500)
+
+    analytic = hypergeometric(gene_sets.overlaps(rows)[hits], gene_sets.universe, gene_sets.sizes[hits], 3)
+    egfr = gene_sets.st_ids.index('R-HSA-177929')
+    assert p_values[list(hits).index(egfr)] == 1 / 4001.0
+    assert done[list(hits).index(egfr)] == 4000
+    assert done.min() < 4000
+    assert numpy.allclose(p_values[done < 4000], analytic[done < 4000], rtol=0.5)
+
+    again, _ = gene_sets.empirical(rows, permutations=4000, seed=0, block=500)
+    assert (again == p_values).all()
+
+
+def test_empirical_weights_and_processes():
+    gene_sets = GeneSets(RELATIONS)
+    weights = dict((gene, 1) for gene in ['EGF', 'EGFR', 'GRB2', 'SOS1'])
+    result = gene_sets.enrich('EGF,EGFR', permutations=200, weights=weights, seed=0)
+    egfr = [pathway for pathway in result['pathways'] if pathway['stId'] == 'R-HSA-177929'][0]
+    assert egfr['entities']['pValue'] == 1
+
+    with pytest.raises(ValueError):
+        gene_sets.enrich('EGF,EGFR,TP53,BAX,CASP3', permutations=10, weights=weights)
+
+    rows, _ = gene_sets.rows('EGF,EGFR,GRB2')
+    p_values, done = gene_sets.empirical(rows, permutations=1000, processes=2, seed=0, block=100)
+    assert len(p_values) == len(numpy.flatnonzero(gene_sets.overlaps(rows)))
+    assert done.max() == 1000
+
+
+def test_empirical_one_block_per_cpu(monkeypatch):
+    batches = []
+
+    class RecordingPool(enrichment.ProcessPoolExecutor):
+
+        def __init__(self, max_workers, **kwargs):
+            batches.append(max_workers)
+            super(RecordingPool, self).__init__(max_workers, **kwargs)
+
+        def map(self, fn, tasks):
+            tasks = list(tasks)
+            batches.append(len(tasks))
+            return super(RecordingPool, self).map(fn, tasks)
+
+    monkeypatch.setattr(enrichment, 'ProcessPoolExecutor', RecordingPool)
+    monkeypatch.setattr(enrichment.os, 'cpu_count', lambda: 3)
+    gene_sets = GeneSets(RELATIONS)
+    rows, _ = gene_sets.rows('EGF,EGFR,GRB2')
+    p_values, done = gene_sets.empirical(rows, permutations=600, processes=None, seed=0, block=100, stop_after=10 ** 6)
+
+    assert batches == [3, 3, 3]
+    assert done.max() == 600
@@ -0,0 +1,63 @@
+from reactome2py import analysis
+from reactome2py.client import ReactomeClient, using
+from reactome2py.expression import expression_chunks, expression_payload
+from reactome2py.upload import Upload
+import json
+import numpy
+import pandas
+import pytest
+
+
+class FakeResponse(object):
+    status_code = 200
+    content = json.dumps({'summary': {'token': 'T1'}}).encode('utf-8')
+
+
+class PostingClient(ReactomeClient):
+
+    def __init__(self):
+        super(PostingClient, self).__init__()
+        self.posted = []
+
+    def request(self, method, url, **kwargs):
+        data = kwargs.get('data')
+        if isinstance(data, Upload):
+            data = b''.join(data).decode('utf-8')
+        self.posted.append((url, data))
+        return FakeResponse()
+
+
+def test_payload_data_frame():
+    df = pandas.DataFrame({'s1': [1.0, 0.25], 's2': [3, 1234567]}, index=pandas.Index(['TP53', 'EGFR'], name='gene'))
+    assert expression_payload(df) == '#gene\ts1\ts2\nTP53\t1\t3\nEGFR\t0.25\t1.23457e+06\n'
+
+
+def test_payload_array():
+    values = numpy.arange(6).reshape(3, 2) / 4.0
+    payload = expression_payload(values, index=['A', 'B', 'C'], precision=2)
+    assert payload == '#id\tsample1\tsample2\nA\t0\t0.25\nB\t0.5\t0.75\nC\t1\t1.2\n'
+
+    chunks = list(expression_chunks(values, index=['A', 'B', 'C'], block_rows=2))
+    assert len(chunks) == 3
+    assert ''.join(chunks) == expression_payload(values, index=['A', 'B', 'C'])
+
+
+def test_payload_errors():
+    with pytest.raises(ValueError):
+        expression_payload(numpy.zeros((2, 2)))
+    with pytest.raises(ValueError):
+        expression_payload(numpy.zeros((2, 2)), index=['A'])
+
+
+def test_identifiers_expression():
+    df = pandas.DataFrame({'s1': [1.5, 2.5]}, index=['TP53', 'EGFR'])
+    client = PostingClient()
+
+    with using(client):
+        assert analysis.identifiers_expression(df, page_size=5) == {'summary': {'token': 'T1'}}
+        analysis.identifiers_expression(df, stream=True)
+
+    assert client.posted == [
+        ('https://reactome.org/AnalysisService/identifiers/', '#id\ts1\nTP53\t1.5\nEGFR\t2.5\n'),
+        ('https://reactome.org/AnalysisService/identifiers/form/', '#id\ts1\nTP53\t1.5\nEGFR\t2.5\n'),
+    ]
@@ -0,0 +1,79 @@
+from reactome2py.client import ReactomeClient
+from reactome2py.fixtures import MissingFixtureError, RecordingTransport, ReplayTransport
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.retry import Retry
+from reactome2py.transport import LocalTransport
+import asyncio
+import json
+import time
+import pytest
+
+
+@pytest.fixture
+def archive(tmp_path):
+    local = LocalTransport(str(tmp_path / 'local'))
+    local.store('GET', 'https://reactome.org/ContentService/data/query/R-HSA-60140', json.dumps({'stId': 'R-HSA-60140'}))
+    local.store('POST', 'https://reactome.org/AnalysisService/identifiers/', json.dumps({'summary': {'token': 'T1'}}))
+
+    path = str(tmp_path / 'fixtures.zip')
+    client = ReactomeClient(transport=RecordingTransport(path, transport=local), rate_limiter=RateLimiter({}))
+    client.content.query_id('R-HSA-60140')
+    client.analysis.identifiers(ids='EGFR,STAT')
+    client.close()
+    return path
+
+
+class RefusingTransport(LocalTransport):
+    """
+    Answers the first request with 503 Service Unavailable, the next ones from the stored responses
+    """
+
+    refused = False
+
+    def send(self, method, url, **kwargs):
+        response = super(RefusingTransport, self).send(method, url, **kwargs)
+        if not self.refused:
+            self.refused = True
+            response.status_code = 503
+        return response
+
+
+def test_replay(archive):
+    replay = ReplayTransport(archive)
+    assert len(replay) == 2
+    client = ReactomeClient(transport=replay, rate_limiter=RateLimiter({}))
+    assert client.content.query_id('R-HSA-60140') == {'stId': 'R-HSA-60140'}
+    assert client.analysis.identifiers(ids='EGFR,STAT') == {'summary': {'token': 'T1'}}
+    with pytest.raises(MissingFixtureError):
+        client.analysis.identifiers(ids='TP53')
+    client.close()
+
+
+def test_replay_latency(archive):
+    client = ReactomeClient(transport=ReplayTransport(archive, latency=0.05), rate_limiter=RateLimiter({}))
+    start = time.monotonic()
+    client.content.query_id('R-HSA-60140')
+    assert time.monotonic() - start >= 0.05
+    client.close()
+
+
+def test_replay_async(archive, aio):
+    client = aio.AsyncReactomeClient(transport=ReplayTransport(archive), rate_limiter=RateLimiter({}))
+    result = asyncio.run(client.analysis.identifiers(ids='EGFR,STAT'))
+    assert result == {'summary': {'token': 'T1'}}
+
+
+def test_transient_error_not_recorded(tmp_path):
+    local = RefusingTransport(str(tmp_path / 'local'))
+    local.store('GET', 'https://reactome.org/ContentService/data/query/R-HSA-60140', json.dumps({'stId': 'R-HSA-60140'}))
+    path = str(tmp_path / 'fixtures.zip')
+    client = ReactomeClient(transport=RecordingTransport(path, transport=local), rate_limiter=RateLimiter({}),
+                            retry=Retry(backoff_factor=0))
+    assert client.content.query_id('R-HSA-60140') == {'stId': 'R-HSA-60140'}
+    client.close()
+    assert local.refused
+
+    replay = ReplayTransport(path)
+    assert len(replay) == 1
+    response = replay.send('GET', 'https://reactome.org/ContentService/data/query/R-HSA-60140')
+    assert response.status_code == 200 and response.json() == {'stId': 'R-HSA-60140'}
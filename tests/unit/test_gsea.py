@@ -0,0 +1,96 @@
+import numpy
+import pytest
+
+pytest.importorskip('scipy.sparse')
+from reactome2py.enrichment import GeneSets
+from reactome2py.gsea import phenotype, prerank, signal_to_noise
+import pandas
+
+RELATIONS = [
+    {'name': 'Top', 'stId': 'R-HSA-1', 'genes': ['G%d' % i for i in range(0, 40, 2)]},
+    {'name': 'Bottom', 'stId': 'R-HSA-2', 'genes': ['G%d' % i for i in range(180, 200)]},
+    {'name': 'Spread', 'stId': 'R-HSA-3', 'genes': ['G%d' % i for i in range(5, 200, 10)]},
+    {'name': 'Small', 'stId': 'R-HSA-4', 'genes': ['G1', 'G2']},
+]
+
+
+def running_sum_es(ranking, genes, weight=1):
+    """
+    Enrichment score walking down the ranked list one gene at a time
+    """
+
+    hits = numpy.array([gene in genes for gene in ranking.index])
+    steps = numpy.abs(ranking.to_numpy()) ** weight
+    hit = numpy.cumsum(numpy.where(hits, steps, 0)) / steps[hits].sum()
+    miss = numpy.cumsum(~hits) / float((~hits).sum())
+    walk = hit - miss
+    return walk[numpy.argmax(numpy.abs(walk))]
+
+
+def test_prerank_scores_match_running_sum():
+    rng = numpy.random.default_rng(1)
+    ranking = pandas.Series(numpy.sort(rng.normal(size=200))[::-1], index=['G%d' % i for i in range(200)])
+    gene_sets = GeneSets(RELATIONS)
+
+    df = prerank(gene_sets, ranking.sample(frac=1, random_state=0), permutations=200, seed=0)
+    assert list(df.columns[:9]) == ['Pathway identifier', 'Pathway name', '#Entities found', '#Entities total',
+                                    'Entities ratio', 'Entities pValue', 'Entities FDR', 'Species identifier',
+                                    'Species name']
+    assert set(df['Pathway identifier']) == {'R-HSA-1', 'R-HSA-2', 'R-HSA-3'}
+
+    df = df.set_index('Pathway identifier')
+    for relation in RELATIONS[:3]:
+        assert df.loc[relation['stId'], 'ES'] == pytest.approx(running_sum_es(ranking, relation['genes']))
+    assert df.loc['R-HSA-1', 'NES'] > 1 and df.loc['R-HSA-2', 'NES'] < -1
+    assert df.loc['R-HSA-1', 'Entities pValue'] < 0.05 and df.loc['R-HSA-2', 'Entities pValue'] < 0.05
+    assert df.loc['R-HSA-3', 'Entities FDR'] > 0.05
+    assert df.loc['R-HSA-1', 'Leading edge'].split(';')[:2] == ['G0', 'G2']
+    assert df.loc['R-HSA-2', 'Leading edge'].split(';')[0] == 'G199'
+    assert df.loc['R-HSA-3', 'Submitted entities found'].split(';') == RELATIONS[2]['genes']
+    assert len(df.loc['R-HSA-3', 'Leading edge'].split(';')) < 20
+
+
+def test_prerank_classic_weight_and_processes():
+    rng = numpy.random.default_rng(2)
+    ranking = dict(('G%d' % i, value) for i, value in enumerate(numpy.sort(rng.normal(size=200))[::-1]))
+    gene_sets = GeneSets(RELATIONS)
+
+    serial = prerank(gene_sets, ranking, permutations=60, weight=0, seed=3, block=20)
+    parallel = prerank(gene_sets, ranking, permutations=60, weight=0, seed=3, block=20, processes=2)
+    pandas.testing.assert_frame_equal(serial, parallel)
+    es = serial.set_index('Pathway identifier')['ES']
+    assert es['R-HSA-1'] == pytest.approx(running_sum_es(pandas.Series(ranking), RELATIONS[0]['genes'], weight=0))
+
+
+def test_phenotype():
+    rng = numpy.random.default_rng(4)
+    expression = pandas.DataFrame(rng.normal(size=(200, 8)), index=['G%d' % i for i in range(200)])
+    expression.iloc[0:40:2, :4] += 3
+    classes = ['tumor'] * 4 + ['normal'] * 4
+
+    df = phenotype(GeneSets(RELATIONS), expression, classes, permutations=70, seed=5).set_index('Pathway identifier')
+    assert df.loc['R-HSA-1', 'NES'] > 1
+    assert df.loc['R-HSA-1', 'Entities pValue'] < 0.05
+
+    with pytest.raises(ValueError):
+        phenotype(GeneSets(RELATIONS), expression, ['tumor'] * 8)
+
+
+def test_phenotype_leading_edge():
+    rng = numpy.random.default_rng(6)
+    expression = pandas.DataFrame(rng.normal(size=(200, 8)), index=['G%d' % i for i in range(200)])
+    expression.iloc[0:40:2, :4] += 5
+    expression = expression.sample(frac=1, random_state=1)
+    classes = ['tumor'] * 4 + ['normal'] * 4
+
+    df = phenotype(GeneSets(RELATIONS), expression, classes, permutations=20, seed=7).set_index('Pathway identifier')
+    edge = df.loc['R-HSA-1', 'Leading edge'].split(';')
+    assert df.loc['R-HSA-1', 'ES'] == pytest.approx(1)
+    assert set(edge) == set(RELATIONS[0]['genes'])
+
+
+def test_signal_to_noise():
+    values = numpy.array([[1.0, 3.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    reference = numpy.array([[True], [True], [False], [False]])
+    std = numpy.std([1.0, 3.0], ddof=1)
+    assert signal_to_noise(values, reference)[:, 0] == pytest.approx([2 / (std + 0.2), 0])
@@ -0,0 +1,52 @@
+from reactome2py.cache import MemoryCache
+from reactome2py.exceptions import ReactomeNotFoundError
+from reactome2py.instrument import Event, LatencyHistogram
+import asyncio
+import json
+import pytest
+
+
+RESPONSES = {'https://reactome.org/ContentService/data/query/R-HSA-60140': {'stId': 'R-HSA-60140'},
+             'https://reactome.org/AnalysisService/token/T1': {'summary': {'token': 'T1'}}}
+
+
+def test_events(local_client):
+    events = []
+    client = local_client(RESPONSES, memo=MemoryCache(), hooks=[events.append])
+    client.content.query_id('R-HSA-60140')
+    client.content.query_id('R-HSA-60140')
+    with pytest.raises(ReactomeNotFoundError):
+        client.content.query_id('R-HSA-0')
+    client.get('https://reactome.org/AnalysisService/token/T1')
+
+    first, second, missing, direct = events
+    assert first.endpoint == 'content.query_id'
+    assert first.url_template == 'https://reactome.org/ContentService/data/query/{id}'
+    assert (first.status, first.cache, first.retries, first.error) == (200, 'miss', 0, None)
+    assert first.bytes_received == len(json.dumps({'stId': 'R-HSA-60140'}))
+    assert first.decode >= 0 and first.total >= first.elapsed
+    assert second.cache == 'hit'
+    assert missing.status == 404 and isinstance(missing.error, ReactomeNotFoundError)
+    assert direct.endpoint is None and direct.decode is None
+
+
+def test_async_events(local_client, aio):
+    events = []
+    client = local_client(RESPONSES, client_class=aio.AsyncReactomeClient, hooks=[events.append])
+    asyncio.run(client.analysis.token('T1'))
+    event, = events
+    assert event.endpoint == 'analysis.token'
+    assert event.url_template == 'https://reactome.org/AnalysisService/token/{token}'
+    assert event.status == 200 and event.decode >= 0
+
+
+def test_histogram():
+    histogram = LatencyHistogram(buckets=(0.1, 1))
+    for elapsed in (0.05, 0.05, 0.5, 5):
+        histogram(Event('analysis.token', '', 'GET', '', 200, None, 0, 0, 0, None, None, elapsed, 0, elapsed, None,
+                        None, False, 0))
+    info = histogram.snapshot()['analysis.token']
+    assert (info.count, info.errors, info.max) == (4, 0, 5)
+    assert info.buckets == [(0.1, 2), (1, 3), (float('inf'), 4)]
+    assert histogram.quantile('analysis.token', 0.5) == pytest.approx(0.1)
+    assert histogram.quantile('analysis.token', 1) == 5
@@ -0,0 +1,56 @@
+from reactome2py import jsonbackend
+import asyncio
+import json
+import pytest
+
+
+@pytest.fixture
+def backend():
+    previous = jsonbackend.get_backend()
+    yield
+    jsonbackend.set_backend(previous)
+
+
+@pytest.mark.parametrize('name', jsonbackend.BACKENDS)
+def test_backends(backend, name):
+    try:
+        jsonbackend.set_backend(name)
+    except ImportError:
+        pytest.skip('%s is not installed' % name)
+    assert jsonbackend.get_backend() == name
+    assert jsonbackend.loads(b'{"stId": "R-HSA-60140", "name": "\xc3\xa9", "n": [1, 2.5]}') == \
+        {'stId': 'R-HSA-60140', 'name': '\xe9', 'n': [1, 2.5]}
+    with pytest.raises(ValueError):
+        jsonbackend.loads(b'')
+
+
+def test_unknown_backend(backend):
+    with pytest.raises(ValueError):
+        jsonbackend.set_backend('yaml')
+
+
+def test_iter_array():
+    document = {'summary': {'token': 'T"1\\', 'x': [1, {'a': ']'}]}, 'pathways': [
+        {'stId': 'R-HSA-%d' % i, 'name': 'p\\"[{,:}]" %d' % i, 'n': [i, [i]]} for i in range(20)], 'resourceSummary': []}
+    data = json.dumps(document, indent=1).encode('utf-8')
+    for size in (1, 3, 64, len(data)):
+        items = list(jsonbackend.iter_array((data[i:i + size] for i in range(0, len(data), size)), 'pathways'))
+        assert items == [{'summary': document['summary']}] + document['pathways']
+    assert list(jsonbackend.iter_array([b'{"pathways": []}'], 'pathways')) == [{}]
+    with pytest.raises(ValueError):
+        list(jsonbackend.iter_array([b'{"pathways": [{"a": 1}'], 'pathways'))
+
+
+def test_aiter_array():
+    document = {'summary': {'n': 12}, 'pathways': [{'stId': 'R-HSA-%d' % i} for i in range(5)] + [7, 12345]}
+    data = json.dumps(document).encode('utf-8')
+
+    async def chunks(size):
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+
+    async def run(size):
+        return [item async for item in jsonbackend.aiter_array(chunks(size), 'pathways')]
+
+    for size in (1, 5, len(data)):
+        assert asyncio.run(run(size)) == [{'summary': {'n': 12}}] + document['pathways']
@@ -0,0 +1,29 @@
+from reactome2py.ratelimit import RateLimiter, TokenBucket
+import asyncio
+import pytest
+import time
+
+
+def test_burst_then_rate():
+    bucket = TokenBucket(rate=100, burst=5)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve() == pytest.approx(0.01, abs=0.005)
+    assert bucket.reserve() == pytest.approx(0.02, abs=0.005)
+
+
+def test_per_host_budgets():
+    limiter = RateLimiter({'reactome.org': (1, 1), 'cpws.reactome.org': (50, 50)})
+    assert limiter.bucket('https://reactome.org/ContentService/data/query/R-HSA-60140').rate == 1
+    assert limiter.bucket('http://cpws.reactome.org/caBigR3WebApp2019/FIService').rate == 50
+    assert limiter.bucket('http://localhost:8080/') is None
+
+
+def test_shared_across_tasks():
+    limiter = RateLimiter({'reactome.org': (200, 1)})
+
+    async def run():
+        await asyncio.gather(*[limiter.acquire_async('https://reactome.org/') for _ in range(21)])
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.09
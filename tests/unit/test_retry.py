@@ -0,0 +1,91 @@
+from reactome2py.client import ReactomeClient
+from reactome2py.exceptions import ReactomeConnectionError, ReactomeHTTPError, ReactomeNotFoundError
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.retry import Retry
+import http.server
+import threading
+import pytest
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    statuses = []
+    hits = []
+
+    def _respond(self):
+        self.hits.append(self.command)
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    Handler.statuses, Handler.hits = [], []
+    yield 'http://127.0.0.1:%s/' % httpd.server_address[1]
+    httpd.shutdown()
+
+
+def make_client():
+    return ReactomeClient(rate_limiter=RateLimiter({}), retry=Retry(total=3, backoff_factor=0.01))
+
+
+def test_policy():
+    retry = Retry()
+    assert retry.is_retryable('GET', status=502)
+    assert not retry.is_retryable('GET', status=404)
+    assert not retry.is_retryable('POST', status=502)
+    assert retry.is_retryable('POST', status=503)
+    assert retry.is_retryable('POST', idempotent=True, status=502)
+    assert not retry.is_retryable('POST', sent=True)
+    assert retry.is_retryable('POST', sent=False)
+
+
+def test_get_retried_until_success(server):
+    Handler.statuses = [502, 503]
+    assert make_client().get(server).json() == {}
+    assert len(Handler.hits) == 3
+
+
+def test_post_not_retried_on_bad_gateway(server):
+    Handler.statuses = [502]
+    with pytest.raises(ReactomeHTTPError) as error:
+        make_client().post(server, data='EGF')
+    assert error.value.status_code == 502
+    assert len(Handler.hits) == 1
+
+
+def test_post_retried_when_refused(server):
+    Handler.statuses = [429]
+    assert make_client().post(server, data='EGF').status_code == 200
+    assert len(Handler.hits) == 2
+
+
+def test_not_found(server):
+    Handler.statuses = [404]
+    with pytest.raises(ReactomeNotFoundError):
+        make_client().get(server)
+    assert len(Handler.hits) == 1
+
+
+def test_retries_exhausted(server):
+    Handler.statuses = [503] * 5
+    with pytest.raises(ReactomeHTTPError) as error:
+        make_client().get(server)
+    assert error.value.attempts == 4
+
+
+def test_connection_error():
+    with pytest.raises(ReactomeConnectionError):
+        make_client().get('http://127.0.0.1:9/')
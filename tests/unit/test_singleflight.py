@@ -0,0 +1,99 @@
+from reactome2py.singleflight import AsyncSingleFlight, SingleFlight
+import asyncio
+import threading
+import time
+import pytest
+
+
+def test_concurrent_calls_coalesced():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'body'
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.in_flight() == 0
+
+
+def test_error_shared():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flight.do('k', fail)
+    assert flight.in_flight() == 0
+
+
+def test_async_coalesced():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'body'
+
+    async def run():
+        return await asyncio.gather(*[flight.do('k', fetch) for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert [result for result, _ in results] == ['body'] * 5
+    assert len(calls) == 1
+
+
+def test_async_leader_cancelled():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'body'
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do('k', fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results
+
+    leader, results = asyncio.run(run())
+    assert leader.cancelled()
+    assert sorted(results) == [('body', False), ('body', True), ('body', True)]
+    assert len(calls) == 2
+    assert flight.in_flight() == 0
+
+
+def test_async_follower_cancelled():
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'body'
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await leader, await asyncio.gather(follower, return_exceptions=True)
+
+    result, (follower,) = asyncio.run(run())
+    assert result == ('body', False)
+    assert isinstance(follower, asyncio.CancelledError)
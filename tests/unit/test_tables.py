@@ -0,0 +1,75 @@
+from reactome2py import analysis
+from reactome2py.client import using
+import pytest
+
+PATHWAYS = ('Pathway identifier,Pathway name,#Entities found,#Entities total,Entities ratio,Entities pValue,'
+            'Entities FDR,Species identifier,Species name\n' +
+            ''.join('R-HSA-%d,"Pathway, %d",%d,%d,0.%d,1.0E-%d,0.%d,9606,Homo sapiens\n' % (i, i, i, 10 * i, i, i, i)
+                    for i in range(1, 51)))
+
+
+@pytest.fixture
+def client(local_client):
+    return local_client({'https://reactome.org/AnalysisService/download/T1/pathways/TOTAL/result.csv':
+                         PATHWAYS.encode('utf-8')})
+
+
+def test_pathway2df_types(client):
+    with using(client):
+        df = analysis.pathway2df('T1')
+
+    assert len(df) == 50
+    assert list(df.index[:2]) == [0, 1]
+    assert df['Pathway name'][0] == 'Pathway, 1'
+    assert df['#Entities found'].dtype.kind == 'i'
+    assert df['Entities pValue'].dtype.kind == 'f'
+    assert df['Entities pValue'][2] == pytest.approx(1e-3)
+    assert df['Species name'].dtype == 'category'
+    assert df['Pathway identifier'].dtype != 'category'
+
+
+def test_pathway2df_save(client, tmp_path):
+    with using(client):
+        analysis.pathway2df('T1', path=str(tmp_path) + '/', save=True)
+
+    with open(str(tmp_path / 'result.csv')) as f:
+        assert f.read() == PATHWAYS
+
+
+FOUND = ('Submitted identifier,Mapped to,Resource,Pathways\n'
+         '"H3F3A,H3F3B",P84243,UNIPROT,R-HSA-1;R-HSA-2\n'
+         '0012,NA,UNIPROT,R-HSA-3\n'
+         'TP53,P04637,UNIPROT,\n')
+
+
+@pytest.fixture
+def entities(local_client):
+    return local_client({'https://reactome.org/AnalysisService/download/T1/entities/found/TOTAL/result.csv':
+                         FOUND.encode('utf-8')})
+
+
+def test_found_entities_quoted(entities):
+    with using(entities):
+        df = analysis.found_entities('T1')
+
+    assert list(df.columns) == ['Submitted identifier', 'Mapped to', 'Resource', 'Pathways']
+    assert list(df['Submitted identifier']) == ['H3F3A,H3F3B', '0012', 'TP53']
+    assert df['Mapped to'][1] == 'NA'
+    assert df['Pathways'].isna()[2]
+    assert df['Resource'].dtype == 'category'
+
+
+def test_found_entities_chunks(entities):
+    with using(entities):
+        chunks = list(analysis.found_entities('T1', rows=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[1]['Submitted identifier'].iloc[0] == 'TP53'
+
+
+def test_unfound_entities_empty(entities):
+    entities.transport.store('GET', 'https://reactome.org/AnalysisService/download/T1/entities/notfound/result.csv',
+                             b'')
+    with using(entities):
+        assert analysis.unfound_entities('T1').empty
+        assert list(analysis.unfound_entities('T1', rows=10)) == []
@@ -0,0 +1,68 @@
+from reactome2py import analysis, tracing
+from reactome2py.client import using
+import asyncio
+import pytest
+
+sdk = pytest.importorskip('opentelemetry.sdk.trace')
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def spans():
+    if not tracing.enabled():
+        provider = sdk.TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+
+RESPONSES = {'https://reactome.org/AnalysisService/token/T1': {'summary': {'token': 'T1'}},
+             'https://reactome.org/ContentService/data/query/R-HSA-60140': {'stId': 'R-HSA-60140'}}
+
+
+def test_spans(spans, local_client):
+    client = local_client(RESPONSES)
+    client.analysis.token('T1', page=2)
+    by_name = dict((span.name, span) for span in spans.get_finished_spans())
+    assert set(by_name) == {'analysis.token', 'serialize', 'HTTP GET', 'parse'}
+    root = by_name['analysis.token']
+    assert root.attributes['reactome.token'] == 'T1' and root.attributes['reactome.page'] == 2
+    for name in ('serialize', 'HTTP GET', 'parse'):
+        assert by_name[name].parent.span_id == root.context.span_id
+    assert by_name['HTTP GET'].attributes['http.status_code'] == 200
+
+
+def test_async_spans(spans, local_client, aio):
+    client = local_client(RESPONSES, client_class=aio.AsyncReactomeClient)
+    asyncio.run(aio.gather(client.content.query_id, ['R-HSA-60140', 'R-HSA-60140']))
+    finished = spans.get_finished_spans()
+    names = sorted(span.name for span in finished)
+    assert names == ['HTTP GET', 'content.query_id', 'content.query_id.gather', 'parse', 'serialize']
+    by_name = dict((span.name, span) for span in finished)
+    assert by_name['content.query_id'].parent.span_id == by_name['content.query_id.gather'].context.span_id
+    assert by_name['HTTP GET'].parent.span_id == by_name['content.query_id'].context.span_id
+
+
+def test_batch_span(spans, local_client):
+    client = local_client({('POST', 'https://reactome.org/AnalysisService/identifiers/'): {'summary': {'token': 'T2'}}})
+    results = []
+    with using(client), trace.get_tracer('test').start_as_current_span('consumer') as consumer:
+        for result in analysis.batch_identifiers(['EGF', 'TP53'], workers=2, species='9606'):
+            # the caller keeps its own span between the submissions
+            assert trace.get_current_span() is consumer
+            results.append(result)
+    assert [result.token for result in results] == ['T2', 'T2']
+
+    by_name = dict((span.name, span) for span in spans.get_finished_spans())
+    batch = by_name['analysis.batch_identifiers']
+    assert batch.attributes['reactome.workers'] == 2 and batch.attributes['reactome.species'] == '9606'
+    assert batch.parent.span_id == by_name['consumer'].context.span_id
+    calls = [span for span in spans.get_finished_spans() if span.name == 'analysis.identifiers']
+    assert len(calls) == 2
+    assert all(span.parent.span_id == batch.context.span_id for span in calls)
@@ -0,0 +1,42 @@
+from reactome2py.exceptions import ReactomeNotFoundError
+from reactome2py.transport import rebase, split_service
+import asyncio
+import json
+import pytest
+
+
+def test_split_and_rebase():
+    assert split_service('https://reactome.org/ContentService/data/species/all') == ('content', '/data/species/all')
+    assert split_service('http://cpws.reactome.org/caBigR3WebApp2019/x') == ('fi', '/caBigR3WebApp2019/x')
+    assert rebase('https://reactome.org/AnalysisService/token/T1', {'analysis': 'http://localhost:8080/analysis/'}) \
+        == 'http://localhost:8080/analysis/token/T1'
+    assert rebase('https://reactome.org/ContentService/x', {'analysis': 'http://localhost'}) \
+        == 'https://reactome.org/ContentService/x'
+
+
+@pytest.fixture
+def client(local_client):
+    client = local_client({'https://reactome.org/ContentService/data/query/R-HSA-60140': {'stId': 'R-HSA-60140'},
+                           'https://reactome.org/AnalysisService/token/T1': {'page': 'any'},
+                           'https://reactome.org/AnalysisService/database/version': '73'})
+    client.transport.store('GET', 'https://reactome.org/AnalysisService/token/T1', json.dumps({'page': 2}),
+                           params=(('pageSize', '1'), ('page', '2'), ('sortBy', 'ENTITIES_FDR'), ('order', 'ASC'),
+                                   ('species', 'Homo sapiens'), ('resource', 'TOTAL'), ('pValue', '1'),
+                                   ('includeDisease', 'true'), ('min', None), ('max', None)), exact=True)
+    return client
+
+
+def test_local_transport(client):
+    assert client.content.query_id('R-HSA-60140') == {'stId': 'R-HSA-60140'}
+    assert client.analysis.token('T1', page=2) == {'page': 2}
+    assert client.analysis.token('T1', page=3) == {'page': 'any'}
+    assert client.analysis.db_version() == '73'
+    with pytest.raises(ReactomeNotFoundError):
+        client.content.query_id('R-HSA-0')
+
+
+def test_local_transport_async(client, local_client, aio):
+    # made after the client fixture stored the responses, so it is served the same ones
+    aclient = local_client(client_class=aio.AsyncReactomeClient)
+    assert asyncio.run(aclient.analysis.token('T1', page=2)) == {'page': 2}
+    assert asyncio.run(aclient.content.query_id('R-HSA-60140')) == {'stId': 'R-HSA-60140'}
@@ -0,0 +1,120 @@
+from reactome2py import analysis, content
+from reactome2py.client import ReactomeClient, using
+from reactome2py.exceptions import ReactomeHTTPError
+from reactome2py.fixtures import fixture_key
+from reactome2py.ratelimit import RateLimiter
+from reactome2py.retry import Retry
+from reactome2py.transport import LocalTransport
+from reactome2py.upload import Upload
+import asyncio
+import gzip
+import http.server
+import io
+import json
+import threading
+import pytest
+
+IDENTIFIERS = ['TP53', 'EGFR', 'BRAF']
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    bodies = []
+    failures = 0
+
+    def do_POST(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.bodies.append(body)
+
+        status = 200
+        if Handler.failures:
+            Handler.failures -= 1
+            status = 503
+        payload = json.dumps({'identifiers': body.decode('utf-8').split()}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    Handler.bodies = []
+    Handler.failures = 0
+    yield 'http://127.0.0.1:%s' % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server):
+    return ReactomeClient(rate_limiter=RateLimiter({}), retry=Retry(backoff_factor=0),
+                          base_urls={'analysis': server + '/AnalysisService', 'content': server + '/ContentService'})
+
+
+@pytest.mark.parametrize('gzip', [False, True])
+def test_sources(server, tmp_path, gzip):
+    path = tmp_path / 'ids.txt'
+    path.write_text('\n'.join(IDENTIFIERS) + '\n')
+
+    with _client(server) as client, using(client):
+        assert analysis.identifiers_form(str(path), gzip=gzip) == {'identifiers': IDENTIFIERS}
+        with open(str(path), 'rb') as f:
+            assert analysis.identifiers_mapping_form(f, gzip=gzip) == {'identifiers': IDENTIFIERS}
+        assert content.interactors_form(iter(IDENTIFIERS), 'sample', gzip=gzip) == {'identifiers': IDENTIFIERS}
+
+
+def test_retry_rereads_source(server, tmp_path):
+    path = tmp_path / 'ids.txt'
+    path.write_text('\n'.join(IDENTIFIERS))
+    Handler.failures = 1
+
+    with _client(server) as client, using(client):
+        assert analysis.identifiers_mapping_form(str(path)) == {'identifiers': IDENTIFIERS}
+    assert len(Handler.bodies) == 2
+    assert Handler.bodies[0] == Handler.bodies[1]
+
+
+def test_lines_sent_once(server):
+    Handler.failures = 1
+
+    with _client(server) as client, using(client), pytest.raises(ReactomeHTTPError):
+        analysis.identifiers_mapping_form(iter(IDENTIFIERS))
+    assert len(Handler.bodies) == 1
+
+
+def test_async(server, tmp_path, aio):
+    path = tmp_path / 'ids.txt'
+    path.write_text('\n'.join(IDENTIFIERS))
+
+    async def run():
+        async with aio.AsyncReactomeClient(rate_limiter=RateLimiter({}),
+                                           base_urls={'analysis': server + '/AnalysisService'}) as client:
+            return await client.analysis.identifiers_form(str(path), gzip=True)
+
+    assert asyncio.run(run()) == {'identifiers': IDENTIFIERS}
+
+
+def test_digest_matches_bytes(tmp_path):
+    path = tmp_path / 'ids.txt'
+    path.write_bytes(b'TP53\nEGFR\n')
+    url = 'https://reactome.org/AnalysisService/identifiers/form/'
+
+    assert fixture_key('POST', url, data=Upload(str(path))) == fixture_key('POST', url, data=b'TP53\nEGFR\n')
+    assert LocalTransport.variant('POST', url, data=Upload(io.BytesIO(b'TP53\nEGFR\n'))) == \
+        LocalTransport.variant('POST', url, data=b'TP53\nEGFR\n')